@@ -0,0 +1,29 @@
+"""Add FULLTEXT indexes for the q search parameter
+
+Revision ID: 5e0c2a7d41b9
+Revises: 8bc82c37c679
+Create Date: 2026-10-17 10:12:41.508317
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0c2a7d41b9'
+down_revision = '8bc82c37c679'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Matching is as accent-insensitive as the columns' collation
+    # (utf8mb4_general_ci / unicode_ci / uca1400_ai_ci all are)
+    op.create_index('ft_events_name', 'events', ['name'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_locations_search', 'locations', ['name', 'city', 'road'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_countries_name', 'countries', ['name'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    op.drop_index('ft_countries_name', table_name='countries')
+    op.drop_index('ft_locations_search', table_name='locations')
+    op.drop_index('ft_events_name', table_name='events')
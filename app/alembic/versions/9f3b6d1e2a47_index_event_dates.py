@@ -0,0 +1,25 @@
+"""Index the event dates for date range filters
+
+Revision ID: 9f3b6d1e2a47
+Revises: 5e0c2a7d41b9
+Create Date: 2026-10-17 14:03:18.226940
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3b6d1e2a47'
+down_revision = '5e0c2a7d41b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_events_start_date'), 'events', ['start_date'], unique=False)
+    op.create_index(op.f('ix_events_end_date'), 'events', ['end_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_events_end_date'), table_name='events')
+    op.drop_index(op.f('ix_events_start_date'), table_name='events')
@@ -0,0 +1,24 @@
+"""Add the permission version of users
+
+Revision ID: c4d8a2f6b713
+Revises: 9f3b6d1e2a47
+Create Date: 2026-10-17 18:21:40.512337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8a2f6b713'
+down_revision = '9f3b6d1e2a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('permission_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('users', 'permission_version')
@@ -11,6 +11,7 @@ from app.api.v1.users.schema import (
     UserLogin,
 )
 from app.common.deps import (
+    access_token_claims,
     get_current_user,
     get_db,
 )
@@ -21,13 +22,15 @@ from app.core.security import (
     create_magic_link,
     decode_magic_token,
     generate_otp,
-    get_password_hash,
+    get_password_hash_async,
+    invalidate_user_tokens,
     set_refresh_cookie,
     set_split_jwt_cookies,
-    verify_password,
+    verify_password_async,
 )
+from app.features.roles.service import get_guest_permissions
 from app.features.users.model import LoginOTP, User
-from app.features.users.service import get_user_permissions, list_guest_permissions
+from app.features.users.service import get_effective_permissions
 
 auth_router = APIRouter()
 
@@ -44,11 +47,10 @@ async def register_user(user_create: UserCreate, db: Session = Depends(get_db)):
     new_user = User(
         email=user_create.email,
         full_name=user_create.full_name,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=await get_password_hash_async(user_create.password),
     )
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
     return {"detail": "User registered successfully"}
 
 
@@ -58,7 +60,9 @@ async def login_user(
 ):
     """User login endpoint"""
     user = db.query(User).filter(User.email == user_login.email).first()
-    if not user or not verify_password(user_login.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        user_login.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
@@ -66,7 +70,7 @@ async def login_user(
     access_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_expires = timedelta(days=7)
 
-    access_token = create_access_token({"sub": user_login.email}, access_expires)
+    access_token = create_access_token(access_token_claims(db, user), access_expires)
     refresh_token = create_access_token({"sub": user_login.email}, refresh_expires)
 
     set_split_jwt_cookies(response, access_token)
@@ -74,6 +78,8 @@ async def login_user(
 
     user.last_login = datetime.utcnow()
     db.commit()
+    # Cached tokens of this user carry the previous last_login
+    invalidate_user_tokens(user.id)
 
     return {"detail": "Login successful"}
 
@@ -202,7 +208,9 @@ async def magic_login(request: MagicLoginRequest, db: Session = Depends(get_db))
     access_expires = timedelta(minutes=15)
     refresh_expires = timedelta(days=7)
 
-    access_token = create_access_token({"sub": data["email"]}, access_expires)
+    user = db.query(User).filter(User.email == data["email"]).first()
+    access_claims = access_token_claims(db, user) if user else {"sub": data["email"]}
+    access_token = create_access_token(access_claims, access_expires)
     refresh_token = create_access_token({"sub": data["email"]}, refresh_expires)
 
     response = Response()
@@ -213,12 +221,11 @@ async def magic_login(request: MagicLoginRequest, db: Session = Depends(get_db))
 
 @auth_router.get("/permissions", response_model=list[PermissionBase])
 async def get_all_permissions(
-    request: Request,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if user:
-        permissions = get_user_permissions(db, user.id, True)
+        permissions = get_effective_permissions(db, user.id)
     else:
-        permissions, total = list_guest_permissions(db, request)
-    return [PermissionBase(name=perm.name) for perm in permissions]
+        permissions = get_guest_permissions(db)
+    return [PermissionBase(name=name) for name in sorted(permissions)]
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, Response
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, Response
 from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.events import schema
-from app.common.deps import get_db, require_permission
+from app.common.bulk import BulkDelete, BulkErrors, validate_items
+from app.common.deps import get_async_db, get_db, require_permission
 from app.common.permissions import EventTypes, Events
-from app.common.refine import refine_list_response
-from app.common.responses import ApiResponse, MessageResponse
+from app.common.refine import (
+    Embed,
+    embeddable,
+    refine_list_response,
+    refine_show_response,
+    sparse_fieldset,
+)
+from app.common.responses import ApiResponse, BulkResult, MessageResponse
 from app.features.events import service
 from app.features.users.model import User
 from app.utils.pagination import PaginationParams
@@ -16,26 +26,30 @@ events_router = APIRouter()
 # =========================
 # EVENT TYPE ENDPOINTS
 # =========================
-@events_router.get("/types", response_model=list[schema.EventTypeRead])
+@events_router.api_route(
+    "/types", methods=["GET", "HEAD"], response_model=list[schema.EventTypeRead]
+)
 async def list_event_types(
     response: Response,
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(EventTypes.List)),
 ):
     """List all event types."""
-    results, total = service.list_event_types(db, pagination)
-    return refine_list_response(response, results, total)
+    results, total = await service.list_event_types_async(db, pagination)
+    return refine_list_response(response, results, total, pagination)
 
 
-@events_router.get("/types/{event_type_id}", response_model=ApiResponse[schema.EventTypeRead])
+@events_router.get(
+    "/types/{event_type_id}", response_model=ApiResponse[schema.EventTypeRead]
+)
 async def get_event_type(
     event_type_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(EventTypes.Show)),
 ):
     """Get a specific event type by ID."""
-    event_type = service.get_event_type(db, event_type_id)
+    event_type = await service.get_event_type_async(db, event_type_id)
     return ApiResponse(data=event_type)
 
 
@@ -50,7 +64,9 @@ async def create_event_type(
     return ApiResponse(data=db_event_type)
 
 
-@events_router.patch("/types/{event_type_id}", response_model=ApiResponse[schema.EventTypeRead])
+@events_router.patch(
+    "/types/{event_type_id}", response_model=ApiResponse[schema.EventTypeRead]
+)
 async def update_event_type(
     event_type_id: str,
     event_type: schema.EventTypeUpdate,
@@ -76,27 +92,73 @@ async def delete_event_type(
 # =========================
 # EVENT ENDPOINTS
 # =========================
-@events_router.get("", response_model=list[schema.EventRead])
+@events_router.api_route(
+    "",
+    methods=["GET", "HEAD"],
+    response_model=list[schema.EventRead],
+    dependencies=[Depends(sparse_fieldset(schema.EventRead))],
+)
 async def list_events(
-    response: Response, 
+    response: Response,
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
+    embed: Embed = Depends(embeddable(schema.EventRead, schema.EVENT_EMBEDS)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(Events.List)),
 ):
     """List all events."""
-    results, total = service.list_events(db, pagination)
-    return refine_list_response(response, results, total)
+    results, total = await service.list_events_async(db, pagination, embed.paths)
+    return refine_list_response(response, results, total, pagination, embed)
+
+
+@events_router.post("/bulk", response_model=ApiResponse[BulkResult[schema.EventRead]])
+async def create_events_bulk(
+    items: list[Any] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Events.Create)),
+):
+    """Create many events at once; invalid items are reported, not created."""
+    errors = BulkErrors()
+    valid = validate_items(items, schema.EventCreate, errors, with_id=False)
+    created = service.create_events_bulk(db, valid, errors)
+    return ApiResponse(data=BulkResult(items=created, errors=errors.by_index()))
+
+
+@events_router.patch("/bulk", response_model=ApiResponse[BulkResult[schema.EventRead]])
+async def update_events_bulk(
+    items: list[Any] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Events.Update)),
+):
+    """Update many events at once; each item carries the id of its event."""
+    errors = BulkErrors()
+    valid = validate_items(items, schema.EventUpdate, errors, with_id=True)
+    updated = service.update_events_bulk(db, valid, errors)
+    return ApiResponse(data=BulkResult(items=updated, errors=errors.by_index()))
+
+
+@events_router.delete("/bulk", response_model=ApiResponse[BulkResult[schema.EventRead]])
+async def delete_events_bulk(
+    payload: BulkDelete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Events.Delete)),
+):
+    """Delete many events at once; unknown ids are reported."""
+    errors = BulkErrors()
+    deleted = service.delete_events_bulk(db, payload.ids, errors)
+    return ApiResponse(data=BulkResult(deleted=deleted, errors=errors.by_index()))
 
 
 @events_router.get("/{event_id}", response_model=ApiResponse[schema.EventRead])
 async def get_event(
     event_id: str,
-    db: Session = Depends(get_db),
+    fields: list[str] | None = Depends(sparse_fieldset(schema.EventRead)),
+    embed: Embed = Depends(embeddable(schema.EventRead, schema.EVENT_EMBEDS)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(Events.Show)),
 ):
     """Get a specific event by ID."""
-    event = service.get_event(db, event_id)
-    return ApiResponse(data=event)
+    event = await service.get_event_async(db, event_id, fields, embed.paths)
+    return refine_show_response(event, fields, embed)
 
 
 @events_router.post("", response_model=ApiResponse[schema.EventRead])
@@ -144,7 +206,9 @@ async def publish_event(
     return ApiResponse(data=db_event)
 
 
-@events_router.post("/{event_id}/unpublish", response_model=ApiResponse[schema.EventRead])
+@events_router.post(
+    "/{event_id}/unpublish", response_model=ApiResponse[schema.EventRead]
+)
 async def unpublish_event(
     event_id: str,
     db: Session = Depends(get_db),
@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from app.api.v1.locations.schema import CountryRead, LocationRead, LocationTypeRead
+
 
 # =========================
 # EVENT TYPE SCHEMAS
@@ -64,3 +66,12 @@ class EventRead(EventBase):
 
     class Config:
         from_attributes = True
+
+
+# Relations an event can be returned with (_embed) and their read schemas
+EVENT_EMBEDS = {
+    "event_type": EventTypeRead,
+    "location": LocationRead,
+    "location.country": CountryRead,
+    "location.location_type": LocationTypeRead,
+}
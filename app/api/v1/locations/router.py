@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, Response
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, Response
 from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.locations import schema
-from app.common.deps import get_db, require_permission
+from app.common.bulk import BulkDelete, BulkErrors, validate_items
+from app.common.deps import get_async_db, get_db, require_permission
 from app.common.permissions import Countries, Locations, LocationTypes
-from app.common.refine import refine_list_response
-from app.common.responses import ApiResponse, MessageResponse
+from app.common.refine import (
+    Embed,
+    embeddable,
+    refine_list_response,
+    refine_show_response,
+    sparse_fieldset,
+)
+from app.common.responses import ApiResponse, BulkResult, MessageResponse
 from app.features.locations import service
 from app.features.users.model import User
 from app.utils.pagination import PaginationParams
@@ -16,26 +26,30 @@ locations_router = APIRouter()
 # =========================
 # LOCATION TYPE ENDPOINTS
 # =========================
-@locations_router.get("/types", response_model=list[schema.LocationTypeRead])
+@locations_router.api_route(
+    "/types", methods=["GET", "HEAD"], response_model=list[schema.LocationTypeRead]
+)
 async def list_location_types(
     response: Response,
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(LocationTypes.List)),
 ):
     """List all location types."""
-    results, total = service.list_location_types(db, pagination)
-    return refine_list_response(response, results, total)
+    results, total = await service.list_location_types_async(db, pagination)
+    return refine_list_response(response, results, total, pagination)
 
 
-@locations_router.get("/types/{location_type_id}", response_model=ApiResponse[schema.LocationTypeRead])
+@locations_router.get(
+    "/types/{location_type_id}", response_model=ApiResponse[schema.LocationTypeRead]
+)
 async def get_location_type(
     location_type_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(LocationTypes.Show)),
 ):
     """Get a specific location type by ID."""
-    location_type = service.get_location_type(db, location_type_id)
+    location_type = await service.get_location_type_async(db, location_type_id)
     return ApiResponse(data=location_type)
 
 
@@ -50,7 +64,9 @@ async def create_location_type(
     return ApiResponse(data=db_location_type)
 
 
-@locations_router.patch("/types/{location_type_id}", response_model=ApiResponse[schema.LocationTypeRead])
+@locations_router.patch(
+    "/types/{location_type_id}", response_model=ApiResponse[schema.LocationTypeRead]
+)
 async def update_location_type(
     location_type_id: str,
     location_type: schema.LocationTypeUpdate,
@@ -76,26 +92,30 @@ async def delete_location_type(
 # =========================
 # COUNTRY ENDPOINTS
 # =========================
-@locations_router.get("/countries", response_model=list[schema.CountryRead])
+@locations_router.api_route(
+    "/countries", methods=["GET", "HEAD"], response_model=list[schema.CountryRead]
+)
 async def list_countries(
     response: Response,
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(Countries.List)),
 ):
     """List all countries."""
-    results, total = service.list_countries(db, pagination)
-    return refine_list_response(response, results, total)
+    results, total = await service.list_countries_async(db, pagination)
+    return refine_list_response(response, results, total, pagination)
 
 
-@locations_router.get("/countries/{country_id}", response_model=ApiResponse[schema.CountryRead])
+@locations_router.get(
+    "/countries/{country_id}", response_model=ApiResponse[schema.CountryRead]
+)
 async def get_country(
     country_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(Countries.Show)),
 ):
     """Get a specific country by ID."""
-    country = service.get_country(db, country_id)
+    country = await service.get_country_async(db, country_id)
     return ApiResponse(data=country)
 
 
@@ -110,7 +130,9 @@ async def create_country(
     return ApiResponse(data=db_country)
 
 
-@locations_router.patch("/countries/{country_id}", response_model=ApiResponse[schema.CountryRead])
+@locations_router.patch(
+    "/countries/{country_id}", response_model=ApiResponse[schema.CountryRead]
+)
 async def update_country(
     country_id: str,
     country: schema.CountryUpdate,
@@ -136,27 +158,79 @@ async def delete_country(
 # =========================
 # LOCATION ENDPOINTS
 # =========================
-@locations_router.get("", response_model=list[schema.LocationRead])
+@locations_router.api_route(
+    "",
+    methods=["GET", "HEAD"],
+    response_model=list[schema.LocationRead],
+    dependencies=[Depends(sparse_fieldset(schema.LocationRead))],
+)
 async def list_locations(
     response: Response,
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
+    embed: Embed = Depends(embeddable(schema.LocationRead, schema.LOCATION_EMBEDS)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(Locations.List)),
 ):
     """List all locations."""
-    results, total = service.list_locations(db, pagination)
-    return refine_list_response(response, results, total)
+    results, total = await service.list_locations_async(db, pagination, embed.paths)
+    return refine_list_response(response, results, total, pagination, embed)
+
+
+@locations_router.post(
+    "/bulk", response_model=ApiResponse[BulkResult[schema.LocationRead]]
+)
+async def create_locations_bulk(
+    items: list[Any] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Locations.Create)),
+):
+    """Create many locations at once; invalid items are reported, not created."""
+    errors = BulkErrors()
+    valid = validate_items(items, schema.LocationCreate, errors, with_id=False)
+    created = service.create_locations_bulk(db, valid, errors)
+    return ApiResponse(data=BulkResult(items=created, errors=errors.by_index()))
+
+
+@locations_router.patch(
+    "/bulk", response_model=ApiResponse[BulkResult[schema.LocationRead]]
+)
+async def update_locations_bulk(
+    items: list[Any] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Locations.Update)),
+):
+    """Update many locations at once; each item carries the id of its location."""
+    errors = BulkErrors()
+    valid = validate_items(items, schema.LocationUpdate, errors, with_id=True)
+    updated = service.update_locations_bulk(db, valid, errors)
+    return ApiResponse(data=BulkResult(items=updated, errors=errors.by_index()))
+
+
+@locations_router.delete(
+    "/bulk", response_model=ApiResponse[BulkResult[schema.LocationRead]]
+)
+async def delete_locations_bulk(
+    payload: BulkDelete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Locations.Delete)),
+):
+    """Delete many locations at once; unknown ids are reported."""
+    errors = BulkErrors()
+    deleted = service.delete_locations_bulk(db, payload.ids, errors)
+    return ApiResponse(data=BulkResult(deleted=deleted, errors=errors.by_index()))
 
 
 @locations_router.get("/{location_id}", response_model=ApiResponse[schema.LocationRead])
 async def get_location(
     location_id: str,
-    db: Session = Depends(get_db),
+    fields: list[str] | None = Depends(sparse_fieldset(schema.LocationRead)),
+    embed: Embed = Depends(embeddable(schema.LocationRead, schema.LOCATION_EMBEDS)),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission(Locations.Show)),
 ):
     """Get a specific location by ID."""
-    location = service.get_location(db, location_id)
-    return ApiResponse(data=location)
+    location = await service.get_location_async(db, location_id, fields, embed.paths)
+    return refine_show_response(location, fields, embed)
 
 
 @locations_router.post("", response_model=ApiResponse[schema.LocationRead])
@@ -170,7 +244,9 @@ async def create_location(
     return ApiResponse(data=db_location)
 
 
-@locations_router.patch("/{location_id}", response_model=ApiResponse[schema.LocationRead])
+@locations_router.patch(
+    "/{location_id}", response_model=ApiResponse[schema.LocationRead]
+)
 async def update_location(
     location_id: str,
     location: schema.LocationUpdate,
@@ -94,4 +94,11 @@ class LocationRead(LocationBase):
     id: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Relations a location can be returned with (_embed) and their read schemas
+LOCATION_EMBEDS = {
+    "country": CountryRead,
+    "location_type": LocationTypeRead,
+}
@@ -16,7 +16,9 @@ permissions_router = APIRouter()
 # =========================
 # PERMISSION ENDPOINTS
 # =========================
-@permissions_router.get("", response_model=list[schema.PermissionRead])
+@permissions_router.api_route(
+    "", methods=["GET", "HEAD"], response_model=list[schema.PermissionRead]
+)
 async def list_permissions(
     response: Response,
     pagination: PaginationParams = Depends(),
@@ -25,10 +27,12 @@ async def list_permissions(
 ):
     """List all permissions."""
     results, total = service.list_permissions(db, pagination)
-    return refine_list_response(response, results, total)
+    return refine_list_response(response, results, total, pagination)
 
 
-@permissions_router.get("/{permission_id}", response_model=ApiResponse[schema.PermissionRead])
+@permissions_router.get(
+    "/{permission_id}", response_model=ApiResponse[schema.PermissionRead]
+)
 async def get_permission(
     permission_id: str,
     db: Session = Depends(get_db),
@@ -50,7 +54,9 @@ async def create_permission(
     return ApiResponse(data=db_permission)
 
 
-@permissions_router.patch("/{permission_id}", response_model=ApiResponse[schema.PermissionRead])
+@permissions_router.patch(
+    "/{permission_id}", response_model=ApiResponse[schema.PermissionRead]
+)
 async def update_permission(
     permission_id: str,
     permission: schema.PermissionUpdate,
@@ -16,7 +16,9 @@ roles_router = APIRouter()
 # =========================
 # ROLE ENDPOINTS
 # =========================
-@roles_router.get("", response_model=list[schema.RoleRead])
+@roles_router.api_route(
+    "", methods=["GET", "HEAD"], response_model=list[schema.RoleRead]
+)
 async def list_roles(
     response: Response,
     pagination: PaginationParams = Depends(),
@@ -25,7 +27,7 @@ async def list_roles(
 ):
     """List all roles."""
     results, total = service.list_roles(db, pagination)
-    return refine_list_response(response, results, total)
+    return refine_list_response(response, results, total, pagination)
 
 
 @roles_router.get("/{role_id}", response_model=ApiResponse[schema.RoleRead])
@@ -76,7 +78,11 @@ async def delete_role(
 # =========================
 # ROLE PERMISSION ENDPOINTS
 # =========================
-@roles_router.get("/permissions/all", response_model=list[schema.RolePermissionRead])
+@roles_router.api_route(
+    "/permissions/all",
+    methods=["GET", "HEAD"],
+    response_model=list[schema.RolePermissionRead],
+)
 async def list_role_permissions(
     response: Response,
     pagination: PaginationParams = Depends(),
@@ -85,7 +91,7 @@ async def list_role_permissions(
 ):
     """List all role permissions."""
     results, total = service.list_role_permissions(db, pagination)
-    return refine_list_response(response, results, total)
+    return refine_list_response(response, results, total, pagination)
 
 
 @roles_router.get("/{role_id}/permissions")
@@ -99,7 +105,9 @@ async def get_role_permissions(
     return ApiResponse(data=permissions)
 
 
-@roles_router.post("/permissions", response_model=ApiResponse[schema.RolePermissionRead])
+@roles_router.post(
+    "/permissions", response_model=ApiResponse[schema.RolePermissionRead]
+)
 async def create_role_permission(
     role_permission: schema.RolePermissionCreate,
     db: Session = Depends(get_db),
@@ -4,7 +4,11 @@ from sqlalchemy.orm import Session
 from app.api.v1.users import schema
 from app.common.deps import get_db, require_permission
 from app.common.permissions import UserPermissions, UserRoles, Users
-from app.common.refine import refine_list_response
+from app.common.refine import (
+    refine_list_response,
+    refine_show_response,
+    sparse_fieldset,
+)
 from app.common.responses import ApiResponse, MessageResponse
 from app.features.users import service
 from app.features.users.model import User
@@ -21,7 +25,9 @@ async def read_current_user(
     return ApiResponse(data=current_user)
 
 
-@users_router.get("/roles", response_model=list[schema.UserRoleRead])
+@users_router.api_route(
+    "/roles", methods=["GET", "HEAD"], response_model=list[schema.UserRoleRead]
+)
 async def list_user_roles(
     response: Response,
     pagination: PaginationParams = Depends(),
@@ -30,7 +36,7 @@ async def list_user_roles(
 ):
     """List roles for the current user."""
     results, total = service.list_user_roles(db, pagination)
-    return refine_list_response(response, results, total)
+    return refine_list_response(response, results, total, pagination)
 
 
 @users_router.get("/roles/{user_id}", response_model=ApiResponse[schema.UserRoleRead])
@@ -68,7 +74,11 @@ async def delete_user_role(
     return MessageResponse(message="User role deleted successfully")
 
 
-@users_router.get("/permissions", response_model=list[schema.UserPermissionRead])
+@users_router.api_route(
+    "/permissions",
+    methods=["GET", "HEAD"],
+    response_model=list[schema.UserPermissionRead],
+)
 async def list_user_permissions(
     response: Response,
     pagination: PaginationParams = Depends(),
@@ -77,7 +87,7 @@ async def list_user_permissions(
 ):
     """List permissions for the current user."""
     results, total = service.list_user_permissions(db, pagination)
-    return refine_list_response(response, results, total)
+    return refine_list_response(response, results, total, pagination)
 
 
 @users_router.get(
@@ -123,7 +133,12 @@ async def delete_user_permission(
     return MessageResponse(message="User permission deleted successfully")
 
 
-@users_router.get("", response_model=list[schema.UserRead])
+@users_router.api_route(
+    "",
+    methods=["GET", "HEAD"],
+    response_model=list[schema.UserRead],
+    dependencies=[Depends(sparse_fieldset(schema.UserRead))],
+)
 async def list_users(
     response: Response,
     pagination: PaginationParams = Depends(),
@@ -132,18 +147,19 @@ async def list_users(
 ):
     """List users."""
     users, total = service.list_users(db, pagination)
-    return refine_list_response(response, users, total)
+    return refine_list_response(response, users, total, pagination)
 
 
 @users_router.get("/{user_id}", response_model=ApiResponse[schema.UserRead])
 async def get_user(
     user_id: str,
+    fields: list[str] | None = Depends(sparse_fieldset(schema.UserRead)),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission(Users.Show)),
 ):
     """Get user by ID."""
-    user = service.get_user(db, user_id)
-    return ApiResponse(data=user)
+    user = service.get_user(db, user_id, fields)
+    return refine_show_response(user, fields)
 
 
 @users_router.patch("/{user_id}", response_model=ApiResponse[schema.UserRead])
@@ -154,7 +170,7 @@ async def update_user(
     current_user: User = Depends(require_permission(Users.Update)),
 ):
     """Update user details."""
-    user = service.update_user(db, user_id, user_update)
+    user = await service.update_user(db, user_id, user_update)
     return ApiResponse(data=user)
 
 
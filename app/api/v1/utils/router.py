@@ -1,4 +1,14 @@
-from fastapi import APIRouter
+import os
+
+from fastapi import APIRouter, Depends
+
+from app.common.deps import require_permission
+from app.common.permissions import Metrics
+from app.core.db import async_engine, async_replica_engines, engine, replica_engines
+from app.core.pool import pool_stats
+from app.core.query_usage import query_usage
+from app.core.security import password_hash_metrics, token_cache
+from app.features.permissions.cache import permission_cache
 
 utils_router = APIRouter()
 
@@ -7,3 +17,51 @@ utils_router = APIRouter()
 async def health_check():
     """Simple health check endpoint"""
     return {"status": "healthy"}
+
+
+@utils_router.get(
+    "/metrics/token-cache", dependencies=[Depends(require_permission(Metrics.List))]
+)
+async def token_cache_metrics():
+    """Hit/miss counters of this worker's verified-token cache"""
+    return token_cache.stats()
+
+
+@utils_router.get(
+    "/metrics/permission-cache",
+    dependencies=[Depends(require_permission(Metrics.List))],
+)
+async def permission_cache_metrics():
+    """Hit/miss counters of this worker's effective-permission cache"""
+    return permission_cache.stats()
+
+
+@utils_router.get(
+    "/metrics/password-hashing",
+    dependencies=[Depends(require_permission(Metrics.List))],
+)
+async def password_hashing_metrics():
+    """Queue depth and latency of this worker's password hashing pool"""
+    return password_hash_metrics.stats()
+
+
+@utils_router.get(
+    "/metrics/db-pool", dependencies=[Depends(require_permission(Metrics.List))]
+)
+async def db_pool_metrics():
+    """Connection pool usage and checkout latency of this worker's engines"""
+    return {
+        "pid": os.getpid(),
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine),
+        "replicas": [pool_stats(replica) for replica in replica_engines],
+        "async_replicas": [pool_stats(replica) for replica in async_replica_engines],
+    }
+
+
+@utils_router.get(
+    "/metrics/query-usage", dependencies=[Depends(require_permission(Metrics.List))]
+)
+async def query_usage_metrics():
+    """Filter/sort shapes and latency of the list queries this worker served"""
+    return {"pid": os.getpid(), "shapes": query_usage.snapshot()}
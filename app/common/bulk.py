@@ -0,0 +1,178 @@
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from app.common.exceptions import BadRequestError
+from app.common.repo import existing_ids
+from app.core.config import settings
+
+
+class BulkDelete(BaseModel):
+    ids: list[str]
+
+
+class BulkItem:
+    """A validated item of a bulk request"""
+
+    __slots__ = ("index", "id", "data")
+
+    def __init__(self, index: int, item_id: str | None, data: dict):
+        self.index = index
+        self.id = item_id
+        self.data = data
+
+
+class BulkErrors(list):
+    """Per-item errors collected while processing a bulk request"""
+
+    def add(self, index: int, detail: str, item_id: str | None = None) -> None:
+        self.append({"index": index, "id": item_id, "detail": detail})
+
+    def by_index(self) -> list[dict]:
+        return sorted(self, key=lambda error: error["index"])
+
+
+def check_batch_size(count: int) -> None:
+    if count > settings.BULK_MAX_ITEMS:
+        raise BadRequestError(
+            f"At most {settings.BULK_MAX_ITEMS} items are accepted per request"
+        )
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def validate_items(
+    items: list[Any], schema: type[BaseModel], errors: BulkErrors, *, with_id: bool
+) -> list[BulkItem]:
+    """Validate every item of a bulk request against a schema on its own.
+
+    With ``with_id`` each item must carry the ``id`` of the row it updates and
+    only the fields it sets are kept. Invalid items are recorded in ``errors``.
+    """
+    check_batch_size(len(items))
+    valid = []
+    seen_ids = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.add(index, "item: must be an object")
+            continue
+        item_id = None
+        if with_id:
+            item = dict(item)
+            item_id = item.pop("id", None)
+            if not isinstance(item_id, str) or not item_id:
+                errors.add(index, "id: field required")
+                continue
+            if item_id in seen_ids:
+                errors.add(index, "id: appears more than once", item_id)
+                continue
+            seen_ids.add(item_id)
+        try:
+            payload = schema.model_validate(item)
+        except ValidationError as exc:
+            errors.add(index, _validation_detail(exc), item_id)
+            continue
+        valid.append(
+            BulkItem(index, item_id, payload.model_dump(exclude_unset=with_id))
+        )
+    return valid
+
+
+def drop_missing_rows(
+    db: Session, model: type[SQLModel], items: list[BulkItem], errors: BulkErrors
+) -> list[BulkItem]:
+    """Keep items whose id exists, in one query"""
+    found = existing_ids(db, model, {item.id for item in items})
+    for item in items:
+        if item.id not in found:
+            errors.add(item.index, "not found", item.id)
+    return [item for item in items if item.id in found]
+
+
+def existing_delete_ids(
+    db: Session, model: type[SQLModel], ids: list[str], errors: BulkErrors
+) -> list[str]:
+    """The ids of a bulk delete that exist, once each, in request order"""
+    check_batch_size(len(ids))
+    found = existing_ids(db, model, ids)
+    for index, row_id in enumerate(ids):
+        if row_id not in found:
+            errors.add(index, "not found", row_id)
+    return [row_id for row_id in dict.fromkeys(ids) if row_id in found]
+
+
+def drop_dangling_references(
+    db: Session,
+    items: list[BulkItem],
+    references: dict[str, type[SQLModel]],
+    errors: BulkErrors,
+) -> list[BulkItem]:
+    """Keep items whose foreign keys point at existing rows.
+
+    One query per referenced table, so a bad reference rejects its own item
+    instead of failing the whole multi-row statement.
+    """
+    rejected = set()
+    for field, model in references.items():
+        wanted = {item.data[field] for item in items if item.data.get(field)}
+        if not wanted:
+            continue
+        found = existing_ids(db, model, wanted)
+        for item in items:
+            value = item.data.get(field)
+            if value and value not in found and item.index not in rejected:
+                errors.add(item.index, f"{field}: {value} does not exist", item.id)
+                rejected.add(item.index)
+    return [item for item in items if item.index not in rejected]
+
+
+def drop_duplicate_values(
+    db: Session,
+    model: type[SQLModel],
+    items: list[BulkItem],
+    field: str,
+    errors: BulkErrors,
+) -> list[BulkItem]:
+    """Keep items whose value of a unique column is free.
+
+    Values repeated within the batch or taken by another row are rejected.
+    """
+    column = getattr(model, field)
+    wanted = {item.data[field] for item in items if item.data.get(field)}
+    taken = {}
+    if wanted:
+        taken = dict(
+            db.execute(select(column, model.id).where(column.in_(wanted))).all()
+        )
+    claimed = set()
+    kept = []
+    for item in items:
+        value = item.data.get(field)
+        if value and (value in claimed or taken.get(value, item.id) != item.id):
+            errors.add(item.index, f"{field}: {value} already exists", item.id)
+            continue
+        claimed.add(value)
+        kept.append(item)
+    return kept
+
+
+def write_batch(db: Session, write: Callable[[], Any]):
+    """Run a bulk write, turning a constraint violation into a 400.
+
+    The batch is a single transaction, so nothing is written in that case.
+    """
+    try:
+        return write()
+    except IntegrityError as exc:
+        db.rollback()
+        raise BadRequestError(f"Bulk write rejected: {exc.orig}") from exc
@@ -1,40 +1,70 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from datetime import timedelta
 
 from fastapi import Cookie, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from sqlmodel import Session as SQLSession
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.common.permissions import PermissionSet, permission_registry
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import AsyncRoutingSession, RoutingSession, use_replica
 from app.core.security import (
     create_access_token,
+    permission_claims,
+    read_permission_claims,
     set_refresh_cookie,
     set_split_jwt_cookies,
+    token_cache,
 )
 from app.features.permissions.model import Permission
 from app.features.roles.model import Role
+from app.features.roles.service import get_guest_permissions
 from app.features.users.model import User
 from app.features.users.service import (
+    get_effective_permissions,
     get_user_by_email,
-    list_guest_permissions,
-)
-from app.features.users.service import (
-    get_user_permissions as service_get_user_permissions,
 )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Database session dependency"""
-    with SQLSession(engine) as session:
+    """Database session dependency, reading from a replica on safe requests"""
+    # Rows stay loaded after commit, so writes need no refresh SELECT
+    with RoutingSession(
+        expire_on_commit=False, info={"read_only": use_replica()}
+    ) as session:
         yield session
 
 
-async def get_current_user(
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database session dependency.
+
+    Queries awaited on this session do not block the event loop, so routes can
+    move over from get_db one at a time.
+    """
+    async with AsyncSession(
+        sync_session_class=AsyncRoutingSession,
+        expire_on_commit=False,
+        info={"read_only": use_replica()},
+    ) as session:
+        yield session
+
+
+def access_token_claims(db: Session, user: User) -> dict:
+    """Claims for a new access token, with permissions when enabled"""
+    claims = {"sub": user.email}
+    if settings.TOKEN_PERMISSION_CLAIMS:
+        permissions = get_effective_permissions(db, user.id)
+        claims.update(permission_claims(permissions, user.permission_version))
+    return claims
+
+
+# The auth dependencies query through the sync session, so they are plain
+# functions: FastAPI runs them in its threadpool instead of on the event loop.
+def get_current_user(
     request: Request,
     response: Response,
     jwt_hp: str = Cookie(None),
@@ -72,7 +102,9 @@ async def get_current_user(
             access_expires = timedelta(minutes=15)
             refresh_expires = timedelta(days=7)
 
-            access_token = create_access_token({"sub": email}, access_expires)
+            access_token = create_access_token(
+                access_token_claims(db, user), access_expires
+            )
             refresh_token = create_access_token({"sub": email}, refresh_expires)
 
             set_refresh_cookie(response, refresh_token)
@@ -80,6 +112,12 @@ async def get_current_user(
             return user
         return None
 
+    # Tokens verified earlier skip the signature check and the user lookup
+    cached = token_cache.get(jwt_sig)
+    if cached is not None and cached["hp"] == jwt_hp:
+        request.state.token_claims = cached["claims"]
+        return User(**cached["user"])
+
     # Reconstruct JWT from split cookies
     token = f"{jwt_hp}.{jwt_sig}"
 
@@ -99,13 +137,40 @@ async def get_current_user(
     if not user:
         return None
 
+    token_cache.set(
+        jwt_sig,
+        {
+            "hp": jwt_hp,
+            "claims": payload,
+            "user": user.model_dump(exclude={"hashed_password"}),
+        },
+        expires_at=payload.get("exp"),
+        tag=user.id,
+    )
+    request.state.token_claims = payload
     return user
 
 
+def token_permissions(request: Request, user: User) -> PermissionSet | None:
+    """Permissions embedded in the verified access token, if still current"""
+    if not settings.TOKEN_PERMISSION_CLAIMS:
+        return None
+    claims = getattr(request.state, "token_claims", None)
+    if not claims:
+        return None
+    return read_permission_claims(claims, user.permission_version)
+
+
 def require_permission(permission_name: Permission):
     """Dependency factory to check if user has specific permission or if available to guests"""
+    bit = permission_registry.bit(permission_name)
 
-    async def permission_checker(
+    def granted(permissions: PermissionSet) -> bool:
+        if bit:
+            return bool(permissions.mask & bit)
+        return permission_name in permissions.names
+
+    def permission_checker(
         request: Request,
         current_user: User | None = Depends(get_current_user),
         db: Session = Depends(get_db),
@@ -114,11 +179,7 @@ def require_permission(permission_name: Permission):
             return None
         # If no user is authenticated, check if permission is available to guests
         if current_user is None:
-            guest_permissions, total = list_guest_permissions(db, request)
-            print(guest_permissions)
-            print(permission_name)
-            guest_permission_names = [perm.name for perm in guest_permissions]
-            if permission_name in guest_permission_names:
+            if granted(get_guest_permissions(db)):
                 return None
 
             raise HTTPException(
@@ -127,10 +188,10 @@ def require_permission(permission_name: Permission):
             )
 
         # Check authenticated user's permissions
-        user_permissions = service_get_user_permissions(db, current_user.id, True)
-        user_permission_names = [perm.name for perm in user_permissions]
-
-        if permission_name not in user_permission_names:
+        permissions = token_permissions(request, current_user)
+        if permissions is None:
+            permissions = get_effective_permissions(db, current_user.id)
+        if not granted(permissions):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission '{permission_name}' required",
@@ -144,8 +205,7 @@ def check_permissions_user(
     db: Session, user: User, required_permissions: list[str]
 ) -> bool:
     """Check if user has all required permissions"""
-    user_permissions = service_get_user_permissions(db, user.id, True)
-    user_permission_names = [perm.name for perm in user_permissions]
+    user_permission_names = get_effective_permissions(db, user.id)
     return all(perm in user_permission_names for perm in required_permissions)
 
 
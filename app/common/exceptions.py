@@ -15,3 +15,18 @@ class PermissionDenied(DomainError):
         self.code = "permission_denied"
         self.message = message
         super().__init__(message)
+
+
+class BadRequestError(DomainError):
+    def __init__(self, message: str = "Bad request"):
+        self.code = "bad_request"
+        self.message = message
+        super().__init__(message)
+
+
+# HTTP status returned for each DomainError code
+HTTP_STATUS_BY_CODE = {
+    "not_found": 404,
+    "permission_denied": 403,
+    "bad_request": 400,
+}
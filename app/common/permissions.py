@@ -1,3 +1,5 @@
+import hashlib
+from collections.abc import Iterable
 from typing import ClassVar
 
 
@@ -10,10 +12,15 @@ class Permission:
     """Base class for permission strings."""
 
     _resource: ClassVar[str] = ""
+    # Names of the registered actions; None registers every action
+    _actions: ClassVar[tuple[str, ...] | None] = None
 
-    def __init_subclass__(cls, resource: str = "", **kwargs):
+    def __init_subclass__(
+        cls, resource: str = "", actions: tuple[str, ...] | None = None, **kwargs
+    ):
         super().__init_subclass__(**kwargs)
         cls._resource = resource
+        cls._actions = actions
 
     @classmethod
     def _get_permission(cls, action: str) -> str:
@@ -112,3 +119,90 @@ class Files(Permission, resource="files"):
     @classproperty
     def Download(cls) -> str:
         return cls._get_permission("download")
+
+
+class Metrics(Permission, resource="metrics", actions=("List",)):
+    pass
+
+
+class PermissionRegistry:
+    """Every permission string declared above, each mapped to a stable bit.
+
+    Bits follow declaration order (resource classes, then their actions), so
+    new resources and actions should be appended to keep existing bits. The
+    ``version`` digest changes whenever the layout does.
+    """
+
+    def __init__(self, names: list[str]):
+        self.names = tuple(names)
+        self.bits = {name: 1 << index for index, name in enumerate(self.names)}
+        self.all_mask = (1 << len(self.names)) - 1
+        self.version = hashlib.sha1("\n".join(self.names).encode()).hexdigest()[:8]
+
+    def bit(self, name: str) -> int:
+        """Bit of a permission, 0 if it is not declared"""
+        return self.bits.get(name, 0)
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bits.get(name, 0)
+        return mask
+
+    def names_for(self, mask: int) -> list[str]:
+        return [name for name, bit in self.bits.items() if mask & bit]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.bits
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _collect_permission_names(base: type[Permission]) -> list[str]:
+    names: list[str] = []
+    for resource in base.__subclasses__():
+        for klass in reversed(resource.__mro__):
+            for attr, value in vars(klass).items():
+                if resource._actions is not None and attr not in resource._actions:
+                    continue
+                if isinstance(value, classproperty):
+                    name = getattr(resource, attr)
+                    if name not in names:
+                        names.append(name)
+        names.extend(
+            name for name in _collect_permission_names(resource) if name not in names
+        )
+    return names
+
+
+permission_registry = PermissionRegistry(_collect_permission_names(Permission))
+
+
+class PermissionSet:
+    """Resolved permission names together with their registry bitmask"""
+
+    __slots__ = ("names", "mask")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names = frozenset(names)
+        self.mask = permission_registry.mask(self.names)
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "PermissionSet":
+        return cls(permission_registry.names_for(mask))
+
+    def __contains__(self, name: object) -> bool:
+        bit = permission_registry.bits.get(name, 0) if isinstance(name, str) else 0
+        if bit:
+            return bool(self.mask & bit)
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
@@ -1,14 +1,135 @@
 from typing import Any
 
 from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.common.exceptions import BadRequestError
+from app.common.responses import ApiResponse
+from app.utils.pagination import PaginationParams, parse_fields
+
+
+def sparse_fieldset(schema: type[BaseModel]):
+    """Dependency returning the ``_fields`` of a request, checked against a schema"""
+    allowed = set(schema.model_fields)
+
+    def fields(_fields: str | None = None) -> list[str] | None:
+        requested = parse_fields(_fields)
+        unknown = [field for field in requested or () if field not in allowed]
+        if unknown:
+            raise BadRequestError(f"Unknown fields: {', '.join(unknown)}")
+        return requested
+
+    return fields
+
+
+class Embed:
+    """The ``_embed`` paths of a request and the read schemas to nest them with"""
+
+    def __init__(self, schema: type[BaseModel], embeds: dict, paths: list[str]):
+        self.schema = schema
+        self.embeds = embeds
+        self.paths = paths
+
+    def dump(self, row) -> dict:
+        return self._dump(row, self.schema, "")
+
+    def dump_all(self, rows: list) -> list:
+        """Rows with their embedded relations as dicts, or unchanged without any"""
+        if not self.paths:
+            return rows
+        return [self.dump(row) for row in rows]
+
+    def _dump(self, row, schema: type[BaseModel], prefix: str) -> dict:
+        # The read schemas have no relationship fields, so validating them
+        # never touches (and lazy-loads) a relation that was not embedded
+        data = schema.model_validate(row).model_dump(mode="json")
+        for path in self.paths:
+            name = path[len(prefix) :]
+            if not path.startswith(prefix) or "." in name:
+                continue
+            related = getattr(row, name)
+            if related is None:
+                data[name] = None
+            elif isinstance(related, list):
+                data[name] = [
+                    self._dump(item, self.embeds[path], f"{path}.") for item in related
+                ]
+            else:
+                data[name] = self._dump(related, self.embeds[path], f"{path}.")
+        return data
+
+
+def embeddable(schema: type[BaseModel], embeds: dict[str, type[BaseModel]]):
+    """Dependency returning the ``_embed`` of a request, checked against ``embeds``.
+
+    ``embeds`` maps each dotted relation path to the read schema of its rows.
+    """
+
+    def embed(_embed: str | None = None, _fields: str | None = None) -> Embed:
+        requested = parse_fields(_embed) or []
+        if requested and parse_fields(_fields):
+            raise BadRequestError("_fields cannot be combined with _embed")
+        unknown = [path for path in requested if path not in embeds]
+        if unknown:
+            raise BadRequestError(f"Unknown relations: {', '.join(unknown)}")
+        # location.country embeds the location as well
+        paths = {
+            ".".join(path.split(".")[: depth + 1])
+            for path in requested
+            for depth in range(path.count(".") + 1)
+        }
+        return Embed(schema, embeds, sorted(paths))
+
+    return embed
 
 
 def refine_list_response(
     response: Response,
     data: list[Any],
-    total: int,
+    total: int | None,
+    pagination: PaginationParams | None = None,
+    embed: Embed | None = None,
 ):
-    response.headers["X-Total-Count"] = str(total)
-    response.headers["Access-Control-Expose-Headers"] = "X-Total-Count"
+    """List response with refine's headers.
+
+    Rows are serialized by the endpoint's response model, except for
+    ``_embed`` (through the read schemas of ``embed``) and ``_fields`` (the
+    selected columns only), which would not match it.
+    """
+    exposed = []
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+        exposed.append("X-Total-Count")
+
+    # Which count strategy produced X-Total-Count; "estimate" is approximate
+    if pagination is not None and pagination.count_strategy:
+        response.headers["X-Count-Strategy"] = pagination.count_strategy
+        exposed.append("X-Count-Strategy")
 
+    if pagination is not None and pagination.next_cursor:
+        response.headers["X-Next-Cursor"] = pagination.next_cursor
+        exposed.append("X-Next-Cursor")
+
+    response.headers["Access-Control-Expose-Headers"] = ", ".join(exposed)
+
+    headers = dict(response.headers)
+    if embed is not None and embed.paths:
+        return JSONResponse(embed.dump_all(data), headers=headers)
+    if pagination is not None and pagination.fields:
+        # Sparse pages are dicts of the requested columns, never ORM objects
+        return JSONResponse(jsonable_encoder(data), headers=headers)
     return data
+
+
+def refine_show_response(
+    data: Any, fields: list[str] | None = None, embed: Embed | None = None
+):
+    """ApiResponse of a show endpoint, bypassing the read schema for
+    ``_fields`` and ``_embed``"""
+    if embed is not None and embed.paths:
+        return JSONResponse({"data": embed.dump(data), "meta": None})
+    if fields:
+        return JSONResponse({"data": jsonable_encoder(data), "meta": None})
+    return ApiResponse(data=data)
@@ -0,0 +1,148 @@
+from collections.abc import Iterable
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlmodel import SQLModel
+
+# Shared write path of the feature repos. Each helper is a single statement
+# per row (plus COMMIT); nothing is read back that the caller already has.
+# Sessions are opened with expire_on_commit=False, so returned rows stay
+# loaded after the commit.
+
+
+def insert_row(db: Session, row: SQLModel):
+    """INSERT a new row.
+
+    Ids and other defaults are generated client-side when the model is built,
+    so the row is complete without a refresh SELECT.
+    """
+    db.add(row)
+    db.commit()
+    return row
+
+
+def update_by_id(db: Session, model: type[SQLModel], row_id: str, updates: dict):
+    """UPDATE ... WHERE id and return the updated row, or None if it is missing.
+
+    Uses UPDATE ... RETURNING where the database supports it. MariaDB does
+    not, so the row is read back in the same transaction instead.
+    """
+    if not updates:
+        return db.get(model, row_id)
+
+    statement = (
+        update(model)
+        .where(model.id == row_id)
+        .values(**updates)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind(clause=statement).dialect.update_returning:
+        row = db.scalars(
+            statement.returning(model),
+            execution_options={"populate_existing": True},
+        ).first()
+    elif db.execute(statement).rowcount:
+        row = db.get(model, row_id, populate_existing=True)
+    else:
+        row = None
+    db.commit()
+    return row
+
+
+def delete_by_id(
+    db: Session,
+    model: type[SQLModel],
+    row_id: str,
+    *,
+    links: Iterable[InstrumentedAttribute] = (),
+    nullify: Iterable[InstrumentedAttribute] = (),
+) -> bool:
+    """DELETE ... WHERE id without loading the row first.
+
+    ``links`` are link-table columns whose rows go with it and ``nullify``
+    foreign keys that are cleared, as the ORM did for loaded relationships.
+    Returns False if no row matched.
+    """
+    for column in links:
+        db.execute(delete(column.class_).where(column == row_id))
+    for column in nullify:
+        db.execute(
+            update(column.class_)
+            .where(column == row_id)
+            .values({column.key: None})
+            .execution_options(synchronize_session=False)
+        )
+    deleted = delete_where(db, model, model.id == row_id)
+    return deleted > 0
+
+
+def delete_where(db: Session, model: type[SQLModel], *conditions) -> int:
+    """Set-based DELETE, returning the number of deleted rows"""
+    result = db.execute(
+        delete(model).where(*conditions).execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+# =========================
+# BULK WRITES
+# =========================
+def existing_ids(db: Session, model: type[SQLModel], ids: Iterable[str]) -> set[str]:
+    """The subset of ``ids`` present in the model's table"""
+    ids = list(ids)
+    if not ids:
+        return set()
+    return set(db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+
+
+def insert_rows(db: Session, model: type[SQLModel], rows: list[SQLModel]) -> list:
+    """Multi-row INSERT of new rows in one transaction"""
+    if rows:
+        db.execute(insert(model), [row.model_dump() for row in rows])
+        db.commit()
+    return rows
+
+
+def update_rows(db: Session, model: type[SQLModel], rows: list[dict]) -> list:
+    """UPDATE many rows by id in one transaction and return them.
+
+    ``rows`` are dicts holding the ``id`` and the columns to set. Rows setting
+    the same columns share one executemany statement.
+    """
+    if not rows:
+        return []
+    changed = [row for row in rows if len(row) > 1]
+    if changed:
+        db.execute(update(model), changed)
+    result = db.execute(
+        select(model)
+        .where(model.id.in_([row["id"] for row in rows]))
+        .execution_options(populate_existing=True)
+    )
+    updated = list(result.scalars())
+    db.commit()
+    return updated
+
+
+def delete_rows(
+    db: Session,
+    model: type[SQLModel],
+    ids: list[str],
+    *,
+    links: Iterable[InstrumentedAttribute] = (),
+    nullify: Iterable[InstrumentedAttribute] = (),
+) -> int:
+    """Set-based delete_by_id for many ids in one transaction"""
+    if not ids:
+        return 0
+    for column in links:
+        db.execute(delete(column.class_).where(column.in_(ids)))
+    for column in nullify:
+        db.execute(
+            update(column.class_)
+            .where(column.in_(ids))
+            .values({column.key: None})
+            .execution_options(synchronize_session=False)
+        )
+    return delete_where(db, model, model.id.in_(ids))
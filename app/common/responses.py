@@ -18,3 +18,17 @@ class MessageResponse(BaseModel):
 class ApiResponse(GenericModel, Generic[T]):
     data: T
     meta: dict | None = None
+
+
+class BulkItemError(BaseModel):
+    index: int
+    id: str | None = None
+    detail: str
+
+
+class BulkResult(GenericModel, Generic[T]):
+    """Outcome of a bulk request: processed rows and rejected items"""
+
+    items: list[T] = []
+    deleted: list[str] = []
+    errors: list[BulkItemError] = []
@@ -2,12 +2,29 @@ import os
 
 from pydantic_settings import BaseSettings
 
+# Named shared-cache database, visible to every connection of the process
+# unlike a plain ":memory:" one
+SQLITE_MEMORY_URI = "file:congressinfo?mode=memory&cache=shared"
+
+
+def async_database_uri(uri: str) -> str:
+    """The same database URI using the asyncio driver"""
+    if uri.startswith("sqlite://"):
+        return uri.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return uri.replace("+pymysql", "+aiomysql", 1)
+
 
 class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your_secret_key")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Embed the user's permission bitmask in access tokens
+    TOKEN_PERMISSION_CLAIMS: bool = (
+        os.getenv("TOKEN_PERMISSION_CLAIMS", "False").lower() == "true"
+    )
     PROJECT_NAME: str = os.getenv("PROJECT_NAME", "Congress Info API")
+    # Debug mode adds diagnostic response headers such as X-DB-Queries
+    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     API_V1_STR: str = "/api/v1"
     all_cors_origins: list[str] = [
         origin.strip()
@@ -16,8 +33,21 @@ class Settings(BaseSettings):
     ]
     print(all_cors_origins)
 
+    # "mysql" for MariaDB, or "sqlite" to run without a database server, e.g.
+    # for local benchmarks and tests. The SQLite schema is built from the
+    # SQLModel metadata and seeded with the prestart data.
+    DATABASE_BACKEND: str = os.getenv("DATABASE_BACKEND", "mysql").lower()
+    # SQLite database file; empty keeps the database in memory
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "")
+    # Seeded SQLite file copied into new databases, built on first use
+    SQLITE_TEMPLATE_PATH: str = os.getenv("SQLITE_TEMPLATE_PATH", "")
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
+        if self.DATABASE_BACKEND == "sqlite":
+            if self.SQLITE_PATH:
+                return f"sqlite:///{self.SQLITE_PATH}"
+            return f"sqlite:///{SQLITE_MEMORY_URI}&uri=true"
         user = os.getenv("MYSQL_USER", "")
         password = os.getenv("MYSQL_PASSWORD", "")
         host = os.getenv("MYSQL_SERVER", "")
@@ -26,6 +56,64 @@ class Settings(BaseSettings):
         # For MariaDB 10.5+, use mariadb connector
         return f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset=utf8mb4"
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        # Same database through the asyncio driver
+        return async_database_uri(self.SQLALCHEMY_DATABASE_URI)
+
+    # Connection pool per engine and worker process. Every uvicorn worker holds
+    # a sync and an async engine, so the database may see up to
+    # workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    DB_READ_TIMEOUT: int = int(os.getenv("DB_READ_TIMEOUT", "30"))
+    DB_WRITE_TIMEOUT: int = int(os.getenv("DB_WRITE_TIMEOUT", "30"))
+
+    # Optional read replicas as comma-separated mysql+pymysql URIs. Safe
+    # requests read from them unless the client wrote within
+    # READ_YOUR_WRITES_SECONDS.
+    SQLALCHEMY_REPLICA_URIS: list[str] = [
+        uri.strip()
+        for uri in os.getenv("DATABASE_REPLICA_URIS", "").split(",")
+        if uri.strip()
+    ]
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    @property
+    def SQLALCHEMY_ASYNC_REPLICA_URIS(self) -> list[str]:
+        return [async_database_uri(uri) for uri in self.SQLALCHEMY_REPLICA_URIS]
+
+    # Default way list endpoints produce X-Total-Count: exact, window, cached,
+    # estimate or none. Endpoints and the _count parameter can override it.
+    COUNT_STRATEGY: str = os.getenv("COUNT_STRATEGY", "exact").lower()
+    # Cached counts per worker, also dropped when the worker writes the table
+    COUNT_CACHE_SIZE: int = int(os.getenv("COUNT_CACHE_SIZE", "1024"))
+    COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+    # EXPLAIN estimates below this are replaced by an exact count
+    COUNT_ESTIMATE_MIN_ROWS: int = int(os.getenv("COUNT_ESTIMATE_MIN_ROWS", "10000"))
+
+    # Time zone of the calendar days in date-only filters (start_date=2026-05-01)
+    # on datetime columns, which hold UTC
+    FILTER_TIMEZONE: str = os.getenv("FILTER_TIMEZONE", "UTC")
+    # Most values one in filter (or repeated ?id=) may list
+    FILTER_IN_MAX_VALUES: int = int(os.getenv("FILTER_IN_MAX_VALUES", "10000"))
+
+    # Record the filter/sort shape and latency of list queries; with
+    # QUERY_USAGE_DIR a background thread writes them there every
+    # QUERY_USAGE_FLUSH_SECONDS for scripts/index_advisor.py
+    QUERY_USAGE_RECORDING: bool = (
+        os.getenv("QUERY_USAGE_RECORDING", "True").lower() == "true"
+    )
+    QUERY_USAGE_DIR: str = os.getenv("QUERY_USAGE_DIR", "")
+    QUERY_USAGE_FLUSH_SECONDS: int = int(os.getenv("QUERY_USAGE_FLUSH_SECONDS", "60"))
+
+    # Largest number of items accepted by one bulk request
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
     FILE_UPLOAD_DIR: str = os.getenv("FILE_UPLOAD_DIR", "./files")
 
     # Email settings
@@ -50,6 +138,41 @@ class Settings(BaseSettings):
 
     PROJECT_VERSION: str = os.getenv("PROJECT_VERSION", "0.1.0")
 
+    # Threads per worker used for bcrypt hashing and verification
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+    # Verified access tokens cached per worker process
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+    # Effective permission sets resolved per user
+    PERMISSION_CACHE_SIZE: int = int(os.getenv("PERMISSION_CACHE_SIZE", "4096"))
+    PERMISSION_CACHE_TTL_SECONDS: int = int(
+        os.getenv("PERMISSION_CACHE_TTL_SECONDS", "300")
+    )
+    # Guest permissions are loaded at startup and refreshed on change
+    GUEST_PERMISSIONS_REFRESH_SECONDS: int = int(
+        os.getenv("GUEST_PERMISSIONS_REFRESH_SECONDS", "300")
+    )
+
+    # SQL logging: "off", "sampled" (SQL_LOG_SAMPLE_RATE of all statements) or
+    # "full". Statements slower than SQL_SLOW_QUERY_MS are logged in every mode
+    # together with their route; 0 disables slow-query logging.
+    SQL_LOG_MODE: str = os.getenv("SQL_LOG_MODE", "off").lower()
+    SQL_LOG_SAMPLE_RATE: float = float(os.getenv("SQL_LOG_SAMPLE_RATE", "0.01"))
+    SQL_SLOW_QUERY_MS: int = int(os.getenv("SQL_SLOW_QUERY_MS", "500"))
+    # Include bound parameters in SQL logs (may contain personal data)
+    SQL_LOG_PARAMETERS: bool = (
+        os.getenv("SQL_LOG_PARAMETERS", "False").lower() == "true"
+    )
+    # Requests repeating one statement this often are logged as likely N+1s
+    SQL_REPEAT_THRESHOLD: int = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+    # Statements allowed per request (0 = unlimited); routes may override it
+    # with query_budget(). In strict mode exceeding it raises, e.g. in tests.
+    SQL_QUERY_BUDGET: int = int(os.getenv("SQL_QUERY_BUDGET", "0"))
+    SQL_STRICT_QUERY_BUDGET: bool = (
+        os.getenv("SQL_STRICT_QUERY_BUDGET", "False").lower() == "true"
+    )
+
     @property
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
@@ -1,28 +1,202 @@
-from sqlalchemy import create_engine
+import random
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel import Session as SQLSession
 
 from app.core.config import settings
+from app.core.pool import PoolMetrics, TimedAsyncQueuePool, TimedQueuePool
+from app.core.sql_logging import install_sql_logging
 from app.features.events.model import Event, EventType  # noqa: F401
 from app.features.locations.model import Country, Location, LocationType  # noqa: F401
 from app.features.permissions.model import Permission  # noqa: F401
 from app.features.roles.model import Role, RolePermission  # noqa: F401
 from app.features.users.model import User, UserPermission, UserRole  # noqa: F401
+from app.utils.refine_count import install_count_invalidation
 
 Base = declarative_base()
 
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=True,
-    poolclass=QueuePool,
-    pool_size=5,  # Number of connections to maintain
-    max_overflow=10,  # Additional connections when pool is full
-    pool_pre_ping=True,  # Test connections before using them (critical for remote DB)
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    connect_args={
-        "connect_timeout": 10,  # Connection timeout in seconds
-        "read_timeout": 30,  # Read timeout in seconds
-        "write_timeout": 30,  # Write timeout in seconds
-    },
-)
+def _connect_args(mysql_args: dict) -> dict:
+    if settings.DATABASE_BACKEND == "sqlite":
+        # Connections move between threads with the pool; timeout is the
+        # time to wait on a locked database
+        return {"check_same_thread": False, "timeout": settings.DB_CONNECT_TIMEOUT}
+    return mysql_args
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ARG001
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    if settings.SQLITE_PATH:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _configure_sqlite(engine: Engine) -> None:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _sqlite_pragmas)
+
+
+def _create_engine(uri: str) -> Engine:
+    engine = create_engine(
+        uri,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,  # Number of connections to maintain
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Additional connections when pool is full
+        pool_timeout=settings.DB_POOL_TIMEOUT,  # Seconds to wait for a free connection
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # Test connections before using them (critical for remote DB)
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections after this many seconds
+        connect_args=_connect_args(
+            {
+                "connect_timeout": settings.DB_CONNECT_TIMEOUT,
+                "read_timeout": settings.DB_READ_TIMEOUT,
+                "write_timeout": settings.DB_WRITE_TIMEOUT,
+            }
+        ),
+    )
+    engine.pool.metrics = PoolMetrics()
+    _configure_sqlite(engine)
+    # Query logging is configured through SQL_LOG_* settings instead of echo
+    install_sql_logging(engine)
+    install_count_invalidation(engine)
+    return engine
+
+
+def _create_async_engine(uri: str) -> AsyncEngine:
+    # aiomysql has no read/write timeouts
+    engine = create_async_engine(
+        uri,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=_connect_args({"connect_timeout": settings.DB_CONNECT_TIMEOUT}),
+    )
+    engine.pool.metrics = PoolMetrics()
+    _configure_sqlite(engine.sync_engine)
+    install_sql_logging(engine.sync_engine)
+    install_count_invalidation(engine.sync_engine)
+    return engine
+
+
+engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+
+# Async engine for routes migrated to AsyncSession (see common.deps.get_async_db).
+# It keeps its own pool, so both engines together may open up to twice the
+# connections above.
+async_engine = _create_async_engine(settings.SQLALCHEMY_ASYNC_DATABASE_URI)
+
+# Optional read replicas, each with its own sync and async pool
+replica_engines = [_create_engine(uri) for uri in settings.SQLALCHEMY_REPLICA_URIS]
+async_replica_engines = [
+    _create_async_engine(uri) for uri in settings.SQLALCHEMY_ASYNC_REPLICA_URIS
+]
+
+
+# =========================
+# READ REPLICA ROUTING
+# =========================
+# Whether the current request may read from a replica, set by
+# ReplicaRoutingMiddleware. Outside of requests everything uses the primary.
+_read_only: ContextVar[bool] = ContextVar("db_read_only", default=False)
+
+SAFE_METHODS = ("GET", "HEAD")
+PIN_COOKIE = "db_primary_until"
+
+
+def use_replica() -> bool:
+    """Whether sessions opened now may send their reads to a replica"""
+    return _read_only.get()
+
+
+class RoutingSession(SQLSession):
+    """Session sending reads to a replica when info["read_only"] is set.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary, and
+    once a session has written, its later reads do as well.
+    """
+
+    primary: Engine = engine
+    replicas: list[Engine] = replica_engines
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["read_only"] = False
+        if self.replicas and self.info.get("read_only"):
+            return random.choice(self.replicas)
+        return self.primary
+
+
+class AsyncRoutingSession(RoutingSession):
+    """Sync side of an AsyncSession routed like RoutingSession"""
+
+    primary = async_engine.sync_engine
+    replicas = [replica.sync_engine for replica in async_replica_engines]
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe requests to replicas, except shortly after the client wrote.
+
+    A successful write sets a short-lived cookie that pins the client to the
+    primary for READ_YOUR_WRITES_SECONDS, so it reads its own changes even if
+    the replicas lag behind. The cookie works across worker processes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_engines:
+            await self.app(scope, receive, send)
+            return
+
+        safe = scope["method"] in SAFE_METHODS
+        token = _read_only.set(safe and not self._pinned(scope))
+
+        async def send_with_pin(message):
+            if (
+                not safe
+                and message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], self._pin_header()]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _read_only.reset(token)
+
+    @staticmethod
+    def _pinned(scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name != b"cookie":
+                continue
+            cookies = SimpleCookie(value.decode("latin-1"))
+            if PIN_COOKIE in cookies:
+                try:
+                    return float(cookies[PIN_COOKIE].value) > time.time()
+                except ValueError:
+                    return False
+        return False
+
+    @staticmethod
+    def _pin_header() -> tuple[bytes, bytes]:
+        seconds = settings.READ_YOUR_WRITES_SECONDS
+        until = int(time.time()) + seconds
+        cookie = (
+            f"{PIN_COOKIE}={until}; Max-Age={seconds}; Path=/; "
+            "HttpOnly; Secure; SameSite=none"
+        )
+        return b"set-cookie", cookie.encode("latin-1")
@@ -0,0 +1,196 @@
+"""Index proposals for the list filter/sort shapes recorded in production.
+
+Merges the usage-<pid>.json files the workers write to QUERY_USAGE_DIR,
+compares each frequent shape with the indexes the database already has and
+ranks composite index proposals by the time spent in their queries. The
+command line is scripts/index_advisor.py.
+"""
+
+import datetime
+import glob
+import json
+import os
+import uuid
+
+from sqlalchemy import Engine, inspect
+
+# Range operators; ne, contains and q cannot use a B-tree index
+RANGE_OPS = ("gte", "lte", "gt", "lt")
+
+# MariaDB/MySQL identifier limit
+_MAX_NAME_LENGTH = 64
+
+
+# =========================
+# USAGE
+# =========================
+def load_usage(directory: str) -> list[dict]:
+    """The shapes of all usage files in ``directory``, merged across workers"""
+    merged: dict[tuple, dict] = {}
+    for path in sorted(glob.glob(os.path.join(directory, "usage-*.json"))):
+        with open(path) as file:
+            shapes = json.load(file)
+        for shape in shapes:
+            filters = tuple(tuple(item) for item in shape["filters"])
+            key = (shape["table"], filters, shape["sort"], shape["search"])
+            total = merged.get(key)
+            if total is None:
+                merged[key] = {**shape, "filters": [list(item) for item in filters]}
+                continue
+            total["count"] += shape["count"]
+            total["total_ms"] += shape["total_ms"]
+            total["max_ms"] = max(total["max_ms"], shape["max_ms"])
+    return list(merged.values())
+
+
+def index_columns(shape: dict) -> list[str]:
+    """Columns of the index serving a shape: equality, sort, then one range"""
+    filters = [tuple(item) for item in shape["filters"]]
+    columns = sorted({field for field, op in filters if op == "eq"})
+    columns += sorted({field for field, op in filters if op == "in"} - set(columns))
+    sort = shape.get("sort")
+    if sort and sort not in columns:
+        columns.append(sort)
+    ranges = sorted({field for field, op in filters if op in RANGE_OPS} - set(columns))
+    if ranges:
+        # Only the first range column narrows the scan; after a sort column it
+        # still lets the engine filter on the index before reading rows
+        columns.append(ranges[0])
+    return columns
+
+
+# =========================
+# EXISTING INDEXES
+# =========================
+def existing_indexes(engine: Engine) -> dict[str, list[list[str]]]:
+    """Column lists of the primary key, unique constraints and indexes per table.
+
+    MariaDB/InnoDB also index every foreign key column; those indexes are
+    reported by the inspector like any other.
+    """
+    inspector = inspect(engine)
+    indexes: dict[str, list[list[str]]] = {}
+    for table in inspector.get_table_names():
+        columns = [inspector.get_pk_constraint(table)["constrained_columns"]]
+        columns += [
+            unique["column_names"] for unique in inspector.get_unique_constraints(table)
+        ]
+        columns += [
+            index["column_names"]
+            for index in inspector.get_indexes(table)
+            if not index.get("dialect_options", {}).get("mysql_prefix")
+        ]
+        indexes[table] = [
+            list(column_names) for column_names in columns if column_names
+        ]
+    return indexes
+
+
+def is_covered(columns: list[str], indexes: list[list[str]]) -> bool:
+    """Whether an existing index starts with exactly these columns"""
+    return any(index[: len(columns)] == columns for index in indexes)
+
+
+# =========================
+# PROPOSALS
+# =========================
+def propose_indexes(
+    shapes: list[dict], indexes: dict[str, list[list[str]]], min_count: int = 1
+) -> list[dict]:
+    """Missing indexes for the recorded shapes, most time spent first.
+
+    Shapes seen fewer than ``min_count`` times are ignored. A proposal that
+    is the prefix of another one on the same table is folded into it.
+    """
+    proposals: dict[tuple, dict] = {}
+    for shape in shapes:
+        if shape["count"] < min_count:
+            continue
+        columns = index_columns(shape)
+        if not columns or is_covered(columns, indexes.get(shape["table"], [])):
+            continue
+        key = (shape["table"], tuple(columns))
+        proposal = proposals.setdefault(
+            key,
+            {"table": shape["table"], "columns": columns, "count": 0, "total_ms": 0.0},
+        )
+        proposal["count"] += shape["count"]
+        proposal["total_ms"] += shape["total_ms"]
+
+    for key in sorted(proposals, key=lambda key: len(key[1])):
+        table, columns = key
+        longer = next(
+            (
+                other
+                for other in proposals
+                if other != key
+                and other[0] == table
+                and other[1][: len(columns)] == columns
+            ),
+            None,
+        )
+        if longer is not None:
+            folded = proposals.pop(key)
+            proposals[longer]["count"] += folded["count"]
+            proposals[longer]["total_ms"] += folded["total_ms"]
+
+    return sorted(proposals.values(), key=lambda proposal: -proposal["total_ms"])
+
+
+def index_name(table: str, columns: list[str]) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"[:_MAX_NAME_LENGTH]
+
+
+# =========================
+# MIGRATION
+# =========================
+def render_migration(proposals: list[dict], revision: str, down_revision: str) -> str:
+    """An Alembic migration creating the proposed indexes"""
+    upgrade = "\n".join(
+        f"    # {proposal['count']} queries, {proposal['total_ms']:.0f} ms in total\n"
+        f"    op.create_index(op.f('{index_name(proposal['table'], proposal['columns'])}'), "
+        f"'{proposal['table']}', {proposal['columns']!r}, unique=False)"
+        for proposal in proposals
+    )
+    downgrade = "\n".join(
+        f"    op.drop_index(op.f('{index_name(proposal['table'], proposal['columns'])}'), "
+        f"table_name='{proposal['table']}')"
+        for proposal in reversed(proposals)
+    )
+    return f'''"""Add indexes proposed by the index advisor
+
+Revision ID: {revision}
+Revises: {down_revision}
+Create Date: {datetime.datetime.now()}
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '{revision}'
+down_revision = '{down_revision}'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+{upgrade}
+
+
+def downgrade():
+{downgrade}
+'''
+
+
+def write_migration(proposals: list[dict], config_path: str = "alembic.ini") -> str:
+    """Write the migration after the current head and return its path"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    scripts = ScriptDirectory.from_config(Config(config_path))
+    revision = uuid.uuid4().hex[:12]
+    path = os.path.join(scripts.versions, f"{revision}_add_advised_indexes.py")
+    with open(path, "w") as file:
+        file.write(render_migration(proposals, revision, scripts.get_current_head()))
+    return path
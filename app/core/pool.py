@@ -0,0 +1,97 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds in milliseconds of the checkout latency histogram buckets
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Checkout latency of a connection pool in this worker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+
+    def observe(self, wait_seconds: float, timed_out: bool = False) -> None:
+        index = bisect.bisect_left(CHECKOUT_BUCKETS_MS, wait_seconds * 1000)
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_seconds_total += wait_seconds
+                self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self.buckets[index] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            checkouts = self.checkouts or 1
+            # Cumulative counts per upper bound, as in Prometheus histograms
+            histogram, total = {}, 0
+            bounds = (*CHECKOUT_BUCKETS_MS, "+Inf")
+            for bound, count in zip(bounds, self.buckets, strict=True):
+                total += count
+                histogram[f"le_{bound}"] = total
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_seconds_total / checkouts * 1000, 3),
+                "max_wait_ms": round(self.wait_seconds_max * 1000, 3),
+                "wait_histogram_ms": histogram,
+            }
+
+
+class TimedCheckoutMixin:
+    """Record how long callers wait for a connection from the pool"""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> dict:
+    """Current state and checkout latency of an engine's pool"""
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": pool.timeout(),
+    }
+    if isinstance(pool, TimedCheckoutMixin) and pool.metrics is not None:
+        stats.update(pool.metrics.stats())
+    return stats
@@ -0,0 +1,111 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryUsage:
+    """Filter/sort shapes of list queries served by this worker, with latency.
+
+    A shape is the table, the filtered fields with their operators, the sort
+    column and whether ``q`` was used; values are never recorded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes: dict[tuple, dict] = {}
+        self._flusher: threading.Thread | None = None
+
+    def record(
+        self,
+        table: str,
+        filters: tuple[tuple[str, str], ...],
+        sort: str | None,
+        search: bool,
+        seconds: float,
+    ) -> None:
+        key = (table, filters, sort, search)
+        milliseconds = seconds * 1000
+        with self._lock:
+            shape = self._shapes.get(key)
+            if shape is None:
+                shape = self._shapes[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            shape["count"] += 1
+            shape["total_ms"] += milliseconds
+            shape["max_ms"] = max(shape["max_ms"], milliseconds)
+        if self._flusher is None and settings.QUERY_USAGE_DIR:
+            self._start_flusher()
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "table": table,
+                    "filters": [list(item) for item in filters],
+                    "sort": sort,
+                    "search": search,
+                    "count": shape["count"],
+                    "total_ms": round(shape["total_ms"], 3),
+                    "max_ms": round(shape["max_ms"], 3),
+                }
+                for (table, filters, sort, search), shape in self._shapes.items()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+    def flush(self) -> None:
+        """Write this worker's shapes to QUERY_USAGE_DIR for the index advisor"""
+        directory = settings.QUERY_USAGE_DIR
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"usage-{os.getpid()}.json")
+        partial = f"{path}.partial"
+        with open(partial, "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(partial, path)
+
+    def _start_flusher(self) -> None:
+        # Started by the first recorded query, so each worker (not the
+        # process that forked it) runs its own flusher, off the event loop
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="query-usage-flush", daemon=True
+            )
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(settings.QUERY_USAGE_FLUSH_SECONDS)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Could not write query usage")
+
+
+query_usage = QueryUsage()
+atexit.register(query_usage.flush)
+
+
+@contextmanager
+def record_list_query(table: str, filters, sort: str | None, search: bool):
+    """Time a list query and record its shape if it succeeds"""
+    if not settings.QUERY_USAGE_RECORDING:
+        yield
+        return
+    started = time.perf_counter()
+    yield
+    query_usage.record(
+        table, tuple(sorted(filters)), sort, search, time.perf_counter() - started
+    )
@@ -1,6 +1,10 @@
+import asyncio
 import json
 import os
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from cryptography.fernet import Fernet
@@ -8,10 +12,24 @@ from fastapi import Response
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.common.permissions import PermissionSet, permission_registry
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified access tokens keyed on their signature. Entries live until the
+# token's exp, but never longer than TOKEN_CACHE_TTL_SECONDS so that changes
+# made on another worker are picked up quickly.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_user_tokens(user_id: str) -> None:
+    """Drop every cached token belonging to a user"""
+    token_cache.invalidate_tag(user_id)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
@@ -23,6 +41,95 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashMetrics:
+    """Queue depth and latency of the password hashing pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_seconds_total = 0.0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+
+    def submitted(self) -> None:
+        with self._lock:
+            self.queued += 1
+
+    def cancelled(self) -> None:
+        with self._lock:
+            self.queued -= 1
+
+    def started(self) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+
+    def finished(self, wait_seconds: float, hash_seconds: float) -> None:
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+            self.wait_seconds_total += wait_seconds
+            self.hash_seconds_total += hash_seconds
+            self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "avg_wait_ms": round(self.wait_seconds_total / completed * 1000, 2),
+                "avg_hash_ms": round(self.hash_seconds_total / completed * 1000, 2),
+                "max_hash_ms": round(self.hash_seconds_max * 1000, 2),
+            }
+
+
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the
+# event loop free without the overhead of a process pool.
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+password_hash_metrics = PasswordHashMetrics()
+
+
+async def _run_in_hash_pool(func, *args):
+    submitted_at = time.perf_counter()
+
+    def job():
+        started_at = time.perf_counter()
+        password_hash_metrics.started()
+        try:
+            return func(*args)
+        finally:
+            password_hash_metrics.finished(
+                started_at - submitted_at, time.perf_counter() - started_at
+            )
+
+    def on_done(future):
+        # Requests cancelled while still queued never reach job()
+        if future.cancelled():
+            password_hash_metrics.cancelled()
+
+    password_hash_metrics.submitted()
+    future = password_hash_executor.submit(job)
+    future.add_done_callback(on_done)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -37,6 +144,34 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+def permission_version(user_version: int) -> str:
+    """Registry layout and the user's stored permission version"""
+    return f"{permission_registry.version}.{user_version}"
+
+
+def permission_claims(permissions: PermissionSet, user_version: int) -> dict:
+    """Compact permission claims for an access token.
+
+    ``perm`` is the hex registry bitmask and ``pv`` the permission version it
+    was built against: a registry change or a later change of the user's
+    permissions outdates the claims.
+    """
+    return {
+        "perm": format(permissions.mask, "x"),
+        "pv": permission_version(user_version),
+    }
+
+
+def read_permission_claims(claims: dict, user_version: int) -> PermissionSet | None:
+    """PermissionSet encoded in token claims, if present and still current"""
+    if claims.get("pv") != permission_version(user_version) or "perm" not in claims:
+        return None
+    try:
+        return PermissionSet.from_mask(int(claims["perm"], 16))
+    except (TypeError, ValueError):
+        return None
+
+
 def test_password_hashing():
     plain_password = "superduper"
     hashed_password = get_password_hash(plain_password)
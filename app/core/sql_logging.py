@@ -0,0 +1,238 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+SQL_LOG_MODES = ("off", "sampled", "full")
+
+sql_logger = logging.getLogger("app.sql")
+
+# ASGI scope of the request being served, used to name the originating route
+_request_scope: ContextVar[dict | None] = ContextVar("sql_request_scope", default=None)
+_request_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "sql_request_stats", default=None
+)
+
+_whitespace = re.compile(r"\s+")
+_listener: QueueListener | None = None
+
+
+def _start_listener() -> None:
+    """Hand records to a background thread so requests never wait on stdout"""
+    global _listener
+    if _listener is not None:
+        return
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    _listener = QueueListener(records, stream)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    sql_logger.addHandler(QueueHandler(records))
+    sql_logger.setLevel(logging.INFO)
+    sql_logger.propagate = False
+
+
+def current_route() -> str | None:
+    """Method and route template of the request issuing the current query"""
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    # The router stores the matched route in the scope once it is resolved
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request issued more statements than its query budget allows"""
+
+
+class QueryStats:
+    """Statements and database time of a single request"""
+
+    def __init__(self, budget: int):
+        self.count = 0
+        self.seconds = 0.0
+        self.budget = budget
+        self.rejected = 0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] += 1
+
+    def repeated(self) -> dict[str, int]:
+        """Statements issued SQL_REPEAT_THRESHOLD times or more, likely N+1s"""
+        threshold = settings.SQL_REPEAT_THRESHOLD
+        if threshold <= 0:
+            return {}
+        return {
+            _whitespace.sub(" ", statement).strip(): count
+            for statement, count in self.shapes.most_common()
+            if count >= threshold
+        }
+
+    def over_budget(self) -> bool:
+        return self.rejected > 0 or 0 < self.budget < self.count
+
+    def header(self) -> str:
+        return (
+            f"count={self.count}; time_ms={self.seconds * 1000:.1f}; "
+            f"repeated={len(self.repeated())}"
+        )
+
+
+def current_query_stats() -> QueryStats | None:
+    """Statistics of the request being served, if any"""
+    return _request_stats.get()
+
+
+def query_budget(limit: int):
+    """Dependency factory overriding SQL_QUERY_BUDGET for a single route"""
+
+    def set_query_budget() -> None:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return set_query_budget
+
+
+class SQLRouteMiddleware:
+    """Count the statements of each request and name its route in query logs.
+
+    Requests with repeated statement shapes or over their query budget are
+    logged; with DEBUG the counts are also sent in an X-DB-Queries header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(settings.SQL_QUERY_BUDGET)
+
+        async def send_with_stats(message):
+            if settings.DEBUG and message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-queries", stats.header().encode("latin-1")),
+                ]
+            await send(message)
+
+        scope_token = _request_scope.set(scope)
+        stats_token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            self._log_request(stats)
+            _request_stats.reset(stats_token)
+            _request_scope.reset(scope_token)
+
+    @staticmethod
+    def _log_request(stats: QueryStats) -> None:
+        repeated = stats.repeated()
+        over_budget = stats.over_budget()
+        if not (repeated or over_budget or settings.DEBUG):
+            return
+        record = {
+            "event": "request_queries",
+            "route": current_route(),
+            "count": stats.count,
+            "time_ms": round(stats.seconds * 1000, 2),
+            "budget": stats.budget or None,
+            "repeated": repeated,
+        }
+        sql_logger.log(
+            logging.WARNING if repeated or over_budget else logging.INFO,
+            json.dumps(record),
+        )
+
+
+def _should_log(duration_ms: float) -> tuple[bool, bool]:
+    slow = 0 < settings.SQL_SLOW_QUERY_MS <= duration_ms
+    mode = settings.SQL_LOG_MODE
+    if mode == "full":
+        return True, slow
+    if mode == "sampled":
+        return slow or random.random() < settings.SQL_LOG_SAMPLE_RATE, slow
+    return slow, slow
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+    stats = _request_stats.get()
+    if (
+        stats is not None
+        and settings.SQL_STRICT_QUERY_BUDGET
+        and 0 < stats.budget <= stats.count
+    ):
+        stats.rejected += 1
+        raise QueryBudgetExceeded(
+            f"{current_route()} exceeded its budget of {stats.budget} queries"
+        )
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+    started = conn.info["query_started_at"].pop()
+    seconds = time.perf_counter() - started
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+    duration_ms = seconds * 1000
+    emit, slow = _should_log(duration_ms)
+    if not emit:
+        return
+
+    record = {
+        "event": "slow_query" if slow else "query",
+        "duration_ms": round(duration_ms, 2),
+        "route": current_route(),
+        "rows": cursor.rowcount,
+        "statement": _whitespace.sub(" ", statement).strip(),
+    }
+    if settings.SQL_LOG_PARAMETERS:
+        record["parameters"] = repr(parameters)
+    sql_logger.log(
+        logging.WARNING if slow else logging.INFO, json.dumps(record, default=str)
+    )
+
+
+def _handle_error(context) -> None:
+    # Failed statements never reach after_cursor_execute. The handler must
+    # not raise itself, or it would replace the original database error
+    cursor = getattr(context.execution_context, "cursor", None)
+    if context.connection is not None and cursor is not None:
+        started = context.connection.info.get("query_started_at")
+        if started:
+            started.pop()
+
+
+def install_sql_logging(engine: Engine) -> None:
+    """Attach query timing, per-request counting and logging to an engine"""
+    if settings.SQL_LOG_MODE not in SQL_LOG_MODES:
+        raise ValueError(
+            f"SQL_LOG_MODE must be one of {', '.join(SQL_LOG_MODES)}, "
+            f"got '{settings.SQL_LOG_MODE}'"
+        )
+    _start_listener()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.features.events.model import EVENT_SEARCH_COLUMNS, Event, EventType
+from app.utils.pagination import PaginationParams
+from app.utils.refine_query import embed_options, refine_query_async, select_fields
+
+
+# =========================
+# EVENT TYPE REPO
+# =========================
+async def list_event_types(db: AsyncSession, pagination: PaginationParams):
+    return await refine_query_async(db, select(EventType), EventType, pagination)
+
+
+async def get_event_type_by_id(db: AsyncSession, event_type_id: str):
+    return await db.get(EventType, event_type_id)
+
+
+async def get_event_type_by_code(db: AsyncSession, code: str):
+    result = await db.execute(select(EventType).where(EventType.code == code))
+    return result.scalars().first()
+
+
+# =========================
+# EVENT REPO
+# =========================
+async def list_events(
+    db: AsyncSession, pagination: PaginationParams, embed: list[str] | None = None
+):
+    # The largest listing: count and page in a single round trip
+    return await refine_query_async(
+        db,
+        select(Event),
+        Event,
+        pagination,
+        count="window",
+        search=EVENT_SEARCH_COLUMNS,
+        embed=embed,
+    )
+
+
+async def get_event_by_id(
+    db: AsyncSession, event_id: str, embed: list[str] | None = None
+):
+    if embed:
+        result = await db.execute(
+            select(Event)
+            .where(Event.id == event_id)
+            .options(*embed_options(Event, embed))
+        )
+        return result.scalars().first()
+    return await db.get(Event, event_id)
+
+
+async def get_event_fields_by_id(db: AsyncSession, event_id: str, fields: list[str]):
+    result = await db.execute(select_fields(Event, fields).where(Event.id == event_id))
+    row = result.first()
+    return row._asdict() if row else None
@@ -3,8 +3,13 @@ from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
 from app.features.locations.model import Location
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
+# Columns of the FULLTEXT index searched by the q parameter
+EVENT_SEARCH_COLUMNS = ("name",)
+
+
 class EventType(SQLModel, table=True):
     __tablename__ = "event_types"
     id: str = Field(
@@ -20,15 +25,18 @@ class EventType(SQLModel, table=True):
 
 class Event(SQLModel, table=True):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ft_events_name", *EVENT_SEARCH_COLUMNS, mysql_prefix="FULLTEXT"),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()), primary_key=True, max_length=36
     )
     name: str = Field()
-    start_date: datetime
-    end_date: datetime
+    start_date: datetime = Field(index=True)
+    end_date: datetime = Field(index=True)
     is_public: bool = Field(default=False)
-    
+
     location_id: Optional[str] = Field(default=None, foreign_key="locations.id")  # noqa: UP045
     event_type_id: Optional[str] = Field(default=None, foreign_key="event_types.id")  # noqa: UP045
 
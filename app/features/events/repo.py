@@ -1,6 +1,15 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.features.events.model import Event, EventType
+from app.common.repo import (
+    delete_by_id,
+    delete_rows,
+    insert_row,
+    insert_rows,
+    update_by_id,
+    update_rows,
+)
+from app.features.events.model import EVENT_SEARCH_COLUMNS, Event, EventType
 from app.utils.pagination import PaginationParams
 from app.utils.refine_query import refine_query
 
@@ -9,8 +18,7 @@ from app.utils.refine_query import refine_query
 # EVENT TYPE REPO
 # =========================
 def list_event_types(db: Session, pagination: PaginationParams):
-    query = db.query(EventType)
-    return refine_query(query, EventType, pagination)
+    return refine_query(db, select(EventType), EventType, pagination)
 
 
 def get_event_type_by_id(db: Session, event_type_id: str):
@@ -22,31 +30,32 @@ def get_event_type_by_code(db: Session, code: str):
 
 
 def create_event_type(db: Session, event_type: EventType):
-    db.add(event_type)
-    db.commit()
-    db.refresh(event_type)
-    return event_type
+    return insert_row(db, event_type)
 
 
-def update_event_type(db: Session, event_type: EventType, updates: dict):
-    for key, value in updates.items():
-        setattr(event_type, key, value)
-    db.commit()
-    db.refresh(event_type)
-    return event_type
+def update_event_type(db: Session, event_type_id: str, updates: dict):
+    return update_by_id(db, EventType, event_type_id, updates)
 
 
-def delete_event_type(db: Session, event_type: EventType):
-    db.delete(event_type)
-    db.commit()
+def delete_event_type(db: Session, event_type_id: str) -> bool:
+    return delete_by_id(db, EventType, event_type_id, nullify=[Event.event_type_id])
 
 
 # =========================
 # EVENT REPO
 # =========================
-def list_events(db: Session, pagination: PaginationParams):
-    query = db.query(Event)
-    return refine_query(query, Event, pagination)
+def list_events(
+    db: Session, pagination: PaginationParams, embed: list[str] | None = None
+):
+    return refine_query(
+        db,
+        select(Event),
+        Event,
+        pagination,
+        count="window",
+        search=EVENT_SEARCH_COLUMNS,
+        embed=embed,
+    )
 
 
 def get_event_by_id(db: Session, event_id: str):
@@ -54,20 +63,24 @@ def get_event_by_id(db: Session, event_id: str):
 
 
 def create_event(db: Session, event: Event):
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    return insert_row(db, event)
 
 
-def update_event(db: Session, event: Event, updates: dict):
-    for key, value in updates.items():
-        setattr(event, key, value)
-    db.commit()
-    db.refresh(event)
-    return event
+def update_event(db: Session, event_id: str, updates: dict):
+    return update_by_id(db, Event, event_id, updates)
 
 
-def delete_event(db: Session, event: Event):
-    db.delete(event)
-    db.commit()
\ No newline at end of file
+def delete_event(db: Session, event_id: str) -> bool:
+    return delete_by_id(db, Event, event_id)
+
+
+def create_events(db: Session, events: list[Event]):
+    return insert_rows(db, Event, events)
+
+
+def update_events(db: Session, rows: list[dict]):
+    return update_rows(db, Event, rows)
+
+
+def delete_events(db: Session, event_ids: list[str]) -> int:
+    return delete_rows(db, Event, event_ids)
@@ -1,8 +1,19 @@
 from pydantic import BaseModel
 
+from app.common.bulk import (
+    BulkErrors,
+    BulkItem,
+    drop_dangling_references,
+    drop_missing_rows,
+    existing_delete_ids,
+    write_batch,
+)
 from app.common.exceptions import NotFoundError
-from app.features.events import repo
+from app.features.events import async_repo, repo
 from app.features.events.model import Event, EventType
+from app.features.locations.model import Location
+
+EVENT_REFERENCES = {"event_type_id": EventType, "location_id": Location}
 
 
 # =========================
@@ -32,26 +43,23 @@ def create_event_type(db, payload: BaseModel):
 
 
 def update_event_type(db, event_type_id: str, payload: BaseModel):
-    event_type = repo.get_event_type_by_id(db, event_type_id)
+    updates = payload.model_dump(exclude_unset=True)
+    event_type = repo.update_event_type(db, event_type_id, updates)
     if not event_type:
         raise NotFoundError("Event type not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_event_type(db, event_type, updates)
+    return event_type
 
 
 def delete_event_type(db, event_type_id: str):
-    event_type = repo.get_event_type_by_id(db, event_type_id)
-    if not event_type:
+    if not repo.delete_event_type(db, event_type_id):
         raise NotFoundError("Event type not found")
-    repo.delete_event_type(db, event_type)
 
 
 # =========================
 # EVENT SERVICE
 # =========================
-def list_events(db, pagination):
-    return repo.list_events(db, pagination)
+def list_events(db, pagination, embed: list[str] | None = None):
+    return repo.list_events(db, pagination, embed)
 
 
 def get_event(db, event_id: str):
@@ -67,34 +75,79 @@ def create_event(db, payload: BaseModel):
 
 
 def update_event(db, event_id: str, payload: BaseModel):
-    event = repo.get_event_by_id(db, event_id)
+    updates = payload.model_dump(exclude_unset=True)
+    event = repo.update_event(db, event_id, updates)
     if not event:
         raise NotFoundError("Event not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_event(db, event, updates)
+    return event
 
 
 def delete_event(db, event_id: str):
-    event = repo.get_event_by_id(db, event_id)
-    if not event:
+    if not repo.delete_event(db, event_id):
         raise NotFoundError("Event not found")
-    repo.delete_event(db, event)
 
 
 def publish_event(db, event_id: str):
-    event = repo.get_event_by_id(db, event_id)
+    event = repo.update_event(db, event_id, {"is_public": True})
     if not event:
         raise NotFoundError("Event not found")
-
-    updates = {"is_public": True}
-    return repo.update_event(db, event, updates)
+    return event
 
 
 def unpublish_event(db, event_id: str):
-    event = repo.get_event_by_id(db, event_id)
+    event = repo.update_event(db, event_id, {"is_public": False})
     if not event:
         raise NotFoundError("Event not found")
+    return event
 
-    updates = {"is_public": False}
-    return repo.update_event(db, event, updates)
+
+# =========================
+# BULK EVENT SERVICE
+# =========================
+def create_events_bulk(db, items: list[BulkItem], errors: BulkErrors):
+    items = drop_dangling_references(db, items, EVENT_REFERENCES, errors)
+    events = [Event.model_validate(item.data) for item in items]
+    return write_batch(db, lambda: repo.create_events(db, events))
+
+
+def update_events_bulk(db, items: list[BulkItem], errors: BulkErrors):
+    items = drop_missing_rows(db, Event, items, errors)
+    items = drop_dangling_references(db, items, EVENT_REFERENCES, errors)
+    rows = [{"id": item.id, **item.data} for item in items]
+    return write_batch(db, lambda: repo.update_events(db, rows))
+
+
+def delete_events_bulk(db, event_ids: list[str], errors: BulkErrors) -> list[str]:
+    event_ids = existing_delete_ids(db, Event, event_ids, errors)
+    write_batch(db, lambda: repo.delete_events(db, event_ids))
+    return event_ids
+
+
+# =========================
+# ASYNC READ SERVICE
+# =========================
+async def list_event_types_async(db, pagination):
+    return await async_repo.list_event_types(db, pagination)
+
+
+async def get_event_type_async(db, event_type_id: str):
+    event_type = await async_repo.get_event_type_by_id(db, event_type_id)
+    if not event_type:
+        raise NotFoundError("Event type not found")
+    return event_type
+
+
+async def list_events_async(db, pagination, embed: list[str] | None = None):
+    return await async_repo.list_events(db, pagination, embed)
+
+
+async def get_event_async(
+    db, event_id: str, fields: list[str] | None = None, embed: list[str] | None = None
+):
+    if fields:
+        event = await async_repo.get_event_fields_by_id(db, event_id, fields)
+    else:
+        event = await async_repo.get_event_by_id(db, event_id, embed)
+    if not event:
+        raise NotFoundError("Event not found")
+    return event
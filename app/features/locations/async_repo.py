@@ -0,0 +1,90 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.features.locations.model import (
+    COUNTRY_SEARCH_COLUMNS,
+    LOCATION_SEARCH_COLUMNS,
+    Country,
+    Location,
+    LocationType,
+)
+from app.utils.pagination import PaginationParams
+from app.utils.refine_query import embed_options, refine_query_async, select_fields
+
+
+# =========================
+# LOCATION TYPE REPO
+# =========================
+async def list_location_types(db: AsyncSession, pagination: PaginationParams):
+    return await refine_query_async(db, select(LocationType), LocationType, pagination)
+
+
+async def get_location_type_by_id(db: AsyncSession, location_type_id: str):
+    return await db.get(LocationType, location_type_id)
+
+
+# =========================
+# COUNTRY REPO
+# =========================
+async def list_countries(db: AsyncSession, pagination: PaginationParams):
+    return await refine_query_async(
+        db, select(Country), Country, pagination, search=COUNTRY_SEARCH_COLUMNS
+    )
+
+
+async def get_country_by_id(db: AsyncSession, country_id: str):
+    return await db.get(Country, country_id)
+
+
+async def get_country_by_code2(db: AsyncSession, code2: str):
+    result = await db.execute(select(Country).where(Country.code2 == code2))
+    return result.scalars().first()
+
+
+async def get_country_by_code3(db: AsyncSession, code3: str):
+    result = await db.execute(select(Country).where(Country.code3 == code3))
+    return result.scalars().first()
+
+
+# =========================
+# LOCATION REPO
+# =========================
+async def list_locations(
+    db: AsyncSession, pagination: PaginationParams, embed: list[str] | None = None
+):
+    return await refine_query_async(
+        db,
+        select(Location),
+        Location,
+        pagination,
+        search=LOCATION_SEARCH_COLUMNS,
+        embed=embed,
+    )
+
+
+async def get_location_by_id(
+    db: AsyncSession, location_id: str, embed: list[str] | None = None
+):
+    if embed:
+        result = await db.execute(
+            select(Location)
+            .where(Location.id == location_id)
+            .options(*embed_options(Location, embed))
+        )
+        return result.scalars().first()
+    return await db.get(Location, location_id)
+
+
+async def get_location_by_name(db: AsyncSession, name: str):
+    result = await db.execute(select(Location).where(Location.name == name))
+    return result.scalars().first()
+
+
+async def get_location_fields_by_id(
+    db: AsyncSession, location_id: str, fields: list[str]
+):
+    result = await db.execute(
+        select_fields(Location, fields).where(Location.id == location_id)
+    )
+    row = result.first()
+    return row._asdict() if row else None
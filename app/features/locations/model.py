@@ -1,11 +1,16 @@
 import uuid
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from app.features.events.model import Event
 
+# Columns of the FULLTEXT indexes searched by the q parameter
+COUNTRY_SEARCH_COLUMNS = ("name",)
+LOCATION_SEARCH_COLUMNS = ("name", "city", "road")
+
 
 class LocationType(SQLModel, table=True):
     __tablename__ = "location_types"
@@ -20,6 +25,9 @@ class LocationType(SQLModel, table=True):
 
 class Country(SQLModel, table=True):
     __tablename__ = "countries"
+    __table_args__ = (
+        Index("ft_countries_name", *COUNTRY_SEARCH_COLUMNS, mysql_prefix="FULLTEXT"),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()), primary_key=True, max_length=36
@@ -35,6 +43,9 @@ class Country(SQLModel, table=True):
 
 class Location(SQLModel, table=True):
     __tablename__ = "locations"
+    __table_args__ = (
+        Index("ft_locations_search", *LOCATION_SEARCH_COLUMNS, mysql_prefix="FULLTEXT"),
+    )
 
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()), primary_key=True, max_length=36
@@ -1,6 +1,22 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.features.locations.model import Country, Location, LocationType
+from app.common.repo import (
+    delete_by_id,
+    delete_rows,
+    insert_row,
+    insert_rows,
+    update_by_id,
+    update_rows,
+)
+from app.features.events.model import Event
+from app.features.locations.model import (
+    COUNTRY_SEARCH_COLUMNS,
+    LOCATION_SEARCH_COLUMNS,
+    Country,
+    Location,
+    LocationType,
+)
 from app.utils.pagination import PaginationParams
 from app.utils.refine_query import refine_query
 
@@ -9,8 +25,7 @@ from app.utils.refine_query import refine_query
 # LOCATION TYPE REPO
 # =========================
 def list_location_types(db: Session, pagination: PaginationParams):
-    query = db.query(LocationType)
-    return refine_query(query, LocationType, pagination)
+    return refine_query(db, select(LocationType), LocationType, pagination)
 
 
 def get_location_type_by_id(db: Session, location_type_id: str):
@@ -22,31 +37,26 @@ def get_location_type_by_name(db: Session, name: str):
 
 
 def create_location_type(db: Session, location_type: LocationType):
-    db.add(location_type)
-    db.commit()
-    db.refresh(location_type)
-    return location_type
+    return insert_row(db, location_type)
 
 
-def update_location_type(db: Session, location_type: LocationType, updates: dict):
-    for key, value in updates.items():
-        setattr(location_type, key, value)
-    db.commit()
-    db.refresh(location_type)
-    return location_type
+def update_location_type(db: Session, location_type_id: str, updates: dict):
+    return update_by_id(db, LocationType, location_type_id, updates)
 
 
-def delete_location_type(db: Session, location_type: LocationType):
-    db.delete(location_type)
-    db.commit()
+def delete_location_type(db: Session, location_type_id: str) -> bool:
+    return delete_by_id(
+        db, LocationType, location_type_id, nullify=[Location.location_type_id]
+    )
 
 
 # =========================
 # COUNTRY REPO
 # =========================
 def list_countries(db: Session, pagination: PaginationParams):
-    query = db.query(Country)
-    return refine_query(query, Country, pagination)
+    return refine_query(
+        db, select(Country), Country, pagination, search=COUNTRY_SEARCH_COLUMNS
+    )
 
 
 def get_country_by_id(db: Session, country_id: str):
@@ -62,31 +72,31 @@ def get_country_by_code3(db: Session, code3: str):
 
 
 def create_country(db: Session, country: Country):
-    db.add(country)
-    db.commit()
-    db.refresh(country)
-    return country
+    return insert_row(db, country)
 
 
-def update_country(db: Session, country: Country, updates: dict):
-    for key, value in updates.items():
-        setattr(country, key, value)
-    db.commit()
-    db.refresh(country)
-    return country
+def update_country(db: Session, country_id: str, updates: dict):
+    return update_by_id(db, Country, country_id, updates)
 
 
-def delete_country(db: Session, country: Country):
-    db.delete(country)
-    db.commit()
+def delete_country(db: Session, country_id: str) -> bool:
+    return delete_by_id(db, Country, country_id, nullify=[Location.country_id])
 
 
 # =========================
 # LOCATION REPO
 # =========================
-def list_locations(db: Session, pagination: PaginationParams):
-    query = db.query(Location)
-    return refine_query(query, Location, pagination)
+def list_locations(
+    db: Session, pagination: PaginationParams, embed: list[str] | None = None
+):
+    return refine_query(
+        db,
+        select(Location),
+        Location,
+        pagination,
+        search=LOCATION_SEARCH_COLUMNS,
+        embed=embed,
+    )
 
 
 def get_location_by_id(db: Session, location_id: str):
@@ -98,20 +108,24 @@ def get_location_by_name(db: Session, name: str):
 
 
 def create_location(db: Session, location: Location):
-    db.add(location)
-    db.commit()
-    db.refresh(location)
-    return location
+    return insert_row(db, location)
 
 
-def update_location(db: Session, location: Location, updates: dict):
-    for key, value in updates.items():
-        setattr(location, key, value)
-    db.commit()
-    db.refresh(location)
-    return location
+def update_location(db: Session, location_id: str, updates: dict):
+    return update_by_id(db, Location, location_id, updates)
 
 
-def delete_location(db: Session, location: Location):
-    db.delete(location)
-    db.commit()
\ No newline at end of file
+def delete_location(db: Session, location_id: str) -> bool:
+    return delete_by_id(db, Location, location_id, nullify=[Event.location_id])
+
+
+def create_locations(db: Session, locations: list[Location]):
+    return insert_rows(db, Location, locations)
+
+
+def update_locations(db: Session, rows: list[dict]):
+    return update_rows(db, Location, rows)
+
+
+def delete_locations(db: Session, location_ids: list[str]) -> int:
+    return delete_rows(db, Location, location_ids, nullify=[Event.location_id])
@@ -1,9 +1,20 @@
 from pydantic import BaseModel
 
+from app.common.bulk import (
+    BulkErrors,
+    BulkItem,
+    drop_dangling_references,
+    drop_duplicate_values,
+    drop_missing_rows,
+    existing_delete_ids,
+    write_batch,
+)
 from app.common.exceptions import NotFoundError
-from app.features.locations import repo
+from app.features.locations import async_repo, repo
 from app.features.locations.model import Country, Location, LocationType
 
+LOCATION_REFERENCES = {"country_id": Country, "location_type_id": LocationType}
+
 
 # =========================
 # LOCATION TYPE SERVICE
@@ -32,19 +43,16 @@ def create_location_type(db, payload: BaseModel):
 
 
 def update_location_type(db, location_type_id: str, payload: BaseModel):
-    location_type = repo.get_location_type_by_id(db, location_type_id)
+    updates = payload.model_dump(exclude_unset=True)
+    location_type = repo.update_location_type(db, location_type_id, updates)
     if not location_type:
         raise NotFoundError("Location type not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_location_type(db, location_type, updates)
+    return location_type
 
 
 def delete_location_type(db, location_type_id: str):
-    location_type = repo.get_location_type_by_id(db, location_type_id)
-    if not location_type:
+    if not repo.delete_location_type(db, location_type_id):
         raise NotFoundError("Location type not found")
-    repo.delete_location_type(db, location_type)
 
 
 # =========================
@@ -81,26 +89,23 @@ def create_country(db, payload: BaseModel):
 
 
 def update_country(db, country_id: str, payload: BaseModel):
-    country = repo.get_country_by_id(db, country_id)
+    updates = payload.model_dump(exclude_unset=True)
+    country = repo.update_country(db, country_id, updates)
     if not country:
         raise NotFoundError("Country not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_country(db, country, updates)
+    return country
 
 
 def delete_country(db, country_id: str):
-    country = repo.get_country_by_id(db, country_id)
-    if not country:
+    if not repo.delete_country(db, country_id):
         raise NotFoundError("Country not found")
-    repo.delete_country(db, country)
 
 
 # =========================
 # LOCATION SERVICE
 # =========================
-def list_locations(db, pagination):
-    return repo.list_locations(db, pagination)
+def list_locations(db, pagination, embed: list[str] | None = None):
+    return repo.list_locations(db, pagination, embed)
 
 
 def get_location(db, location_id: str):
@@ -123,16 +128,81 @@ def create_location(db, payload: BaseModel):
 
 
 def update_location(db, location_id: str, payload: BaseModel):
-    location = repo.get_location_by_id(db, location_id)
+    updates = payload.model_dump(exclude_unset=True)
+    location = repo.update_location(db, location_id, updates)
     if not location:
         raise NotFoundError("Location not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_location(db, location, updates)
+    return location
 
 
 def delete_location(db, location_id: str):
-    location = repo.get_location_by_id(db, location_id)
+    if not repo.delete_location(db, location_id):
+        raise NotFoundError("Location not found")
+
+
+# =========================
+# BULK LOCATION SERVICE
+# =========================
+def create_locations_bulk(db, items: list[BulkItem], errors: BulkErrors):
+    items = drop_dangling_references(db, items, LOCATION_REFERENCES, errors)
+    items = drop_duplicate_values(db, Location, items, "name", errors)
+    locations = [Location.model_validate(item.data) for item in items]
+    return write_batch(db, lambda: repo.create_locations(db, locations))
+
+
+def update_locations_bulk(db, items: list[BulkItem], errors: BulkErrors):
+    items = drop_missing_rows(db, Location, items, errors)
+    items = drop_dangling_references(db, items, LOCATION_REFERENCES, errors)
+    items = drop_duplicate_values(db, Location, items, "name", errors)
+    rows = [{"id": item.id, **item.data} for item in items]
+    return write_batch(db, lambda: repo.update_locations(db, rows))
+
+
+def delete_locations_bulk(db, location_ids: list[str], errors: BulkErrors) -> list[str]:
+    location_ids = existing_delete_ids(db, Location, location_ids, errors)
+    write_batch(db, lambda: repo.delete_locations(db, location_ids))
+    return location_ids
+
+
+# =========================
+# ASYNC READ SERVICE
+# =========================
+async def list_location_types_async(db, pagination):
+    return await async_repo.list_location_types(db, pagination)
+
+
+async def get_location_type_async(db, location_type_id: str):
+    location_type = await async_repo.get_location_type_by_id(db, location_type_id)
+    if not location_type:
+        raise NotFoundError("Location type not found")
+    return location_type
+
+
+async def list_countries_async(db, pagination):
+    return await async_repo.list_countries(db, pagination)
+
+
+async def get_country_async(db, country_id: str):
+    country = await async_repo.get_country_by_id(db, country_id)
+    if not country:
+        raise NotFoundError("Country not found")
+    return country
+
+
+async def list_locations_async(db, pagination, embed: list[str] | None = None):
+    return await async_repo.list_locations(db, pagination, embed)
+
+
+async def get_location_async(
+    db,
+    location_id: str,
+    fields: list[str] | None = None,
+    embed: list[str] | None = None,
+):
+    if fields:
+        location = await async_repo.get_location_fields_by_id(db, location_id, fields)
+    else:
+        location = await async_repo.get_location_by_id(db, location_id, embed)
     if not location:
         raise NotFoundError("Location not found")
-    repo.delete_location(db, location)
\ No newline at end of file
+    return location
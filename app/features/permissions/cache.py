@@ -0,0 +1,65 @@
+import threading
+import time
+
+from app.common.permissions import PermissionSet
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import invalidate_user_tokens, token_cache
+
+# Effective PermissionSet per user id, resolved from user_permissions,
+# user_roles and role_permissions.
+permission_cache = TTLCache(
+    maxsize=settings.PERMISSION_CACHE_SIZE,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+# The repos also bump the users' stored permission_version, which outdates
+# the permission claims of their access tokens in every worker. The cached
+# tokens dropped here carry the user row with the previous version.
+def invalidate_user_permissions(user_id: str) -> None:
+    """Forget the effective permissions of a single user"""
+    permission_cache.pop(user_id)
+    invalidate_user_tokens(user_id)
+
+
+def invalidate_all_permissions() -> None:
+    """Forget every effective permission set, e.g. after a role changed"""
+    permission_cache.clear()
+    token_cache.clear()
+
+
+class RolePermissionSet:
+    """Permission names of a single role held in memory.
+
+    Loaded once at startup and replaced whenever the role's permissions are
+    changed through the roles repo. ``max_age`` bounds how long a worker keeps
+    a set that another worker may have changed.
+    """
+
+    def __init__(self, role_name: str, max_age: float):
+        self.role_name = role_name
+        self.max_age = max_age
+        self.role_id: str | None = None
+        self.permissions = PermissionSet()
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def update(self, role_id: str | None, names: set[str]) -> None:
+        with self._lock:
+            self.role_id = role_id
+            self.permissions = PermissionSet(names)
+            self._loaded_at = time.time()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def is_stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.time() - loaded_at > self.max_age
+
+
+guest_permissions = RolePermissionSet(
+    settings.GUEST_ROLE_NAME, max_age=settings.GUEST_PERMISSIONS_REFRESH_SECONDS
+)
@@ -1,6 +1,15 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.common.repo import delete_by_id, insert_row, update_by_id
+from app.features.permissions.cache import (
+    guest_permissions,
+    invalidate_all_permissions,
+)
 from app.features.permissions.model import Permission
+from app.features.roles.model import RolePermission
+from app.features.users.model import UserPermission
+from app.features.users.repo import bump_permission_versions
 from app.utils.pagination import PaginationParams
 from app.utils.refine_query import refine_query
 
@@ -9,8 +18,7 @@ from app.utils.refine_query import refine_query
 # PERMISSION REPO
 # =========================
 def list_permissions(db: Session, pagination: PaginationParams):
-    query = db.query(Permission)
-    return refine_query(query, Permission, pagination)
+    return refine_query(db, select(Permission), Permission, pagination)
 
 
 def get_permission_by_id(db: Session, permission_id: str):
@@ -22,20 +30,28 @@ def get_permission_by_name(db: Session, name: str):
 
 
 def create_permission(db: Session, permission: Permission):
-    db.add(permission)
-    db.commit()
-    db.refresh(permission)
-    return permission
+    return insert_row(db, permission)
 
 
-def update_permission(db: Session, permission: Permission, updates: dict):
-    for key, value in updates.items():
-        setattr(permission, key, value)
-    db.commit()
-    db.refresh(permission)
+def update_permission(db: Session, permission_id: str, updates: dict):
+    permission = update_by_id(db, Permission, permission_id, updates)
+    if permission:
+        # Renames are rare; every user refreshes their claims
+        bump_permission_versions(db)
+        invalidate_all_permissions()
+        guest_permissions.invalidate()
     return permission
 
 
-def delete_permission(db: Session, permission: Permission):
-    db.delete(permission)
-    db.commit()
+def delete_permission(db: Session, permission_id: str) -> bool:
+    deleted = delete_by_id(
+        db,
+        Permission,
+        permission_id,
+        links=[RolePermission.permission_id, UserPermission.permission_id],
+    )
+    if deleted:
+        bump_permission_versions(db)
+        invalidate_all_permissions()
+        guest_permissions.invalidate()
+    return deleted
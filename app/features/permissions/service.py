@@ -32,16 +32,13 @@ def create_permission(db, payload: BaseModel):
 
 
 def update_permission(db, permission_id: str, payload: BaseModel):
-    permission = repo.get_permission_by_id(db, permission_id)
+    updates = payload.model_dump(exclude_unset=True)
+    permission = repo.update_permission(db, permission_id, updates)
     if not permission:
         raise NotFoundError("Permission not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_permission(db, permission, updates)
+    return permission
 
 
 def delete_permission(db, permission_id: str):
-    permission = repo.get_permission_by_id(db, permission_id)
-    if not permission:
+    if not repo.delete_permission(db, permission_id):
         raise NotFoundError("Permission not found")
-    repo.delete_permission(db, permission)
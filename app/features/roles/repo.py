@@ -1,6 +1,15 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.common.repo import delete_by_id, delete_where, insert_row, update_by_id
+from app.features.permissions.cache import (
+    guest_permissions,
+    invalidate_all_permissions,
+)
+from app.features.permissions.model import Permission
 from app.features.roles.model import Role, RolePermission
+from app.features.users.model import User, UserRole
+from app.features.users.repo import bump_permission_versions
 from app.utils.pagination import PaginationParams
 from app.utils.refine_query import refine_query
 
@@ -9,8 +18,7 @@ from app.utils.refine_query import refine_query
 # ROLE REPO
 # =========================
 def list_roles(db: Session, pagination: PaginationParams):
-    query = db.query(Role)
-    return refine_query(query, Role, pagination)
+    return refine_query(db, select(Role), Role, pagination)
 
 
 def get_role_by_id(db: Session, role_id: str):
@@ -22,31 +30,43 @@ def get_role_by_name(db: Session, name: str):
 
 
 def create_role(db: Session, role: Role):
-    db.add(role)
-    db.commit()
-    db.refresh(role)
+    insert_row(db, role)
+    if role.name == guest_permissions.role_name:
+        load_guest_permissions(db)
     return role
 
 
-def update_role(db: Session, role: Role, updates: dict):
-    for key, value in updates.items():
-        setattr(role, key, value)
-    db.commit()
-    db.refresh(role)
+def update_role(db: Session, role_id: str, updates: dict):
+    was_guest = role_id == guest_permissions.role_id
+    role = update_by_id(db, Role, role_id, updates)
+    if role and (was_guest or role.name == guest_permissions.role_name):
+        load_guest_permissions(db)
     return role
 
 
-def delete_role(db: Session, role: Role):
-    db.delete(role)
-    db.commit()
+def _role_members(role_id: str):
+    return User.id.in_(select(UserRole.user_id).where(UserRole.role_id == role_id))
+
+
+def delete_role(db: Session, role_id: str) -> bool:
+    was_guest = role_id == guest_permissions.role_id
+    # Before the user_roles links go with the role
+    bump_permission_versions(db, _role_members(role_id))
+    deleted = delete_by_id(
+        db, Role, role_id, links=[RolePermission.role_id, UserRole.role_id]
+    )
+    if deleted:
+        invalidate_all_permissions()
+        if was_guest:
+            load_guest_permissions(db)
+    return deleted
 
 
 # =========================
 # ROLE PERMISSION REPO
 # =========================
 def list_role_permissions(db: Session, pagination: PaginationParams):
-    query = db.query(RolePermission)
-    return refine_query(query, RolePermission, pagination)
+    return refine_query(db, select(RolePermission), RolePermission, pagination)
 
 
 def get_permissions_by_role_id(db: Session, role_id: str):
@@ -54,22 +74,47 @@ def get_permissions_by_role_id(db: Session, role_id: str):
     return role.permissions if role else []
 
 
+def get_permission_names_by_role_name(db: Session, name: str):
+    """Return the role id and its permission names in one query"""
+    rows = (
+        db.query(Role.id, Permission.name)
+        .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+        .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+        .filter(Role.name == name)
+        .all()
+    )
+    if not rows:
+        return None, set()
+    return rows[0][0], {perm_name for _, perm_name in rows if perm_name}
+
+
+def load_guest_permissions(db: Session):
+    role_id, names = get_permission_names_by_role_name(db, guest_permissions.role_name)
+    guest_permissions.update(role_id, names)
+    return guest_permissions.permissions
+
+
 def add_permission_to_role(db: Session, role_id: str, permission_id: str):
-    role_permission = RolePermission(role_id=role_id, permission_id=permission_id)
-    db.add(role_permission)
-    db.commit()
+    role_permission = insert_row(
+        db, RolePermission(role_id=role_id, permission_id=permission_id)
+    )
+    bump_permission_versions(db, _role_members(role_id))
+    invalidate_all_permissions()
+    if role_id == guest_permissions.role_id:
+        load_guest_permissions(db)
     return role_permission
 
 
 def remove_permission_from_role(db: Session, role_id: str, permission_id: str):
-    role_permission = (
-        db.query(RolePermission)
-        .filter(
-            RolePermission.role_id == role_id,
-            RolePermission.permission_id == permission_id,
-        )
-        .first()
+    removed = delete_where(
+        db,
+        RolePermission,
+        RolePermission.role_id == role_id,
+        RolePermission.permission_id == permission_id,
     )
-    if role_permission:
-        db.delete(role_permission)
-        db.commit()
+    if removed:
+        bump_permission_versions(db, _role_members(role_id))
+        invalidate_all_permissions()
+        if role_id == guest_permissions.role_id:
+            load_guest_permissions(db)
+    return removed > 0
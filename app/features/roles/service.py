@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 
 from app.common.exceptions import NotFoundError
+from app.common.permissions import PermissionSet
+from app.features.permissions.cache import guest_permissions
 from app.features.roles import repo
 from app.features.roles.model import Role
 
@@ -32,19 +34,16 @@ def create_role(db, payload: BaseModel):
 
 
 def update_role(db, role_id: str, payload: BaseModel):
-    role = repo.get_role_by_id(db, role_id)
+    updates = payload.model_dump(exclude_unset=True)
+    role = repo.update_role(db, role_id, updates)
     if not role:
         raise NotFoundError("Role not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_role(db, role, updates)
+    return role
 
 
 def delete_role(db, role_id: str):
-    role = repo.get_role_by_id(db, role_id)
-    if not role:
+    if not repo.delete_role(db, role_id):
         raise NotFoundError("Role not found")
-    repo.delete_role(db, role)
 
 
 # =========================
@@ -67,3 +66,10 @@ def assign_role_permission(db, role_id: str, permission_id: str):
 
 def remove_role_permission(db, role_id: str, permission_id: str):
     return repo.remove_permission_from_role(db, role_id, permission_id)
+
+
+def get_guest_permissions(db) -> PermissionSet:
+    """Permissions granted to anonymous users"""
+    if guest_permissions.is_stale():
+        return repo.load_guest_permissions(db)
+    return guest_permissions.permissions
@@ -36,6 +36,9 @@ class User(SQLModel, table=True):
     hashed_password: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     last_login: Optional[datetime] = None  # noqa: UP007
+    # Bumped whenever the user's effective permissions change, so permission
+    # claims in access tokens issued before are no longer trusted
+    permission_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     # Relationships
     roles: list["Role"] = Relationship(back_populates="users", link_model=UserRole)
@@ -1,19 +1,20 @@
+from sqlalchemy import select, union, update
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
+from app.common.repo import delete_by_id, delete_where, insert_row, update_by_id
+from app.features.permissions.cache import invalidate_user_permissions
 from app.features.permissions.model import Permission
-from app.features.roles.model import Role, RolePermission
-from app.features.users.model import User, UserPermission, UserRole
+from app.features.roles.model import RolePermission
+from app.features.users.model import LoginOTP, User, UserPermission, UserRole
 from app.utils.pagination import PaginationParams
-from app.utils.refine_query import refine_query
+from app.utils.refine_query import refine_query, select_fields
 
 
 # =========================
 # USER ROLE REPO
 # =========================
 def list_user_roles(db: Session, pagination: PaginationParams):
-    query = db.query(UserRole)
-    return refine_query(query, UserRole, pagination)
+    return refine_query(db, select(UserRole), UserRole, pagination)
 
 
 def get_roles_by_user_id(db: Session, user_id: str):
@@ -21,41 +22,27 @@ def get_roles_by_user_id(db: Session, user_id: str):
 
 
 def add_role_to_user(db: Session, user_id: str, role_id: str):
-    user_role = UserRole(user_id=user_id, role_id=role_id)
-    db.add(user_role)
-    db.commit()
-    db.refresh(user_role)
+    user_role = insert_row(db, UserRole(user_id=user_id, role_id=role_id))
+    bump_permission_versions(db, User.id == user_id)
+    invalidate_user_permissions(user_id)
     return user_role
 
 
 def remove_role_from_user(db: Session, user_id: str, role_id: str):
-    user_role = (
-        db.query(UserRole)
-        .filter(UserRole.user_id == user_id, UserRole.role_id == role_id)
-        .first()
+    removed = delete_where(
+        db, UserRole, UserRole.user_id == user_id, UserRole.role_id == role_id
     )
-    if user_role:
-        db.delete(user_role)
-        db.commit()
-    return user_role
+    if removed:
+        bump_permission_versions(db, User.id == user_id)
+        invalidate_user_permissions(user_id)
+    return removed > 0
 
 
 # =========================
 # USER PERMISSION REPO
 # =========================
 def list_user_permissions(db: Session, permission: UserPermission):
-    query = db.query(UserPermission)
-    return refine_query(query, UserPermission, permission)
-
-
-def list_guest_permissions(db: Session, request):
-    guest_role = (
-        db.query(Role).filter(Role.name == settings.GUEST_ROLE_NAME).first()
-    )
-    if not guest_role:
-        return [], 0
-    query = db.query(Permission).join(RolePermission).filter(RolePermission.role_id == guest_role.id)
-    return refine_query(query, Permission, PaginationParams(request, _start=1, _end=1000))
+    return refine_query(db, select(UserPermission), UserPermission, permission)
 
 
 def get_permissions_by_user_id(db: Session, user_id: str):
@@ -63,60 +50,101 @@ def get_permissions_by_user_id(db: Session, user_id: str):
     return query.all()
 
 
+def _effective_permissions_statement(user_id: str, column):
+    """UNION of the user's direct permissions and those granted via roles"""
+    direct = (
+        select(column)
+        .join(UserPermission, UserPermission.permission_id == Permission.id)
+        .where(UserPermission.user_id == user_id)
+    )
+    via_roles = (
+        select(column)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .join(UserRole, UserRole.role_id == RolePermission.role_id)
+        .where(UserRole.user_id == user_id)
+    )
+    return union(direct, via_roles)
+
+
+def get_permission_names_by_user_id(db: Session, user_id: str) -> set[str]:
+    statement = _effective_permissions_statement(user_id, Permission.name)
+    return set(db.execute(statement).scalars())
+
+
+def get_effective_permissions_by_user_id(db: Session, user_id: str):
+    statement = _effective_permissions_statement(user_id, Permission.id)
+    return db.query(Permission).filter(Permission.id.in_(statement)).all()
+
+
 def add_permission_to_user(db: Session, user_id: str, permission_id: str):
-    user_permission = UserPermission(user_id=user_id, permission_id=permission_id)
-    db.add(user_permission)
-    db.commit()
-    db.refresh(user_permission)
+    user_permission = insert_row(
+        db, UserPermission(user_id=user_id, permission_id=permission_id)
+    )
+    bump_permission_versions(db, User.id == user_id)
+    invalidate_user_permissions(user_id)
     return user_permission
 
 
 def remove_permission_from_user(db: Session, user_id: str, permission_id: str):
-    user_permission = (
-        db.query(UserPermission)
-        .filter(
-            UserPermission.user_id == user_id,
-            UserPermission.permission_id == permission_id,
-        )
-        .first()
+    removed = delete_where(
+        db,
+        UserPermission,
+        UserPermission.user_id == user_id,
+        UserPermission.permission_id == permission_id,
     )
-    if user_permission:
-        db.delete(user_permission)
-        db.commit()
-    return user_permission
+    if removed:
+        bump_permission_versions(db, User.id == user_id)
+        invalidate_user_permissions(user_id)
+    return removed > 0
 
 
 # =========================
 # USER REPO
 # =========================
 def list_users(db: Session, pagination: PaginationParams):
-    query = db.query(User)
-    return refine_query(query, User, pagination)
+    return refine_query(db, select(User), User, pagination)
 
 
 def get_user_by_id(db: Session, user_id: str):
     return db.query(User).filter(User.id == user_id).first()
 
 
+def get_user_fields_by_id(db: Session, user_id: str, fields: list[str]):
+    row = db.execute(select_fields(User, fields).where(User.id == user_id)).first()
+    return row._asdict() if row else None
+
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
 def create_user(db: Session, user: User):
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return insert_row(db, user)
 
 
-def update_user(db: Session, user: User, updates: dict):
-    for key, value in updates.items():
-        setattr(user, key, value)
-    db.commit()
-    db.refresh(user)
-    return user
+def update_user(db: Session, user_id: str, updates: dict):
+    return update_by_id(db, User, user_id, updates)
 
 
-def delete_user(db: Session, user: User):
-    db.delete(user)
+def bump_permission_versions(db: Session, *conditions) -> None:
+    """Outdate the permission claims in the access tokens of matching users"""
+    db.execute(
+        update(User)
+        .where(*conditions)
+        .values(permission_version=User.permission_version + 1)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
+
+
+def delete_user(db: Session, user_id: str) -> bool:
+    deleted = delete_by_id(
+        db,
+        User,
+        user_id,
+        links=[UserRole.user_id, UserPermission.user_id],
+        nullify=[LoginOTP.user_id],
+    )
+    if deleted:
+        invalidate_user_permissions(user_id)
+    return deleted
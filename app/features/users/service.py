@@ -1,7 +1,9 @@
 from pydantic import BaseModel
 
 from app.common.exceptions import NotFoundError
-from app.features.roles import repo as role_repo
+from app.common.permissions import PermissionSet
+from app.core.security import get_password_hash_async, invalidate_user_tokens
+from app.features.permissions.cache import permission_cache
 from app.features.users import repo
 from app.features.users.model import User
 
@@ -35,24 +37,29 @@ def list_user_permissions(db, pagination):
     return repo.list_user_permissions(db, pagination)
 
 
-def list_guest_permissions(db, request):
-    return repo.list_guest_permissions(db, request)
-
-
 def get_user_permissions(db, user_id: str, include_roles: bool = False):
-    permissions = repo.get_permissions_by_user_id(db, user_id)
     if include_roles:
-        roles = repo.get_roles_by_user_id(db, user_id)
-        user_roles = [role_repo.get_role_by_id(db, role.role_id) for role in roles]
-        print(user_roles)
-        for role in user_roles:
-            for perm in role.permissions:
-                permissions.append(perm)
+        permissions = repo.get_effective_permissions_by_user_id(db, user_id)
+    else:
+        permissions = repo.get_permissions_by_user_id(db, user_id)
     if not permissions:
         raise NotFoundError("User permissions not found")
     return permissions
 
 
+def get_effective_permissions(db, user_id: str) -> PermissionSet:
+    """All permissions a user holds directly or through roles.
+
+    Resolved once per user and served from the permission cache until it
+    expires or a user/role permission link changes.
+    """
+    permissions = permission_cache.get(user_id)
+    if permissions is None:
+        permissions = PermissionSet(repo.get_permission_names_by_user_id(db, user_id))
+        permission_cache.set(user_id, permissions)
+    return permissions
+
+
 def assign_user_permission(db, user_id: str, permission_id: str):
     return repo.add_permission_to_user(db, user_id, permission_id)
 
@@ -68,8 +75,11 @@ def list_users(db, pagination):
     return repo.list_users(db, pagination)
 
 
-def get_user(db, user_id: str):
-    user = repo.get_user_by_id(db, user_id)
+def get_user(db, user_id: str, fields: list[str] | None = None):
+    if fields:
+        user = repo.get_user_fields_by_id(db, user_id, fields)
+    else:
+        user = repo.get_user_by_id(db, user_id)
     if not user:
         raise NotFoundError("User not found")
     return user
@@ -87,17 +97,21 @@ def create_user(db, payload: BaseModel):
     return repo.create_user(db, user)
 
 
-def update_user(db, user_id: str, payload: BaseModel):
-    user = repo.get_user_by_id(db, user_id)
+async def update_user(db, user_id: str, payload: BaseModel):
+    updates = payload.model_dump(exclude_unset=True)
+    if "password" in updates:
+        # Hashed in the password hashing pool, off the event loop
+        updates["hashed_password"] = await get_password_hash_async(
+            updates.pop("password")
+        )
+    user = repo.update_user(db, user_id, updates)
     if not user:
         raise NotFoundError("User not found")
-
-    updates = payload.model_dump(exclude_unset=True)
-    return repo.update_user(db, user, updates)
+    invalidate_user_tokens(user_id)
+    return user
 
 
 def delete_user(db, user_id: str):
-    user = repo.get_user_by_id(db, user_id)
-    if not user:
+    if not repo.delete_user(db, user_id):
         raise NotFoundError("User not found")
-    repo.delete_user(db, user)
+    invalidate_user_tokens(user_id)
@@ -1,20 +1,51 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
+from sqlmodel import Session
+from sqlmodel.main import default_registry
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api import api_router
+from app.common.exceptions import HTTP_STATUS_BY_CODE, DomainError
 from app.core.config import settings
+from app.core.db import ReplicaRoutingMiddleware, engine
+from app.core.sql_logging import SQLRouteMiddleware
+from app.features.roles.repo import load_guest_permissions
+from app.utils.filter_plan import compile_filter_plans
+
+logger = logging.getLogger(__name__)
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.DATABASE_BACKEND == "sqlite":
+        from app.prestart.sqlite_db import init_sqlite_db
+
+        init_sqlite_db()
+    # List filters are resolved once per model instead of on every request
+    compile_filter_plans(mapper.class_ for mapper in default_registry.mappers)
+    # Anonymous permission checks are served from memory from the first request
+    try:
+        with Session(engine) as db:
+            load_guest_permissions(db)
+    except Exception as e:
+        logger.warning(f"Could not preload guest permissions: {e}")
+    yield
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
     version=settings.PROJECT_VERSION,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -27,4 +58,17 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+# Lets slow-query logs name the route that issued the statement
+app.add_middleware(SQLRouteMiddleware)
+# Sends reads of safe requests to the replicas when DATABASE_REPLICA_URIS is set
+app.add_middleware(ReplicaRoutingMiddleware)
+
 app.include_router(api_router, prefix="/api")
+
+
+@app.exception_handler(DomainError)
+async def domain_error_handler(_request: Request, exc: DomainError):
+    return JSONResponse(
+        status_code=HTTP_STATUS_BY_CODE.get(exc.code, 400),
+        content={"detail": getattr(exc, "message", str(exc))},
+    )
@@ -1,22 +1,10 @@
 import csv
 import logging
 
+from sqlalchemy import Engine, insert
 from sqlmodel import Session, select
 
-from app.common.permissions import (
-    Categories,
-    Countries,
-    Events,
-    EventTypes,
-    Locations,
-    LocationTypes,
-    Permissions,
-    RolePermissions,
-    Roles,
-    UserPermissions,
-    UserRoles,
-    Users,
-)
+from app.common.permissions import permission_registry
 from app.core.config import settings
 from app.core.db import engine
 from app.core.security import get_password_hash
@@ -32,33 +20,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_country_data():
+def load_country_data(db_engine: Engine = engine):
     """Load initial country data into the database."""
 
     logger.info("Loading initial country data")
     with open("app/prestart/data/countries.csv", encoding="utf-8") as csvfile:
         country_reader = csv.DictReader(csvfile)
-        with Session(engine) as session:
+        with Session(db_engine) as session:
             # Check if countries already exist
             existing_countries = session.exec(select(Country)).first()
             if existing_countries:
                 logger.info("Country data already exists, skipping initialization")
                 return
 
-            for row in country_reader:
-                country = Country(
-                    id=row["id"],
-                    name=row["name"],
-                    code2=row["code2"],
-                    code3=row["code3"],
-                    devco=bool(row["devco"]),
-                )
-                session.add(country)
+            # One multi-row INSERT instead of a unit-of-work flush per country
+            rows = [
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "code2": row["code2"],
+                    "code3": row["code3"],
+                    "devco": bool(row["devco"]),
+                }
+                for row in country_reader
+            ]
+            session.execute(insert(Country), rows)
             session.commit()
     logger.info("Country data loaded successfully")
     return
 
-def load_event_type_data():
+
+def load_event_type_data(db_engine: Engine = engine):
     """Load initial event type data into the database."""
     logger.info("Loading initial event type data")
     event_types = [
@@ -91,105 +83,39 @@ def load_event_type_data():
             "description_en": "An online seminar conducted over the internet.",
         },
     ]
-    with Session(engine) as session:
+    with Session(db_engine) as session:
         existing_event_types = session.exec(select(EventType)).first()
         if existing_event_types:
             logger.info("Event type data already exists, skipping initialization")
             return
 
-        for event_type_data in event_types:
-            event_type = EventType(
-                code=event_type_data["code"],
-                name_de=event_type_data["name_de"],
-                name_en=event_type_data["name_en"],
-                description_de=event_type_data["description_de"],
-                description_en=event_type_data["description_en"],
-            )
-            session.add(event_type)
+        rows = [
+            EventType(**event_type_data).model_dump() for event_type_data in event_types
+        ]
+        session.execute(insert(EventType), rows)
         session.commit()
     logger.info("Event type data loaded successfully")
     return
 
 
-def create_initial_data():
-    load_country_data()
-    load_event_type_data()
+def create_initial_data(db_engine: Engine = engine):
+    load_country_data(db_engine)
+    load_event_type_data(db_engine)
     # Create a session from the SessionLocal factory
     logger.info("Creating session for initial data seeding")
-    with Session(engine) as session:
+    with Session(db_engine) as session:
         # --- Permissions ---
-        permission_names = [
-            Categories.List,
-            Categories.Show,
-            Categories.Create,
-            Categories.Update,
-            Categories.Delete,
-            Countries.List,
-            Countries.Show,
-            Countries.Create,
-            Countries.Update,
-            Countries.Delete,
-            Events.List,
-            Events.Show,
-            Events.Create,
-            Events.Update,
-            Events.Delete,
-            EventTypes.List,
-            EventTypes.Show,
-            EventTypes.Create,
-            EventTypes.Update,
-            EventTypes.Delete,
-            Locations.List,
-            Locations.Show,
-            Locations.Create,
-            Locations.Update,
-            Locations.Delete,
-            LocationTypes.List,
-            LocationTypes.Show,
-            LocationTypes.Create,
-            LocationTypes.Update,
-            LocationTypes.Delete,
-            Permissions.List,
-            Permissions.Show,
-            Permissions.Create,
-            Permissions.Update,
-            Permissions.Delete,
-            Roles.List,
-            Roles.Show,
-            Roles.Create,
-            Roles.Update,
-            Roles.Delete,
-            RolePermissions.List,
-            RolePermissions.Show,
-            RolePermissions.Create,
-            RolePermissions.Update,
-            RolePermissions.Delete,
-            Users.List,
-            Users.Show,
-            Users.Create,
-            Users.Update,
-            Users.Delete,
-            Users.ChangePassword,
-            Users.ShowMe,
-            UserPermissions.List,
-            UserPermissions.Show,
-            UserPermissions.Create,
-            UserPermissions.Update,
-            UserPermissions.Delete,
-            UserRoles.List,
-            UserRoles.Show,
-            UserRoles.Create,
-            UserRoles.Update,
-            UserRoles.Delete,
-        ]
+        # Every permission declared in app.common.permissions is seeded, so
+        # new resources and actions reach existing databases as well.
         logger.info("Checking existing permissions in the database")
-        existing_permissions = session.exec(select(Permission)).all()
-        logger.info(f"Existing permissions: {existing_permissions}")
-        if not existing_permissions:
-            logger.info(permission_names)
-            logger.info("Seeding initial permissions")
-            for name in permission_names:
-                session.add(Permission(name=name))
+        existing_names = set(session.exec(select(Permission.name)).all())
+        missing_names = [
+            name for name in permission_registry.names if name not in existing_names
+        ]
+        new_permissions = [Permission(name=name).model_dump() for name in missing_names]
+        if new_permissions:
+            logger.info(f"Seeding permissions: {missing_names}")
+            session.execute(insert(Permission), new_permissions)
             session.commit()
 
         admin_role = session.exec(
@@ -218,17 +144,25 @@ def create_initial_data():
             session.commit()
 
         # --- Attach permissions to admin role ---
+        # A new admin role gets every permission, an existing one only the
+        # permissions seeded above; those an operator removed stay removed.
         logger.debug("Checking existing role permissions for admin role")
-        existing_role_perms = session.exec(
+        existing_role_perm = session.exec(
             select(RolePermission).where(RolePermission.role_id == admin_role.id)
-        ).all()
-        if not existing_role_perms:
+        ).first()
+        if existing_role_perm:
+            permission_ids = [permission["id"] for permission in new_permissions]
+        else:
+            permission_ids = session.exec(select(Permission.id)).all()
+        if permission_ids:
             logger.info("Seeding role permissions for admin role")
-            permissions = session.exec(select(Permission)).all()
-            for perm in permissions:
-                session.add(
-                    RolePermission(role_id=admin_role.id, permission_id=perm.id)
-                )
+            session.execute(
+                insert(RolePermission),
+                [
+                    {"role_id": admin_role.id, "permission_id": permission_id}
+                    for permission_id in permission_ids
+                ],
+            )
             session.commit()
 
         # --- Admin User ---
@@ -0,0 +1,78 @@
+import logging
+import os
+import shutil
+import sqlite3
+
+from sqlalchemy import Engine, create_engine
+from sqlmodel import SQLModel
+
+from app.core.config import SQLITE_MEMORY_URI, settings
+from app.core.db import engine
+from app.prestart.initial_data import create_initial_data
+
+logger = logging.getLogger(__name__)
+
+# Keeps the shared in-memory database alive while the pool has no connections
+_memory_anchor: sqlite3.Connection | None = None
+
+
+def build_template(path: str) -> None:
+    """Create a SQLite file with the full schema and the prestart seed data"""
+    logger.info(f"Building SQLite template {path}")
+    # Build next to the target and rename, so a half-built file is never used
+    partial = f"{path}.partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    template_engine = create_engine(f"sqlite:///{partial}")
+    try:
+        SQLModel.metadata.create_all(template_engine)
+        create_initial_data(template_engine)
+    finally:
+        template_engine.dispose()
+    os.replace(partial, path)
+
+
+def _copy_template(template: str, db_engine: Engine) -> None:
+    if settings.SQLITE_PATH:
+        logger.info(f"Copying SQLite template to {settings.SQLITE_PATH}")
+        shutil.copyfile(template, settings.SQLITE_PATH)
+        return
+
+    # In-memory databases are filled page by page with the backup API
+    source = sqlite3.connect(template)
+    connection = db_engine.raw_connection()
+    try:
+        source.backup(connection.driver_connection)
+    finally:
+        connection.close()
+        source.close()
+
+
+def init_sqlite_db(db_engine: Engine = engine) -> None:
+    """Create and seed the configured SQLite database if needed.
+
+    With SQLITE_TEMPLATE_PATH the seeded template is built once and copied,
+    otherwise the schema and seed data are created in place. Both steps skip
+    what already exists.
+    """
+    global _memory_anchor
+    if settings.SQLITE_PATH:
+        is_new = not os.path.exists(settings.SQLITE_PATH)
+    else:
+        is_new = _memory_anchor is None
+        if is_new:
+            _memory_anchor = sqlite3.connect(SQLITE_MEMORY_URI, uri=True)
+
+    template = settings.SQLITE_TEMPLATE_PATH
+    if template and is_new:
+        if not os.path.exists(template):
+            build_template(template)
+        _copy_template(template, db_engine)
+
+    # Adds tables that are newer than the template as well
+    SQLModel.metadata.create_all(db_engine)
+    create_initial_data(db_engine)
+
+
+if __name__ == "__main__":
+    init_sqlite_db()
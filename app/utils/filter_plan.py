@@ -0,0 +1,249 @@
+import datetime
+from collections.abc import Callable
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, inspect, or_
+
+from app.common.exceptions import BadRequestError
+from app.core.config import settings
+
+# Columns that can never be filtered on, whatever the model
+EXCLUDED_COLUMNS = {"hashed_password"}
+
+COMPARISONS = ("gte", "lte", "gt", "lt")
+
+_TRUE = ("true", "1")
+_FALSE = ("false", "0")
+
+
+# =========================
+# CONVERTERS
+# =========================
+def _to_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    raise ValueError("expected true or false")
+
+
+def _to_datetime(value: str) -> datetime.date | datetime.datetime:
+    # YYYY-MM-DD compares against the whole day (see _day_range)
+    if len(value) == 10:
+        return datetime.date.fromisoformat(value)
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Datetime columns hold naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _to_date(value: str) -> datetime.date:
+    return datetime.date.fromisoformat(value)
+
+
+def _to_str(value: str) -> str:
+    return value
+
+
+CONVERTERS: dict[type, Callable[[str], Any]] = {
+    bool: _to_bool,
+    int: int,
+    float: float,
+    datetime.datetime: _to_datetime,
+    datetime.date: _to_date,
+    str: _to_str,
+}
+
+
+def _python_type(column) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return str
+
+
+# =========================
+# EXPRESSIONS
+# =========================
+def _compare(column, op: str, value):
+    if op == "eq":
+        return column == value
+    if op == "ne":
+        return column != value
+    if op == "gte":
+        return column >= value
+    if op == "lte":
+        return column <= value
+    if op == "gt":
+        return column > value
+    if op == "lt":
+        return column < value
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+def _day_start(day: datetime.date) -> datetime.datetime:
+    """Naive UTC start of a calendar day in FILTER_TIMEZONE"""
+    start = datetime.datetime.combine(
+        day, datetime.time(), ZoneInfo(settings.FILTER_TIMEZONE)
+    )
+    return start.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _day_range(column, op: str, day: datetime.date):
+    """A date-only comparison as a half-open range [day, next day) on the column.
+
+    The column stays bare, so an index on it can serve the comparison, which
+    CAST(column AS DATE) would prevent. Both bounds are computed from their
+    own midnight, so days with a DST change get their real length.
+    """
+    start = _day_start(day)
+    end = _day_start(day + datetime.timedelta(days=1))
+    if op == "eq":
+        return and_(column >= start, column < end)
+    if op == "ne":
+        return or_(column < start, column >= end)
+    if op == "gte":
+        return column >= start
+    if op == "gt":
+        return column >= end
+    if op == "lte":
+        return column < end
+    if op == "lt":
+        return column < start
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+def _is_day(value) -> bool:
+    return isinstance(value, datetime.date) and not isinstance(value, datetime.datetime)
+
+
+def _datetime_expression(column, op: str, value):
+    if _is_day(value):
+        return _day_range(column, op, value)
+    return _compare(column, op, value)
+
+
+def _datetime_in(column, values: list):
+    days = [value for value in values if _is_day(value)]
+    if not days:
+        return column.in_(values)
+    moments = [value for value in values if not _is_day(value)]
+    conditions = [_day_range(column, "eq", day) for day in days]
+    if moments:
+        conditions.append(column.in_(moments))
+    return or_(*conditions)
+
+
+class FilterRule:
+    """One allowed ``field_op`` query parameter: its converter and expression"""
+
+    __slots__ = ("field", "op", "convert", "build")
+
+    def __init__(self, field: str, op: str, convert, build):
+        self.field = field
+        self.op = op
+        self.convert = convert
+        self.build = build
+
+    def expression(self, raw):
+        try:
+            value = self.convert(raw)
+        except ValueError as exc:
+            raise BadRequestError(
+                f"Invalid value for filter '{self.field}_{self.op}'"
+            ) from exc
+        if self.op == "in":
+            # The list stays one expanding parameter, so the compiled SQL is
+            # cached whatever its length; MariaDB runs IN lists of
+            # in_predicate_conversion_threshold (1000) values or more as a
+            # join against a temporary table by itself
+            value = list(dict.fromkeys(value))
+            if len(value) > settings.FILTER_IN_MAX_VALUES:
+                raise BadRequestError(
+                    f"Filter '{self.field}_in' accepts at most "
+                    f"{settings.FILTER_IN_MAX_VALUES} values"
+                )
+        return self.build(value)
+
+
+def _rules_for(column) -> dict[str, FilterRule]:
+    field = column.key
+    python_type = _python_type(column)
+    convert = CONVERTERS.get(python_type, _to_str)
+
+    compare = _datetime_expression if python_type is datetime.datetime else _compare
+
+    ops = ["eq", "ne"]
+    if python_type is not bool:
+        ops += COMPARISONS
+    rules = {
+        op: FilterRule(
+            field, op, convert, lambda value, op=op: compare(column, op, value)
+        )
+        for op in ops
+    }
+
+    def convert_list(raw) -> list:
+        values = raw.split(",") if isinstance(raw, str) else raw
+        return [convert(value) for value in values]
+
+    if python_type is datetime.datetime:
+        rules["in"] = FilterRule(
+            field, "in", convert_list, lambda values: _datetime_in(column, values)
+        )
+    else:
+        rules["in"] = FilterRule(field, "in", convert_list, column.in_)
+    if python_type is str:
+        rules["contains"] = FilterRule(
+            field, "contains", _to_str, lambda value: column.ilike(f"%{value}%")
+        )
+    return rules
+
+
+# =========================
+# FILTER PLANS
+# =========================
+class FilterPlan:
+    """Query parameters a model can be filtered by.
+
+    Every ``field`` (equality) and ``field_op`` key is resolved to its rule
+    once, so a request only does dictionary lookups. Fields containing
+    underscores, like ``start_date`` or ``name_en``, need no special casing.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.rules: dict[str, FilterRule] = {}
+        for column in inspect(model).columns:
+            if column.key in EXCLUDED_COLUMNS:
+                continue
+            attribute = getattr(model, column.key)
+            for op, rule in _rules_for(attribute).items():
+                self.rules[f"{column.key}_{op}"] = rule
+            self.rules[column.key] = self.rules[f"{column.key}_eq"]
+
+    def rule(self, key: str) -> FilterRule:
+        rule = self.rules.get(key)
+        if rule is None:
+            raise BadRequestError(f"Unknown filter '{key}'")
+        return rule
+
+
+_plans: dict[type, FilterPlan] = {}
+
+
+def filter_plan(model) -> FilterPlan:
+    """The model's plan, built on first use if it was not precompiled"""
+    plan = _plans.get(model)
+    if plan is None:
+        plan = _plans[model] = FilterPlan(model)
+    return plan
+
+
+def compile_filter_plans(models) -> None:
+    """Build the plans of all listed models, e.g. at startup"""
+    for model in models:
+        filter_plan(model)
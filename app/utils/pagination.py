@@ -1,7 +1,48 @@
+from typing import Annotated
+
 from fastapi import Query, Request
 
+# Query parameters read by PaginationParams itself, never filters
+CONTROL_PARAMS = (
+    "_start",
+    "_end",
+    "_sort",
+    "_order",
+    "_cursor",
+    "_limit",
+    "_count",
+    "_fields",
+    "q",
+)
+
+
+def parse_fields(raw: str | None) -> list[str] | None:
+    """Names in a comma-separated ``_fields`` or ``_embed`` parameter"""
+    if not raw:
+        return None
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    return list(dict.fromkeys(fields)) or None
+
 
 class PaginationParams:
+    """refine's list parameters.
+
+    ``_start``/``_end`` page by offset. Sending ``_cursor`` (empty for the
+    first page) switches to keyset paging: pages of ``_limit`` rows that
+    continue after the row encoded in the cursor, whose successor is
+    returned in the X-Next-Cursor header.
+
+    ``_count`` picks how X-Total-Count is produced (see refine_count);
+    ``_count=only`` and HEAD requests return the count without rows.
+    ``_fields=id,name`` selects only those columns (plus the primary key).
+    ``_embed`` is read by the ``embeddable`` dependency of the lists that
+    allow it; elsewhere it is rejected as an unknown filter.
+    ``q`` is a full-text search on the endpoints that support it.
+
+    Other parameters are filters. A repeated one becomes a list of values:
+    ``id=a&id=b`` matches either id, other operators must hold for each.
+    """
+
     def __init__(
         self,
         request: Request,
@@ -9,15 +50,44 @@ class PaginationParams:
         _end: int = Query(10, ge=1),
         _sort: str | None = None,
         _order: str = "ASC",
+        _cursor: str | None = None,
+        _limit: Annotated[int | None, Query(ge=1)] = None,
+        _count: str | None = None,
+        _fields: str | None = None,
+        q: str | None = None,
     ):
         self.start = _start
         self.end = _end
         self.limit = _end - _start
         self.sort = _sort
         self.order = _order
+        self.cursor = _cursor
+        if _limit is not None:
+            self.limit = _limit
+        # Set by refine_query in cursor mode when there are more rows
+        self.next_cursor: str | None = None
+        self.count_only = _count == "only" or request.scope.get("method") == "HEAD"
+        self.count = None if _count == "only" else _count
+        # Set by refine_query to the strategy that produced the total
+        self.count_strategy: str | None = None
+        self.fields = parse_fields(_fields)
+        self.search = q.strip() if q else None
 
-        self.filters = request.query_params.multi_items()
-        self.filters = dict(self.filters)
+        # A repeated parameter (refine's getMany sends ?id=a&id=b) keeps all values
+        self.filters: dict[str, str | list[str]] = {}
+        for key, value in request.query_params.multi_items():
+            if key not in self.filters:
+                self.filters[key] = value
+            elif isinstance(self.filters[key], list):
+                self.filters[key].append(value)
+            else:
+                self.filters[key] = [self.filters[key], value]
 
-        for key in ["_start", "_end", "_sort", "_order"]:
+        for key in CONTROL_PARAMS:
             self.filters.pop(key, None)
+
+        # Without a page size a getMany returns every requested id
+        ids = self.filters.get("id")
+        paged = "_end" in request.query_params or "_limit" in request.query_params
+        if isinstance(ids, list) and not paged:
+            self.limit = max(self.limit, len(ids))
@@ -0,0 +1,143 @@
+from collections import Counter
+
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.common.exceptions import BadRequestError
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# How X-Total-Count is produced:
+#   exact    - SELECT count(*) with the list filters, before the page query
+#   window   - count(*) OVER () added to the page query, one round trip
+#   cached   - exact, reused until a write touches one of the tables
+#   estimate - the row estimate of EXPLAIN on MariaDB/MySQL
+#   none     - no count and no X-Total-Count header
+COUNT_STRATEGIES = ("exact", "window", "cached", "estimate", "none")
+
+# Bumped on every INSERT/UPDATE/DELETE this worker issues against a table
+_table_versions: Counter[str] = Counter()
+
+count_cache = TTLCache(settings.COUNT_CACHE_SIZE, settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def _bump_table_version(
+    _conn, clauseelement, _multiparams, _params, _execution_options, _result
+):
+    if isinstance(clauseelement, UpdateBase):
+        table = getattr(clauseelement, "table", None)
+        name = getattr(table, "name", None)
+        if name:
+            _table_versions[name] += 1
+
+
+def install_count_invalidation(engine: Engine) -> None:
+    """Expire cached counts of a table when this engine writes to it"""
+    event.listen(engine, "after_execute", _bump_table_version)
+
+
+def resolve_count_strategy(params, default: str | None = None) -> str:
+    """The request's ``_count`` if given, else the endpoint's, else COUNT_STRATEGY"""
+    strategy = getattr(params, "count", None) or default or settings.COUNT_STRATEGY
+    if strategy not in COUNT_STRATEGIES:
+        raise BadRequestError(
+            f"_count must be one of {', '.join(COUNT_STRATEGIES)}, got '{strategy}'"
+        )
+    return strategy
+
+
+def _cache_key(db, count_statement: Select):
+    compiled = count_statement.compile(
+        bind=db.get_bind(), compile_kwargs={"render_postcompile": True}
+    )
+    tables = sorted(
+        table.name
+        for table in count_statement.get_final_froms()
+        if hasattr(table, "name")
+    )
+    return (
+        str(compiled),
+        repr(sorted(compiled.params.items())),
+        tuple((table, _table_versions[table]) for table in tables),
+    )
+
+
+def _explain(db, count_statement: Select):
+    """Statement and parameters of an EXPLAIN for the filtered rows"""
+    dialect = db.get_bind().dialect
+    if dialect.name not in ("mysql", "mariadb"):
+        return None
+    # Estimate the rows of the filtered select, not of the count aggregate
+    froms = count_statement.get_final_froms()
+    statement = count_statement.with_only_columns(*froms[0].primary_key.columns)
+    compiled = statement.compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    return f"EXPLAIN {compiled}", compiled.params
+
+
+def _estimate_from_plan(rows) -> int:
+    estimate = 0
+    for row in rows:
+        plan = row._mapping
+        rows_examined = plan.get("rows") or 0
+        filtered = plan.get("filtered")
+        if filtered is not None:
+            rows_examined = rows_examined * float(filtered) / 100
+        estimate = max(estimate, int(rows_examined))
+    return estimate
+
+
+def _usable_estimate(estimate: int | None) -> bool:
+    # Small estimates are cheap to replace with an exact count
+    return estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS
+
+
+def count_rows(db: Session, count_statement: Select, strategy: str) -> tuple[int, str]:
+    """Count for ``cached``/``estimate``/``exact``, and the strategy that produced it"""
+    if strategy == "cached":
+        key = _cache_key(db, count_statement)
+        total = count_cache.get(key)
+        if total is None:
+            total = db.execute(count_statement).scalar_one()
+            count_cache.set(key, total)
+        return total, "cached"
+
+    if strategy == "estimate":
+        explain = _explain(db, count_statement)
+        if explain is not None:
+            sql, parameters = explain
+            plan = db.connection().exec_driver_sql(sql, parameters).all()
+            estimate = _estimate_from_plan(plan)
+            if _usable_estimate(estimate):
+                return estimate, "estimate"
+
+    return db.execute(count_statement).scalar_one(), "exact"
+
+
+async def count_rows_async(
+    db: AsyncSession, count_statement: Select, strategy: str
+) -> tuple[int, str]:
+    """count_rows for AsyncSession"""
+    if strategy == "cached":
+        key = _cache_key(db, count_statement)
+        total = count_cache.get(key)
+        if total is None:
+            total = (await db.execute(count_statement)).scalar_one()
+            count_cache.set(key, total)
+        return total, "cached"
+
+    if strategy == "estimate":
+        explain = _explain(db, count_statement)
+        if explain is not None:
+            sql, parameters = explain
+            connection = await db.connection()
+            plan = (await connection.exec_driver_sql(sql, parameters)).all()
+            estimate = _estimate_from_plan(plan)
+            if _usable_estimate(estimate):
+                return estimate, "estimate"
+
+    return (await db.execute(count_statement)).scalar_one(), "exact"
@@ -1,168 +1,454 @@
+import base64
+import binascii
 import datetime
+import json
 
-from sqlalchemy import (
-    Boolean,
-    Date,
-    Float,
-    Integer,
-    and_,
-    asc,
-    cast,
-    desc,
-)
-from sqlalchemy.orm import Query as SAQuery
+from sqlalchemy import Select, and_, asc, desc, false, func, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.common.exceptions import BadRequestError
+from app.core.query_usage import record_list_query
+from app.utils.filter_plan import EXCLUDED_COLUMNS, filter_plan
+from app.utils.refine_count import count_rows, count_rows_async, resolve_count_strategy
+from app.utils.search import search_expressions, search_terms
 
-def is_date_only(value: str) -> bool:
-    """
-    Returns True for values in YYYY-MM-DD format (10 chars).
-    """
-    return isinstance(value, str) and len(value) == 10 and value.count("-") == 2
 
+def apply_filters(statement: Select, model, filters):
+    """Add the WHERE clauses of the list filters using the model's filter plan.
 
-def convert_value(column, value):
-    """
-    Convert query param strings to the correct Python type.
-    If YYYY-MM-DD → returns datetime.date
-    If ISO datetime → returns datetime.datetime
+    A list of values for an equality filter matches any of them, as ``in``
+    does; for other operators each value adds its own condition. Unknown
+    fields and operators and unparsable values raise BadRequestError.
     """
-    # Lists
-    if isinstance(value, list):
-        return [convert_value(column, v) for v in value]
-
-    # Date-only
-    if is_date_only(value):
-        try:
-            return datetime.date.fromisoformat(value)
-        except ValueError:
-            pass
-
-    # Datetime
-    try:
-        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
-    except Exception:
-        pass
-
-    # Int
-    if isinstance(column.type, Integer):
-        try:
-            return int(value)
-        except Exception:
-            pass
-
-    # Float
-    if isinstance(column.type, Float):
-        try:
-            return float(value)
-        except Exception:
-            pass
-
-    # Bool
-    if isinstance(column.type, Boolean):
-        if isinstance(value, str):
-            if value.lower() in ["true", "1"]:
-                return True
-            if value.lower() in ["false", "0"]:
-                return False
+    plan = filter_plan(model)
+    conditions = []
+    for key, value in filters.items():
+        rule = plan.rule(key)
+        if isinstance(value, list):
+            if rule.op == "eq":
+                rule = plan.rule(f"{rule.field}_in")
+            if rule.op == "in":
+                value = [part for item in value for part in item.split(",")]
+                conditions.append((rule, value))
+            else:
+                conditions.extend((rule, item) for item in value)
+        else:
+            conditions.append((rule, value))
+    # A fixed order keeps the statement shape, and so its compiled-cache key,
+    # independent of the order of the query parameters
+    conditions.sort(key=lambda item: (item[0].op, item[0].field))
+    for rule, value in conditions:
+        statement = statement.where(rule.expression(value))
+    return statement
+
+
+def sort_column(model, sort: str):
+    """The column named by ``_sort``; relationships and hidden columns are rejected"""
+    if sort in EXCLUDED_COLUMNS or sort not in inspect(model).columns:
+        raise BadRequestError(f"Unknown sort field '{sort}'")
+    return getattr(model, sort)
+
+
+def apply_sorting(statement: Select, model, sort: str | None, order: str):
+    if sort:
+        col = sort_column(model, sort)
+        return statement.order_by(desc(col) if order == "DESC" else asc(col))
+    return statement
+
 
+def apply_pagination(statement: Select, start: int, limit: int):
+    return statement.offset(start).limit(limit)
+
+
+# =========================
+# KEYSET PAGINATION
+# =========================
+def keyset_columns(model, sort: str | None) -> list:
+    """The sort column, if any, followed by the primary key as tiebreaker"""
+    primary_key = list(inspect(model).primary_key)
+    if sort:
+        column = sort_column(model, sort)
+        if not any(column.key == key.key for key in primary_key):
+            return [column, *primary_key]
+    return primary_key
+
+
+def _encode_key(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_key(column, value):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
     return value
 
 
-def build_expression(column, op, value):
+def encode_cursor(columns: list, row, sort: str | None, order: str) -> str:
+    """Opaque cursor pointing just after ``row``"""
+    payload = {
+        "sort": sort,
+        "order": order,
+        "keys": [_encode_key(getattr(row, column.key)) for column in columns],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list, sort: str | None, order: str) -> list:
+    """Key values of a cursor issued for the same sort and order"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["sort"] != sort or payload["order"] != order:
+            raise ValueError("cursor issued for another sort order")
+        # A cursor with more or fewer keys than sort columns is rejected
+        pairs = zip(columns, payload["keys"], strict=True)
+        return [_decode_key(column, key) for column, key in pairs]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise BadRequestError("Invalid pagination cursor") from exc
+
+
+def _after(column, value, descending: bool):
+    # MySQL, MariaDB and SQLite sort NULLs first in ascending order
+    if value is None:
+        return false() if descending else column.is_not(None)
+    if descending:
+        return or_(column < value, column.is_(None))
+    return column > value
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def seek_predicate(columns: list, values: list, descending: bool):
+    """Rows after ``values`` in (columns...) order.
+
+    Written as (a > x) OR (a = x AND b > y) rather than a row-value
+    comparison, which MariaDB does not turn into an index range scan.
     """
-    Build SQLAlchemy expression.
-    Handles date-only vs full datetime.
+    branches = []
+    for position, column in enumerate(columns):
+        ties = [_equal(columns[i], values[i]) for i in range(position)]
+        branches.append(and_(*ties, _after(column, values[position], descending)))
+    return or_(*branches)
+
+
+def apply_keyset(statement: Select, columns: list, params) -> Select:
+    """ORDER BY the key columns and seek past the cursor.
+
+    One row more than the page is fetched to know whether another page follows.
     """
+    descending = params.order == "DESC"
+    if params.cursor:
+        values = decode_cursor(params.cursor, columns, params.sort, params.order)
+        statement = statement.where(seek_predicate(columns, values, descending))
+    order = desc if descending else asc
+    return statement.order_by(*(order(column) for column in columns)).limit(
+        params.limit + 1
+    )
 
-    # DATE ONLY → compare DATE(column) >= DATE(value)
-    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
-        date_col = cast(column, Date)
-
-        if op == "gte":
-            return date_col >= value
-        if op == "lte":
-            return date_col <= value
-        if op == "gt":
-            return date_col > value
-        if op == "lt":
-            return date_col < value
-        if op == "eq":
-            return date_col == value
-        if op == "ne":
-            return date_col != value
-
-        raise ValueError(f"Unsupported date-only operator: {op}")
-
-    # DATETIME → compare full value
-    if op == "gte":
-        return column >= value
-    if op == "lte":
-        return column <= value
-    if op == "gt":
-        return column > value
-    if op == "lt":
-        return column < value
-    if op == "eq":
-        return column == value
-    if op == "ne":
-        return column != value
-    if op == "contains":
-        return column.ilike(f"%{value}%")
-
-    if op == "in":
-        if isinstance(value, str):
-            value = value.split(",")
-        return column.in_(value)
-
-    raise ValueError(f"Unsupported operator: {op}")
-
-
-def apply_filters(query, model, filters):
-    grouped = {}  # { "gte": [(column, value), ...] }
-
-    for raw_field, value in filters.items():
-        # Parse operator
-        if "_" in raw_field:
-            field, op = raw_field.rsplit("_", 1)
-        else:
-            field, op = raw_field, "eq"
 
-        if not hasattr(model, field):
-            continue
+def keyset_page(rows, columns: list, params) -> list:
+    """Trim the look-ahead row and set params.next_cursor if there was one"""
+    rows = list(rows)
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        params.next_cursor = encode_cursor(columns, rows[-1], params.sort, params.order)
+    return rows
 
-        column = getattr(model, field)
-        converted_value = convert_value(column, value)
 
-        grouped.setdefault(op, []).append((column, converted_value))
+def _cursor_mode(params) -> bool:
+    return getattr(params, "cursor", None) is not None
+
+
+# =========================
+# SPARSE FIELDSETS
+# =========================
+def _dedupe(columns: list) -> list:
+    return list({column.key: column for column in columns}.values())
 
-    for op, items in grouped.items():
-        if len(items) == 1:
-            col, val = items[0]
-            expr = build_expression(col, op, val)
-            query = query.filter(expr)
-        else:
-            conditions = [build_expression(col, op, val) for col, val in items]
-            query = query.filter(and_(*conditions))
 
-    return query
+def sparse_columns(model, fields: list[str]) -> list:
+    """Primary key and requested columns of a sparse fieldset"""
+    columns = []
+    for field in fields:
+        if field in EXCLUDED_COLUMNS or field not in inspect(model).columns:
+            raise BadRequestError(f"Unknown field '{field}'")
+        columns.append(getattr(model, field))
+    return _dedupe([*inspect(model).primary_key, *columns])
 
 
-def apply_sorting(query: SAQuery, model, sort: str | None, order: str):
-    if sort and hasattr(model, sort):
-        col = getattr(model, sort)
-        return query.order_by(desc(col) if order == "DESC" else asc(col))
-    return query
+def apply_fields(statement: Select, model, params) -> Select:
+    """SELECT only the requested columns instead of the whole entity"""
+    columns = sparse_columns(model, params.fields)
+    if _cursor_mode(params):
+        # The cursor of the next page is read from the key columns
+        columns = _dedupe([*columns, *keyset_columns(model, params.sort)])
+    return statement.with_only_columns(*columns)
 
 
-def apply_pagination(query: SAQuery, start: int, limit: int):
-    return query.offset(start).limit(limit)
+def select_fields(model, fields: list[str]) -> Select:
+    """SELECT of a sparse fieldset, for show endpoints"""
+    return select(*sparse_columns(model, fields))
 
 
-def refine_query(query: SAQuery, model, params):
-    filtered = apply_filters(query, model, params.filters)
-    total = filtered.count()
+def _sparse(params) -> bool:
+    return bool(getattr(params, "fields", None))
 
-    sorted_query = apply_sorting(filtered, model, params.sort, params.order)
-    paginated = apply_pagination(sorted_query, params.start, params.limit)
 
-    return paginated.all(), total
+# =========================
+# EMBEDDING
+# =========================
+def embed_options(model, paths: list[str]) -> list:
+    """Eager loads for dotted relationship paths like ``location.country``.
+
+    Many-to-one relationships are joined into the statement itself and
+    collections loaded with one SELECT ... IN per relationship, so the number
+    of queries does not grow with the number of rows.
+    """
+    options = []
+    for path in paths:
+        owner, loader = model, None
+        for name in path.split("."):
+            relationship = inspect(owner).relationships.get(name)
+            if relationship is None:
+                raise BadRequestError(f"Unknown relation '{path}'")
+            attribute = getattr(owner, name)
+            if loader is None:
+                strategy = selectinload if relationship.uselist else joinedload
+                loader = strategy(attribute)
+            elif relationship.uselist:
+                loader = loader.selectinload(attribute)
+            else:
+                loader = loader.joinedload(attribute)
+            owner = relationship.mapper.class_
+        options.append(loader)
+    return options
+
+
+# =========================
+# REFINE QUERY
+# =========================
+def apply_search(statement: Select, model, params, search: tuple, dialect: str):
+    """Narrow to rows matching ``q``; returns the statement and relevance score"""
+    q = getattr(params, "search", None)
+    if not q:
+        return statement, None
+    if not search:
+        raise BadRequestError("This list does not support search (q)")
+    terms = search_terms(q)
+    if not terms:
+        return statement, None
+    columns = [getattr(model, name) for name in search]
+    condition, score = search_expressions(columns, terms, dialect)
+    return statement.where(condition), score
+
+
+def refine_statements(
+    statement: Select,
+    model,
+    params,
+    search: tuple = (),
+    dialect: str = "mysql",
+    embed: list[str] | None = None,
+) -> tuple[Select, Select]:
+    """Count and page statements for a list request.
+
+    Filter values, offset and limit are bound parameters, so requests with
+    the same filter/sort shape reuse the engine's compiled SQL. The count
+    swaps the selected columns for count(*) instead of wrapping the query in
+    a subquery. In cursor mode the page seeks past the cursor instead of
+    using OFFSET. With ``params.fields`` only those columns are selected, and
+    the ``embed`` relationships (the paths checked by ``embeddable``) are
+    eager-loaded with the page; lists passing no ``embed`` reject ``_embed``.
+    ``search`` names the columns ``q`` searches; unsorted results come by
+    relevance.
+    """
+    filters = params.filters
+    if "_embed" in filters:
+        if embed is None:
+            raise BadRequestError("This list does not support _embed")
+        filters = {key: value for key, value in filters.items() if key != "_embed"}
+    filtered = apply_filters(statement, model, filters)
+    filtered, relevance = apply_search(filtered, model, params, search, dialect)
+    count_statement = filtered.with_only_columns(
+        func.count(), maintain_column_froms=True
+    ).order_by(None)
+
+    if _cursor_mode(params):
+        paginated = apply_keyset(filtered, keyset_columns(model, params.sort), params)
+    else:
+        if relevance is not None and not params.sort:
+            sorted_statement = filtered.order_by(
+                relevance.desc(), *inspect(model).primary_key
+            )
+        else:
+            sorted_statement = apply_sorting(filtered, model, params.sort, params.order)
+        paginated = apply_pagination(sorted_statement, params.start, params.limit)
+
+    if _sparse(params):
+        if embed:
+            raise BadRequestError("_fields cannot be combined with _embed")
+        paginated = apply_fields(paginated, model, params)
+    elif embed:
+        paginated = paginated.options(*embed_options(model, embed))
+    return count_statement, paginated
+
+
+def _rows(result, params) -> list:
+    # Sparse pages are plain rows, never hydrated into ORM objects
+    return result.all() if _sparse(params) else result.scalars().all()
+
+
+def _page(rows, model, params, windowed: bool = False) -> list:
+    """The rows of the page: ORM objects, or dicts of the sparse fieldset"""
+    if windowed and not _sparse(params):
+        rows = [row[0] for row in rows]
+    if _cursor_mode(params):
+        rows = keyset_page(rows, keyset_columns(model, params.sort), params)
+    if _sparse(params):
+        keys = [column.key for column in sparse_columns(model, params.fields)]
+        rows = [{key: getattr(row, key) for key in keys} for row in rows]
+    return rows
+
+
+def _count_plan(params, default: str | None) -> tuple[str, bool]:
+    """Count strategy of a list request and whether it only wants the count"""
+    strategy = resolve_count_strategy(params, default)
+    count_only = getattr(params, "count_only", False)
+    if count_only and strategy in ("window", "none"):
+        strategy = "exact"
+    # After a cursor the window would only count the rows that follow it
+    if strategy == "window" and getattr(params, "cursor", None):
+        strategy = "exact"
+    return strategy, count_only
+
+
+def _with_window_count(paginated: Select) -> Select:
+    return paginated.add_columns(func.count().over().label("total_count"))
+
+
+def _usage_shape(model, params, search: tuple):
+    """Table, filtered (field, op) pairs, sort and search use of a list request"""
+    rules = filter_plan(model).rules
+    filters = []
+    for key, value in params.filters.items():
+        rule = rules.get(key)
+        if rule is not None:
+            # Repeated equality filters run as in
+            op = "in" if isinstance(value, list) and rule.op == "eq" else rule.op
+            filters.append((rule.field, op))
+    sort = params.sort if params.sort and hasattr(model, params.sort) else None
+    searched = bool(search and getattr(params, "search", None))
+    return model.__tablename__, filters, sort, searched
+
+
+def refine_query(
+    db: Session,
+    statement: Select,
+    model,
+    params,
+    count: str | None = None,
+    search: tuple = (),
+    embed: list[str] | None = None,
+):
+    """Rows and total of a list request.
+
+    ``count`` is the endpoint's default count strategy, see refine_count. The
+    strategy used is stored on ``params.count_strategy``; the total is None
+    when it is ``none``. ``search`` names the columns matched by ``q`` and
+    ``embed`` the relations loaded with the page. The request's filter/sort
+    shape is recorded for the index advisor.
+    """
+    with record_list_query(*_usage_shape(model, params, search)):
+        return _refine_query(db, statement, model, params, count, search, embed)
+
+
+def _refine_query(db: Session, statement: Select, model, params, count, search, embed):
+    strategy, count_only = _count_plan(params, count)
+    count_statement, paginated = refine_statements(
+        statement, model, params, search, db.get_bind().dialect.name, embed
+    )
+
+    if count_only:
+        total, params.count_strategy = count_rows(db, count_statement, strategy)
+        return [], total
+
+    if strategy == "window":
+        rows = db.execute(_with_window_count(paginated)).all()
+        if rows or params.start == 0:
+            params.count_strategy = "window"
+            total = rows[0].total_count if rows else 0
+            return _page(rows, model, params, windowed=True), total
+        # A page past the end has no row to carry the count
+        total, params.count_strategy = count_rows(db, count_statement, "exact")
+        return [], total
+
+    total = None
+    params.count_strategy = strategy
+    if strategy != "none":
+        total, params.count_strategy = count_rows(db, count_statement, strategy)
+    return _page(_rows(db.execute(paginated), params), model, params), total
+
+
+async def refine_query_async(
+    db: AsyncSession,
+    statement: Select,
+    model,
+    params,
+    count: str | None = None,
+    search: tuple = (),
+    embed: list[str] | None = None,
+):
+    """refine_query for AsyncSession"""
+    with record_list_query(*_usage_shape(model, params, search)):
+        return await _refine_query_async(
+            db, statement, model, params, count, search, embed
+        )
+
+
+async def _refine_query_async(
+    db: AsyncSession, statement: Select, model, params, count, search, embed
+):
+    strategy, count_only = _count_plan(params, count)
+    count_statement, paginated = refine_statements(
+        statement, model, params, search, db.get_bind().dialect.name, embed
+    )
+
+    if count_only:
+        total, params.count_strategy = await count_rows_async(
+            db, count_statement, strategy
+        )
+        return [], total
+
+    if strategy == "window":
+        rows = (await db.execute(_with_window_count(paginated))).all()
+        if rows or params.start == 0:
+            params.count_strategy = "window"
+            total = rows[0].total_count if rows else 0
+            return _page(rows, model, params, windowed=True), total
+        total, params.count_strategy = await count_rows_async(
+            db, count_statement, "exact"
+        )
+        return [], total
+
+    total = None
+    params.count_strategy = strategy
+    if strategy != "none":
+        total, params.count_strategy = await count_rows_async(
+            db, count_statement, strategy
+        )
+    rows = _rows(await db.execute(paginated), params)
+    return _page(rows, model, params), total
@@ -0,0 +1,66 @@
+import re
+
+from sqlalchemy import and_, case, literal, or_
+from sqlalchemy.dialects.mysql import match
+
+# German spellings without umlauts, as typed on keyboards lacking them
+_TRANSLITERATIONS = {"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"}
+_word = re.compile(r"\w+")
+
+# Longer search strings are cut to this many words
+MAX_SEARCH_TERMS = 8
+
+
+def _variants(term: str) -> list[str]:
+    """The term as typed, with umlauts spelled out, and with them restored"""
+    spelled_out = term
+    for umlaut, spelling in _TRANSLITERATIONS.items():
+        spelled_out = spelled_out.replace(umlaut, spelling)
+    restored = term
+    for umlaut, spelling in _TRANSLITERATIONS.items():
+        if umlaut != "ß":
+            restored = restored.replace(spelling, umlaut)
+    return list(dict.fromkeys((term, spelled_out, restored)))
+
+
+def search_terms(q: str) -> list[list[str]]:
+    """Words of a search string, each with its spelling variants"""
+    words = _word.findall(q.lower())[:MAX_SEARCH_TERMS]
+    return [_variants(word) for word in words]
+
+
+def fulltext_query(terms: list[list[str]]) -> str:
+    """BOOLEAN MODE query requiring every word, as a prefix, in any spelling"""
+    return " ".join(
+        "+(" + " ".join(f"{variant}*" for variant in variants) + ")"
+        for variants in terms
+    )
+
+
+def search_expressions(columns: list, terms: list[list[str]], dialect: str):
+    """WHERE condition and relevance score of a search over ``columns``.
+
+    MariaDB/MySQL use MATCH ... AGAINST on the FULLTEXT index covering exactly
+    these columns; the accent-insensitive collations make e.g. "a" match "ä".
+    Other backends (the SQLite stand-in) fall back to LIKE, scored by the
+    number of matching column/word pairs.
+    """
+    if dialect in ("mysql", "mariadb"):
+        relevance = match(*columns, against=fulltext_query(terms)).in_boolean_mode()
+        return relevance, relevance
+
+    def matches(column, variants):
+        return or_(*(column.ilike(f"%{variant}%") for variant in variants))
+
+    condition = and_(
+        *(or_(*(matches(column, variants) for column in columns)) for variants in terms)
+    )
+    score = sum(
+        (
+            case((matches(column, variants), 1), else_=0)
+            for column in columns
+            for variants in terms
+        ),
+        literal(0),
+    )
+    return condition, score
@@ -0,0 +1,69 @@
+"""Compare list throughput of the sync and async session paths.
+
+Runs the events list query ``--requests`` times with ``--concurrency``
+coroutines inside a single event loop, which is what one uvicorn worker sees.
+The sync path blocks the loop for every query, the async path does not.
+
+    PYTHONPATH=. python scripts/benchmarks/async_db.py --requests 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
+
+from app.core.db import async_engine, engine
+from app.features.events import service
+from app.utils.pagination import PaginationParams
+
+
+def pagination() -> PaginationParams:
+    request = Request({"type": "http", "query_string": b"_start=0&_end=25"})
+    return PaginationParams(request, _start=0, _end=25, _sort="id", _order="ASC")
+
+
+async def sync_request() -> None:
+    with Session(engine) as db:
+        service.list_events(db, pagination())
+
+
+async def async_request() -> None:
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        await service.list_events_async(db, pagination())
+
+
+async def run(request, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await request()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started
+
+
+async def main(requests: int, concurrency: int) -> None:
+    # Warm up both pools so connection setup is not measured
+    await run(sync_request, concurrency, concurrency)
+    await run(async_request, concurrency, concurrency)
+
+    for name, request in (("sync", sync_request), ("async", async_request)):
+        elapsed = await run(request, requests, concurrency)
+        print(
+            f"{name:>5}: {requests} requests in {elapsed:.2f}s "
+            f"({requests / elapsed:.1f} req/s, concurrency {concurrency})"
+        )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
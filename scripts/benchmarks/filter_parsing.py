@@ -0,0 +1,135 @@
+"""Throughput of turning list query parameters into WHERE clauses.
+
+Compares the former per-request parsing (hasattr/getattr on the model and
+trial date/datetime parses with exceptions as control flow) with the
+precompiled filter plans of app.utils.filter_plan. Only statement building
+is measured; nothing is sent to a database.
+
+    PYTHONPATH=. python scripts/benchmarks/filter_parsing.py --requests 20000
+"""
+
+import argparse
+import datetime
+import os
+import time
+
+os.environ.setdefault("DATABASE_BACKEND", "sqlite")
+
+from sqlalchemy import Boolean, Date, Float, Integer, and_, cast, select  # noqa: E402
+
+from app.features.events.model import Event  # noqa: E402
+from app.features.locations.model import Location  # noqa: E402
+from app.utils.filter_plan import compile_filter_plans  # noqa: E402
+from app.utils.refine_query import apply_filters  # noqa: E402
+
+SHAPES = {
+    "events": (
+        Event,
+        {
+            "is_public": "true",
+            "start_date_gte": "2021-03-01",
+            "end_date_lt": "2021-09-30T18:00:00Z",
+            "name_contains": "Congress",
+        },
+    ),
+    "locations": (
+        Location,
+        {"city_contains": "Vienna", "latitude_gt": "48.1", "country_id_in": "a,b,c"},
+    ),
+}
+
+
+# =========================
+# FORMER PARSING
+# =========================
+def legacy_convert_value(column, value):
+    if isinstance(value, list):
+        return [legacy_convert_value(column, v) for v in value]
+    if isinstance(value, str) and len(value) == 10 and value.count("-") == 2:
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except Exception:
+        pass
+    if isinstance(column.type, Integer):
+        try:
+            return int(value)
+        except Exception:
+            pass
+    if isinstance(column.type, Float):
+        try:
+            return float(value)
+        except Exception:
+            pass
+    if isinstance(column.type, Boolean) and value.lower() in (
+        "true",
+        "1",
+        "false",
+        "0",
+    ):
+        return value.lower() in ("true", "1")
+    return value
+
+
+def legacy_build_expression(column, op, value):
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        column = cast(column, Date)
+    if op == "contains":
+        return column.ilike(f"%{value}%")
+    if op == "in":
+        return column.in_(value.split(",") if isinstance(value, str) else value)
+    return {
+        "eq": column.__eq__,
+        "ne": column.__ne__,
+        "gte": column.__ge__,
+        "lte": column.__le__,
+        "gt": column.__gt__,
+        "lt": column.__lt__,
+    }[op](value)
+
+
+def legacy_apply_filters(statement, model, filters):
+    grouped = {}
+    for raw_field, value in filters.items():
+        if "_" in raw_field:
+            field, op = raw_field.rsplit("_", 1)
+        else:
+            field, op = raw_field, "eq"
+        if not hasattr(model, field):
+            continue
+        column = getattr(model, field)
+        grouped.setdefault(op, []).append((column, legacy_convert_value(column, value)))
+    for op in sorted(grouped):
+        items = sorted(grouped[op], key=lambda item: item[0].key)
+        statement = statement.where(
+            and_(*(legacy_build_expression(col, op, val) for col, val in items))
+        )
+    return statement
+
+
+def run(apply, model, filters, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        apply(select(model), model, filters)
+    return requests / (time.perf_counter() - started)
+
+
+def main(requests: int) -> None:
+    compile_filter_plans(model for model, _ in SHAPES.values())
+    for name, (model, filters) in SHAPES.items():
+        for label, apply in (("former", legacy_apply_filters), ("plan", apply_filters)):
+            per_second = run(apply, model, filters, requests)
+            print(
+                f"{name:>9} {label:>6}: {per_second:,.0f} requests/s, "
+                f"{per_second * len(filters):,.0f} filters/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.requests)
@@ -0,0 +1,56 @@
+"""Synthetic data shared by the benchmark scripts."""
+
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import Engine, insert
+from sqlmodel import Session, SQLModel, select
+
+from app.features.events.model import Event, EventType
+from app.features.locations.model import Country, Location, LocationType
+from app.prestart.initial_data import load_country_data, load_event_type_data
+
+
+def seed(engine: Engine, events: int, locations: int = 500) -> None:
+    """Schema, prestart countries and event types, plus random locations and events"""
+    SQLModel.metadata.create_all(engine)
+    load_country_data(engine)
+    load_event_type_data(engine)
+    rng = random.Random(42)
+    with Session(engine) as session:
+        country_ids = session.exec(select(Country.id)).all()
+        event_type_ids = session.exec(select(EventType.id)).all()
+        location_type = LocationType(name="Venue")
+        session.add(location_type)
+        session.flush()
+
+        location_rows = [
+            Location(
+                name=f"Venue {index}",
+                city=f"City {index % 50}",
+                road=f"Road {index % 200}",
+                country_id=rng.choice(country_ids),
+                location_type_id=location_type.id,
+            ).model_dump()
+            for index in range(locations)
+        ]
+        session.execute(insert(Location), location_rows)
+        location_ids = [row["id"] for row in location_rows]
+
+        start = datetime(2020, 1, 1)
+        event_rows = []
+        for index in range(events):
+            begins = start + timedelta(hours=rng.randrange(0, 24 * 365 * 6))
+            event_rows.append(
+                Event(
+                    name=f"Event {index}",
+                    start_date=begins,
+                    end_date=begins + timedelta(days=rng.randrange(0, 4)),
+                    is_public=rng.random() < 0.7,
+                    location_id=rng.choice(location_ids),
+                    event_type_id=rng.choice(event_type_ids),
+                ).model_dump()
+            )
+        for offset in range(0, len(event_rows), 5000):
+            session.execute(insert(Event), event_rows[offset : offset + 5000])
+        session.commit()
@@ -0,0 +1,90 @@
+"""Cost of fetching many events by id through refine_query.
+
+Compares one request per id, as the frontend did while repeated ?id=
+parameters were collapsed, with one getMany request binding the ids as an
+IN list, against an in-memory SQLite database. For reference it also runs
+the ids bound as one JSON array expanded by json_each, the temporary-table
+style alternative to long IN lists.
+
+    PYTHONPATH=. python scripts/benchmarks/in_filters.py --ids 10000
+"""
+
+import argparse
+import json
+import os
+import time
+from urllib.parse import urlencode
+
+os.environ.setdefault("DATABASE_BACKEND", "sqlite")
+
+from sqlalchemy import create_engine, func, literal, literal_column, select  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.features.events.model import Event  # noqa: E402
+from app.utils.pagination import PaginationParams  # noqa: E402
+from app.utils.refine_query import refine_query  # noqa: E402
+from scripts.benchmarks.fixtures import seed  # noqa: E402
+
+
+def params(query: list[tuple[str, str]]) -> PaginationParams:
+    request = Request({"type": "http", "query_string": urlencode(query).encode()})
+    return PaginationParams(request, _start=0, _end=10, _sort=None)
+
+
+def get_many(db: Session, ids: list[str]) -> int:
+    pagination = params([("id", event_id) for event_id in ids])
+    pagination.limit = len(ids)
+    results, _ = refine_query(db, select(Event), Event, pagination, count="none")
+    return len(results)
+
+
+def get_one_by_one(db: Session, ids: list[str]) -> int:
+    found = 0
+    for event_id in ids:
+        results, _ = refine_query(
+            db, select(Event), Event, params([("id", event_id)]), count="none"
+        )
+        found += len(results)
+    return found
+
+
+def get_many_json_array(db: Session, ids: list[str]) -> int:
+    array = func.json_each(literal(json.dumps(ids)))
+    statement = select(Event).where(
+        Event.id.in_(select(literal_column("value")).select_from(array))
+    )
+    return len(db.scalars(statement).all())
+
+
+def timed(label: str, fetch, db: Session, ids: list[str]) -> None:
+    started = time.perf_counter()
+    found = fetch(db, ids)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{label:>22}: {elapsed:9.1f} ms for {found} events")
+
+
+def main(ids: int, events: int) -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    seed(engine, events)
+    with Session(engine) as db:
+        event_ids = list(db.scalars(select(Event.id).limit(ids)))
+        # Warm the compiled cache so every variant runs with cached SQL
+        get_many(db, event_ids[:2])
+
+        get_many_json_array(db, event_ids[:2])
+
+        timed("one request per id", get_one_by_one, db, event_ids)
+        timed("getMany, IN list", get_many, db, event_ids)
+        timed("JSON array", get_many_json_array, db, event_ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.ids, args.events)
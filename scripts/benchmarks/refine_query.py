@@ -0,0 +1,106 @@
+"""Per-request cost of list queries built by refine_query.
+
+Compares the former legacy Query path (Query.filter, Query.count() subquery)
+with the select() statements of refine_query, on the events and locations
+list shapes, against an in-memory SQLite database. Each variant runs with the
+engine's compiled cache enabled and disabled; the difference is the time
+spent compiling SQL per request.
+
+    PYTHONPATH=. python scripts/benchmarks/refine_query.py --requests 2000
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_BACKEND", "sqlite")
+
+from sqlalchemy import create_engine, event, select  # noqa: E402
+from sqlalchemy.engine.default import CACHE_HIT  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.features.events.model import Event  # noqa: E402
+from app.features.locations.model import Location  # noqa: E402
+from app.utils.pagination import PaginationParams  # noqa: E402
+from app.utils.refine_query import (  # noqa: E402
+    apply_filters,
+    apply_pagination,
+    apply_sorting,
+    refine_query,
+)
+from scripts.benchmarks.fixtures import seed  # noqa: E402
+
+
+def legacy_refine_query(query, model, params):
+    filtered = apply_filters(query, model, params.filters)
+    total = filtered.count()
+    sorted_query = apply_sorting(filtered, model, params.sort, params.order)
+    return apply_pagination(sorted_query, params.start, params.limit).all(), total
+
+
+def pagination(index: int, query: str, sort: str) -> PaginationParams:
+    # Same filter/sort shape on every request, different values
+    request = Request(
+        {"type": "http", "query_string": query.format(index=index).encode()}
+    )
+    return PaginationParams(
+        request, _start=index % 100, _end=index % 100 + 25, _sort=sort
+    )
+
+
+SHAPES = {
+    "events": (Event, "is_public=true&start_date_gte=2021-0{month}-01", "start_date"),
+    "locations": (Location, "city_contains={index}&name_contains=Venue", "name"),
+}
+
+
+def run(engine, model, query, sort, legacy: bool, cached: bool, requests: int):
+    hits = 0
+
+    def count_hits(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        nonlocal hits
+        hits += context.cache_hit is CACHE_HIT
+
+    event.listen(engine, "after_cursor_execute", count_hits)
+    options = {} if cached else {"compiled_cache": None}
+    started = time.perf_counter()
+    with Session(engine.execution_options(**options)) as db:
+        for index in range(requests):
+            params = pagination(
+                index, query.replace("{month}", str(index % 9 + 1)), sort
+            )
+            if legacy:
+                legacy_refine_query(db.query(model), model, params)
+            else:
+                refine_query(db, select(model), model, params)
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "after_cursor_execute", count_hits)
+    return elapsed / requests * 1000, hits / (requests * 2)
+
+
+def main(requests: int, events: int) -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    seed(engine, events)
+
+    for name, (model, query, sort) in SHAPES.items():
+        for label, legacy in (("legacy Query", True), ("select()", False)):
+            cached_ms, hit_ratio = run(
+                engine, model, query, sort, legacy, True, requests
+            )
+            uncached_ms, _ = run(engine, model, query, sort, legacy, False, requests)
+            print(
+                f"{name:>9} {label:>12}: {cached_ms:.3f} ms/request, "
+                f"cache hits {hit_ratio:.0%}, compile {uncached_ms - cached_ms:.3f} ms/request"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.requests, args.events)
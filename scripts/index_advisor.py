@@ -0,0 +1,48 @@
+"""Propose indexes for the list filter/sort shapes recorded in production.
+
+Reads the usage-<pid>.json files the workers write to QUERY_USAGE_DIR and
+prints the missing composite indexes, ranked by the time spent in their
+queries. With --generate they are written as an Alembic migration for review.
+
+    PYTHONPATH=. python scripts/index_advisor.py --usage-dir /var/lib/backend/query-usage
+"""
+
+import argparse
+import os
+
+from app.core.db import engine
+from app.core.index_advisor import (
+    existing_indexes,
+    index_name,
+    load_usage,
+    propose_indexes,
+    write_migration,
+)
+
+
+def main(usage_dir: str, min_count: int, top: int, generate: bool) -> None:
+    shapes = load_usage(usage_dir)
+    proposals = propose_indexes(shapes, existing_indexes(engine), min_count)[:top]
+    if not proposals:
+        print("No missing indexes for the recorded shapes")
+        return
+    for proposal in proposals:
+        print(
+            f"{index_name(proposal['table'], proposal['columns'])}: "
+            f"{proposal['table']}({', '.join(proposal['columns'])}) "
+            f"- {proposal['count']} queries, {proposal['total_ms']:.0f} ms"
+        )
+    if generate:
+        print(f"Wrote {write_migration(proposals)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--usage-dir", default=os.getenv("QUERY_USAGE_DIR", ""))
+    parser.add_argument("--min-count", type=int, default=100)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--generate", action="store_true")
+    args = parser.parse_args()
+    if not args.usage_dir:
+        parser.error("--usage-dir or QUERY_USAGE_DIR is required")
+    main(args.usage_dir, args.min_count, args.top, args.generate)
@@ -3,6 +3,12 @@
 set -e
 set -x
 
+if [ "${DATABASE_BACKEND:-mysql}" = "sqlite" ]; then
+    # Schema from the SQLModel metadata and seed data, no server or migrations
+    python app/prestart/sqlite_db.py
+    exit 0
+fi
+
 # Let the DB start
 python app/prestart/backend_pre_start.py
 
@@ -0,0 +1,107 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, delete
+
+from app.common.permissions import Events
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import token_cache
+from app.features.permissions.cache import guest_permissions
+from app.features.roles.model import RolePermission
+from app.main import app
+from tests.conftest import ADMIN_EMAIL, ADMIN_PASSWORD
+
+ME_URL = f"{settings.API_V1_STR}/users/me"
+
+
+def login() -> TestClient:
+    client = TestClient(app, base_url="https://testserver")
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+    )
+    assert response.status_code == 200, response.text
+    return client
+
+
+def test_verified_tokens_are_served_from_the_cache() -> None:
+    client = login()
+    before = token_cache.stats()
+
+    first = client.get(ME_URL)
+    second = client.get(ME_URL)
+
+    after = token_cache.stats()
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_login_drops_the_users_cached_tokens() -> None:
+    client = login()
+    last_login = client.get(ME_URL).json()["data"]["last_login"]
+
+    login()
+
+    assert client.get(ME_URL).json()["data"]["last_login"] != last_login
+
+
+def guest_permission_names(client: TestClient) -> set[str]:
+    response = client.get(f"{settings.API_V1_STR}/auth/permissions")
+    return {permission["name"] for permission in response.json()}
+
+
+def test_guest_permission_changes_reach_anonymous_requests(
+    client: TestClient, admin_client: TestClient, db: Session
+) -> None:
+    roles_url = f"{settings.API_V1_STR}/roles"
+    guest = admin_client.get(roles_url, params={"name": settings.GUEST_ROLE_NAME})
+    guest_id = guest.json()[0]["id"]
+    permission = admin_client.get(
+        f"{settings.API_V1_STR}/permissions", params={"name": Events.Publish}
+    ).json()[0]
+    assert Events.Publish not in guest_permission_names(client)
+
+    added = admin_client.post(
+        f"{roles_url}/permissions",
+        json={"role_id": guest_id, "permission_id": permission["id"]},
+    )
+    assert added.status_code == 200, added.text
+    assert Events.Publish in guest_permission_names(client)
+
+    # A change made by another worker is picked up once the set is stale
+    db.exec(
+        delete(RolePermission).where(
+            RolePermission.role_id == guest_id,
+            RolePermission.permission_id == permission["id"],
+        )
+    )
+    db.commit()
+    assert Events.Publish in guest_permission_names(client)
+    guest_permissions.invalidate()
+    assert Events.Publish not in guest_permission_names(client)
+
+
+def test_auth_queries_stay_off_the_event_loop() -> None:
+    client = login()
+    on_loop: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):  # noqa: ARG001
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        on_loop.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        # An async route whose token is not cached yet
+        response = client.get(f"{settings.API_V1_STR}/events")
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == 200
+    assert on_loop == []
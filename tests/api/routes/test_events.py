@@ -0,0 +1,231 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.query_usage import query_usage
+
+EVENTS_URL = f"{settings.API_V1_STR}/events"
+
+
+def _event(name: str, **fields) -> dict:
+    return {
+        "name": name,
+        "start_date": "2026-05-01T09:00:00",
+        "end_date": "2026-05-03T18:00:00",
+        **fields,
+    }
+
+
+def test_bulk_create_reports_invalid_items(admin_client: TestClient) -> None:
+    response = admin_client.post(
+        f"{EVENTS_URL}/bulk",
+        json=[
+            _event("Bulk congress A"),
+            {"name": "Missing dates"},
+            _event("Bulk congress B", location_id="no-such-location"),
+            _event("Bulk congress C", is_public=True),
+        ],
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()["data"]
+    assert [event["name"] for event in result["items"]] == [
+        "Bulk congress A",
+        "Bulk congress C",
+    ]
+    assert [error["index"] for error in result["errors"]] == [1, 2]
+    assert "start_date" in result["errors"][0]["detail"]
+    assert "location_id" in result["errors"][1]["detail"]
+
+    shown = admin_client.get(f"{EVENTS_URL}/{result['items'][1]['id']}")
+    assert shown.json()["data"]["is_public"] is True
+
+
+def test_bulk_update_and_delete(admin_client: TestClient) -> None:
+    created = admin_client.post(
+        f"{EVENTS_URL}/bulk", json=[_event("Bulk update A"), _event("Bulk update B")]
+    ).json()["data"]["items"]
+    first, second = (event["id"] for event in created)
+
+    response = admin_client.patch(
+        f"{EVENTS_URL}/bulk",
+        json=[
+            {"id": first, "is_public": True},
+            {"id": second, "name": "Bulk update B2", "is_public": True},
+            {"id": "no-such-event", "name": "x"},
+            {"name": "no id"},
+        ],
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()["data"]
+    updated = {event["id"]: event for event in result["items"]}
+    assert updated[first]["name"] == "Bulk update A"
+    assert updated[first]["is_public"] and updated[second]["is_public"]
+    assert updated[second]["name"] == "Bulk update B2"
+    assert [(error["index"], error["detail"]) for error in result["errors"]] == [
+        (2, "not found"),
+        (3, "id: field required"),
+    ]
+
+    response = admin_client.request(
+        "DELETE", f"{EVENTS_URL}/bulk", json={"ids": [first, "no-such-event", second]}
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()["data"]
+    assert result["deleted"] == [first, second]
+    assert result["errors"] == [{"index": 1, "id": "no-such-event", "detail": "not found"}]
+    assert admin_client.get(f"{EVENTS_URL}/{first}").status_code == 404
+
+
+def test_bulk_rejects_oversized_batches(admin_client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 1)
+    response = admin_client.post(
+        f"{EVENTS_URL}/bulk", json=[_event("Too many A"), _event("Too many B")]
+    )
+    assert response.status_code == 400
+
+
+def test_list_events_counts_with_window_and_head(admin_client: TestClient) -> None:
+    response = admin_client.get(EVENTS_URL, params={"_start": 0, "_end": 1})
+    assert response.status_code == 200, response.text
+    assert response.headers["X-Count-Strategy"] == "window"
+    total = int(response.headers["X-Total-Count"])
+
+    head = admin_client.head(EVENTS_URL)
+    assert head.status_code == 200
+    assert int(head.headers["X-Total-Count"]) == total
+    assert head.headers["X-Count-Strategy"] == "exact"
+
+
+def test_list_events_rejects_invalid_filters(admin_client: TestClient) -> None:
+    assert admin_client.get(EVENTS_URL, params={"colour": "red"}).status_code == 400
+    assert admin_client.get(EVENTS_URL, params={"is_public": "maybe"}).status_code == 400
+    response = admin_client.get(EVENTS_URL, params={"start_date_gte": "2000-01-01"})
+    assert response.status_code == 200, response.text
+
+
+def test_sparse_fieldsets(admin_client: TestClient) -> None:
+    created = admin_client.post(EVENTS_URL, json=_event("Sparse congress")).json()["data"]
+
+    response = admin_client.get(
+        EVENTS_URL, params={"_fields": "name,start_date", "name": "Sparse congress"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == [
+        {"id": created["id"], "name": "Sparse congress", "start_date": "2026-05-01T09:00:00"}
+    ]
+    assert response.headers["X-Total-Count"] == "1"
+
+    shown = admin_client.get(f"{EVENTS_URL}/{created['id']}", params={"_fields": "is_public"})
+    assert shown.json()["data"] == {"id": created["id"], "is_public": False}
+
+    assert admin_client.get(EVENTS_URL, params={"_fields": "name,colour"}).status_code == 400
+    assert admin_client.get(
+        f"{EVENTS_URL}/missing", params={"_fields": "name"}
+    ).status_code == 404
+
+
+def test_embed_relations_in_a_fixed_number_of_queries(admin_client: TestClient) -> None:
+    austria = admin_client.get(
+        f"{settings.API_V1_STR}/locations/countries", params={"code2": "AT"}
+    ).json()[0]
+    location = admin_client.post(
+        f"{settings.API_V1_STR}/locations",
+        json={"name": "Embed venue", "country_id": austria["id"]},
+    ).json()["data"]
+    event_type = admin_client.post(
+        f"{EVENTS_URL}/types",
+        json={"code": "EMB", "name_de": "Eingebettet", "name_en": "Embedded"},
+    ).json()["data"]
+    admin_client.post(
+        f"{EVENTS_URL}/bulk",
+        json=[
+            _event(f"Embedded {index}", location_id=location["id"], event_type_id=event_type["id"])
+            for index in range(5)
+        ],
+    )
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "after_cursor_execute", count)
+    try:
+        response = admin_client.get(
+            EVENTS_URL,
+            params={"_embed": "event_type,location.country", "event_type_id": event_type["id"]},
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "after_cursor_execute", count)
+
+    assert response.status_code == 200, response.text
+    events = response.json()
+    assert len(events) == 5
+    assert len(statements) == 1
+    assert events[0]["event_type"]["code"] == "EMB"
+    assert events[0]["location"]["name"] == "Embed venue"
+    assert events[0]["location"]["country"]["code2"] == "AT"
+    assert "location_type" not in events[0]["location"]
+
+    shown = admin_client.get(
+        f"{EVENTS_URL}/{events[0]['id']}", params={"_embed": "location"}
+    ).json()["data"]
+    assert shown["location"]["id"] == location["id"]
+    assert "event_type" not in shown
+
+
+def test_embed_rejects_unknown_relations(admin_client: TestClient) -> None:
+    assert admin_client.get(EVENTS_URL, params={"_embed": "organiser"}).status_code == 400
+    response = admin_client.get(EVENTS_URL, params={"_embed": "location", "_fields": "name"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("path", "embed"),
+    [("users", "roles"), ("roles", "permissions"), ("permissions", "roles")],
+)
+def test_embed_is_rejected_on_lists_without_embeds(
+    admin_client: TestClient, path: str, embed: str
+) -> None:
+    response = admin_client.get(f"{settings.API_V1_STR}/{path}", params={"_embed": embed})
+    assert response.status_code == 400
+    assert "hashed_password" not in response.text
+
+
+@pytest.mark.parametrize("sort", ["hashed_password", "roles", "missing"])
+@pytest.mark.parametrize(
+    "paging", [{"_start": 0, "_end": 1}, {"_cursor": "", "_limit": 1}]
+)
+def test_sort_must_name_a_visible_column(
+    admin_client: TestClient, sort: str, paging: dict
+) -> None:
+    response = admin_client.get(
+        f"{settings.API_V1_STR}/users", params={"_sort": sort, **paging}
+    )
+    assert response.status_code == 400
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_queries_record_their_shape(admin_client: TestClient) -> None:
+    query_usage.clear()
+    admin_client.get(EVENTS_URL, params={"is_public": "true", "_sort": "start_date"})
+
+    [shape] = query_usage.snapshot()
+    assert shape["table"] == "events"
+    assert shape["filters"] == [["is_public", "eq"]]
+    assert shape["sort"] == "start_date"
+    assert shape["count"] == 1
+
+
+@pytest.mark.parametrize(
+    "metric",
+    ["query-usage", "token-cache", "permission-cache", "password-hashing", "db-pool"],
+)
+def test_metrics_require_a_permission(
+    client: TestClient, admin_client: TestClient, metric: str
+) -> None:
+    url = f"{settings.API_V1_STR}/utils/metrics/{metric}"
+    assert client.get(url).status_code == 401
+    assert admin_client.get(url).status_code == 200
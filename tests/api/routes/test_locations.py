@@ -0,0 +1,112 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.features.locations import service
+
+
+def test_list_countries_from_seed_data(admin_client: TestClient) -> None:
+    response = admin_client.get(
+        f"{settings.API_V1_STR}/locations/countries",
+        params={"_start": 0, "_end": 5, "_sort": "name"},
+    )
+    assert response.status_code == 200, response.text
+    countries = response.json()
+    assert len(countries) == 5
+    assert int(response.headers["X-Total-Count"]) > 100
+    names = [country["name"] for country in countries]
+    assert names == sorted(names)
+
+
+def test_show_country(admin_client: TestClient) -> None:
+    countries = admin_client.get(
+        f"{settings.API_V1_STR}/locations/countries", params={"code2": "AT"}
+    ).json()
+    assert [country["code3"] for country in countries] == ["AUT"]
+
+    response = admin_client.get(
+        f"{settings.API_V1_STR}/locations/countries/{countries[0]['id']}"
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["name"] == countries[0]["name"]
+
+
+def test_location_type_write_path(admin_client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/locations/types"
+    created = admin_client.post(url, json={"name": "Hotel"})
+    assert created.status_code == 200, created.text
+    location_type_id = created.json()["data"]["id"]
+
+    updated = admin_client.patch(f"{url}/{location_type_id}", json={"name": "Resort"})
+    assert updated.status_code == 200
+    assert updated.json()["data"] == {"id": location_type_id, "name": "Resort"}
+
+    assert admin_client.delete(f"{url}/{location_type_id}").status_code == 200
+    assert admin_client.delete(f"{url}/{location_type_id}").status_code == 404
+    assert admin_client.patch(f"{url}/{location_type_id}", json={"name": "x"}).status_code == 404
+
+
+def test_bulk_create_locations_rejects_duplicate_names(admin_client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/locations/bulk"
+    first = admin_client.post(url, json=[{"name": "Bulk venue"}])
+    assert first.status_code == 200, first.text
+
+    response = admin_client.post(
+        url,
+        json=[{"name": "Bulk venue"}, {"name": "Bulk hall"}, {"name": "Bulk hall"}],
+    )
+    result = response.json()["data"]
+    assert [location["name"] for location in result["items"]] == ["Bulk hall"]
+    assert [error["index"] for error in result["errors"]] == [0, 2]
+
+
+def test_bulk_write_rejects_constraint_violations(
+    admin_client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # As if another request took the name between the check and the write
+    monkeypatch.setattr(service, "drop_duplicate_values", lambda *args: args[2])
+    url = f"{settings.API_V1_STR}/locations/bulk"
+
+    response = admin_client.post(
+        url, json=[{"name": "Bulk race"}, {"name": "Bulk race"}]
+    )
+
+    assert response.status_code == 400
+    assert "UNIQUE" in response.json()["detail"]
+    found = admin_client.get(
+        f"{settings.API_V1_STR}/locations", params={"name": "Bulk race"}
+    )
+    assert found.json() == []
+
+
+def test_list_countries_by_cursor(admin_client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/locations/countries"
+    first = admin_client.get(url, params={"_cursor": "", "_limit": 3, "_sort": "name"})
+    assert first.status_code == 200, first.text
+    assert "X-Next-Cursor" in first.headers["Access-Control-Expose-Headers"]
+
+    second = admin_client.get(
+        url,
+        params={"_cursor": first.headers["X-Next-Cursor"], "_limit": 3, "_sort": "name"},
+    )
+    by_offset = admin_client.get(url, params={"_start": 0, "_end": 6, "_sort": "name"})
+    names = [country["name"] for country in first.json() + second.json()]
+    assert names == [country["name"] for country in by_offset.json()]
+
+
+def test_search_locations(admin_client: TestClient) -> None:
+    url = f"{settings.API_V1_STR}/locations"
+    admin_client.post(
+        f"{url}/bulk",
+        json=[
+            {"name": "Messe Köln", "city": "Köln", "road": "Messeplatz"},
+            {"name": "Kongresshaus", "city": "Zürich", "road": "Claridenstrasse"},
+        ],
+    )
+
+    response = admin_client.get(url, params={"q": "zuerich"})
+    assert response.status_code == 200, response.text
+    assert [location["name"] for location in response.json()] == ["Kongresshaus"]
+
+    response = admin_client.get(url, params={"q": "messe"})
+    assert [location["name"] for location in response.json()] == ["Messe Köln"]
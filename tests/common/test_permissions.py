@@ -0,0 +1,132 @@
+from app.common.permissions import (
+    Events,
+    Files,
+    Metrics,
+    PermissionSet,
+    Users,
+    permission_registry,
+)
+
+
+def test_registry_lists_every_declared_action() -> None:
+    for name in (
+        Events.Publish,
+        Events.ListAll,
+        Events.Participate,
+        Files.Upload,
+        Files.Download,
+        Users.ShowMe,
+    ):
+        assert name in permission_registry
+
+
+# Bit i of a permission mask is the i-th name below. Masks are embedded in
+# access tokens, so existing names must keep their position: new resources
+# and actions are appended.
+FROZEN_BIT_ORDER = [
+    "countries:list",
+    "countries:create",
+    "countries:show",
+    "countries:update",
+    "countries:delete",
+    "locationtypes:list",
+    "locationtypes:create",
+    "locationtypes:show",
+    "locationtypes:update",
+    "locationtypes:delete",
+    "locations:list",
+    "locations:create",
+    "locations:show",
+    "locations:update",
+    "locations:delete",
+    "events:list",
+    "events:create",
+    "events:show",
+    "events:update",
+    "events:delete",
+    "events:participate",
+    "events:listall",
+    "events:publish",
+    "eventtypes:list",
+    "eventtypes:create",
+    "eventtypes:show",
+    "eventtypes:update",
+    "eventtypes:delete",
+    "permissions:list",
+    "permissions:create",
+    "permissions:show",
+    "permissions:update",
+    "permissions:delete",
+    "roles:list",
+    "roles:create",
+    "roles:show",
+    "roles:update",
+    "roles:delete",
+    "rolepermissions:list",
+    "rolepermissions:create",
+    "rolepermissions:show",
+    "rolepermissions:update",
+    "rolepermissions:delete",
+    "users:list",
+    "users:create",
+    "users:show",
+    "users:update",
+    "users:delete",
+    "users:changepassword",
+    "users:showme",
+    "userpermissions:list",
+    "userpermissions:create",
+    "userpermissions:show",
+    "userpermissions:update",
+    "userpermissions:delete",
+    "userroles:list",
+    "userroles:create",
+    "userroles:show",
+    "userroles:update",
+    "userroles:delete",
+    "categories:list",
+    "categories:create",
+    "categories:show",
+    "categories:update",
+    "categories:delete",
+    "files:list",
+    "files:create",
+    "files:show",
+    "files:update",
+    "files:delete",
+    "files:upload",
+    "files:download",
+    "metrics:list",
+]
+
+
+def test_registry_bits_are_unique() -> None:
+    bits = [permission_registry.bit(name) for name in permission_registry]
+    assert len(set(bits)) == len(bits) == len(permission_registry)
+    assert all(bit and bit & (bit - 1) == 0 for bit in bits)
+
+
+def test_mask_round_trip() -> None:
+    names = [Events.List, Users.ShowMe]
+    mask = permission_registry.mask(names)
+    assert sorted(permission_registry.names_for(mask)) == sorted(names)
+
+
+def test_permission_set_checks_by_bit() -> None:
+    permissions = PermissionSet([Events.List, "legacy:permission"])
+    assert Events.List in permissions
+    assert Events.Delete not in permissions
+    assert "legacy:permission" in permissions
+    assert permissions.mask == permission_registry.bit(Events.List)
+
+
+def test_resources_can_register_a_subset_of_actions() -> None:
+    assert Metrics.List in permission_registry
+    assert Metrics.Delete not in permission_registry
+
+
+def test_registry_bits_are_frozen() -> None:
+    names = list(permission_registry.names)
+    assert names[: len(FROZEN_BIT_ORDER)] == FROZEN_BIT_ORDER
+    for index, name in enumerate(FROZEN_BIT_ORDER):
+        assert permission_registry.bit(name) == 1 << index
@@ -1,42 +1,43 @@
+import os
 from collections.abc import Generator
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import Session, delete
+# Tests run against the in-memory SQLite backend unless configured otherwise;
+# this has to happen before app.core.config reads the environment.
+os.environ.setdefault("DATABASE_BACKEND", "sqlite")
 
-from app.core.config import settings
-from app.core.db import engine, init_db
-from app.main import app
-from app.models import Item, User
-from tests.utils.user import authentication_token_from_email
-from tests.utils.utils import get_superuser_token_headers
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.prestart.sqlite_db import init_sqlite_db  # noqa: E402
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin123"
 
 
 @pytest.fixture(scope="session", autouse=True)
 def db() -> Generator[Session, None, None]:
+    if engine.dialect.name == "sqlite":
+        init_sqlite_db()
     with Session(engine) as session:
-        init_db(session)
         yield session
-        statement = delete(Item)
-        session.execute(statement)
-        statement = delete(User)
-        session.execute(statement)
-        session.commit()
 
 
 @pytest.fixture(scope="module")
 def client() -> Generator[TestClient, None, None]:
-    with TestClient(app) as c:
+    with TestClient(app, base_url="https://testserver") as c:
         yield c
 
 
 @pytest.fixture(scope="module")
-def superuser_token_headers(client: TestClient) -> dict[str, str]:
-    return get_superuser_token_headers(client)
-
-
-@pytest.fixture(scope="module")
-def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]:
-    return authentication_token_from_email(
-        client=client, email=settings.EMAIL_TEST_USER, db=db
-    )
+def admin_client() -> Generator[TestClient, None, None]:
+    """Client logged in as the seeded admin user"""
+    with TestClient(app, base_url="https://testserver") as c:
+        response = c.post(
+            "/api/v1/auth/login",
+            json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+        assert response.status_code == 200, response.text
+        yield c
@@ -0,0 +1,61 @@
+import pytest
+
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(clock: Clock) -> None:
+    entries = TTLCache(maxsize=8, ttl=60)
+    entries.set("a", 1)
+    entries.set("b", 2, expires_at=clock.now + 10)
+
+    clock.now += 30
+    assert entries.get("a") == 1
+    assert entries.get("b") is None
+
+    clock.now += 30
+    assert entries.get("a") is None
+    assert entries.stats()["hits"] == 1
+    assert entries.stats()["misses"] == 2
+
+
+@pytest.mark.usefixtures("clock")
+def test_tags_drop_every_entry_of_an_owner() -> None:
+    entries = TTLCache(maxsize=8, ttl=60)
+    entries.set("token-1", 1, tag="user-a")
+    entries.set("token-2", 2, tag="user-a")
+    entries.set("token-3", 3, tag="user-b")
+
+    entries.invalidate_tag("user-a")
+
+    assert entries.get("token-1") is None
+    assert entries.get("token-2") is None
+    assert entries.get("token-3") == 3
+
+
+@pytest.mark.usefixtures("clock")
+def test_least_recently_used_entry_is_evicted() -> None:
+    entries = TTLCache(maxsize=2, ttl=60)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    entries.get("a")
+    entries.set("c", 3)
+
+    assert entries.get("b") is None
+    assert entries.get("a") == 1
+    assert entries.stats()["evictions"] == 1
@@ -0,0 +1,73 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+
+from app.core import db
+from app.features.events.model import EventType
+
+
+def sqlite_engine() -> Engine:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[EventType.__table__])
+    return engine
+
+
+@pytest.fixture()
+def session_class() -> Generator[type[db.RoutingSession], None, None]:
+    primary, replica = sqlite_engine(), sqlite_engine()
+
+    class TestRoutingSession(db.RoutingSession):
+        pass
+
+    TestRoutingSession.primary = primary
+    TestRoutingSession.replicas = [replica]
+    yield TestRoutingSession
+    primary.dispose()
+    replica.dispose()
+
+
+def codes(session: db.RoutingSession) -> list[str]:
+    return list(session.exec(select(EventType.code)).all())
+
+
+def test_reads_go_to_replica_until_the_session_writes(
+    session_class: type[db.RoutingSession],
+) -> None:
+    with session_class(info={"read_only": True}) as session:
+        assert codes(session) == []
+        session.add(EventType(code="talk", name_de="Vortrag", name_en="Talk"))
+        session.commit()
+        # Reads after a write see the primary
+        assert codes(session) == ["talk"]
+
+    with session_class(info={"read_only": True}) as session:
+        assert codes(session) == []
+    with session_class() as session:
+        assert codes(session) == ["talk"]
+
+
+def test_writes_pin_client_to_primary(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db, "replica_engines", [object()])
+    app = FastAPI()
+    app.add_middleware(db.ReplicaRoutingMiddleware)
+
+    @app.get("/read")
+    def read() -> dict:
+        return {"replica": db.use_replica()}
+
+    @app.post("/write")
+    def write() -> dict:
+        return {"replica": db.use_replica()}
+
+    client = TestClient(app, base_url="https://testserver")
+    assert client.get("/read").json() == {"replica": True}
+    response = client.post("/write")
+    assert response.json() == {"replica": False}
+    assert db.PIN_COOKIE in response.cookies
+    assert client.get("/read").json() == {"replica": False}
@@ -0,0 +1,103 @@
+import json
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.index_advisor import (
+    index_columns,
+    is_covered,
+    load_usage,
+    propose_indexes,
+    render_migration,
+)
+from app.core.query_usage import QueryUsage
+
+
+def shape(table: str, filters: list, sort: str | None = None, count: int = 10) -> dict:
+    return {
+        "table": table,
+        "filters": filters,
+        "sort": sort,
+        "search": False,
+        "count": count,
+        "total_ms": count * 2.0,
+        "max_ms": 5.0,
+    }
+
+
+def test_usage_records_shapes_without_values() -> None:
+    usage = QueryUsage()
+    usage.record("events", (("event_type_id", "eq"),), "start_date", False, 0.002)
+    usage.record("events", (("event_type_id", "eq"),), "start_date", False, 0.004)
+
+    [recorded] = usage.snapshot()
+    assert recorded["filters"] == [["event_type_id", "eq"]]
+    assert recorded["count"] == 2
+    assert recorded["total_ms"] == 6.0
+    assert recorded["max_ms"] == 4.0
+
+
+def test_usage_files_of_all_workers_are_merged(tmp_path: Path) -> None:
+    for pid in (1, 2):
+        (tmp_path / f"usage-{pid}.json").write_text(
+            json.dumps([shape("events", [["name", "eq"]])])
+        )
+
+    [merged] = load_usage(str(tmp_path))
+    assert merged["count"] == 20
+
+
+def test_index_columns_follow_equality_sort_range() -> None:
+    columns = index_columns(
+        shape(
+            "events",
+            [["start_date", "gte"], ["event_type_id", "eq"], ["name", "contains"]],
+            sort="end_date",
+        )
+    )
+    assert columns == ["event_type_id", "end_date", "start_date"]
+
+
+def test_covered_and_prefix_proposals_are_dropped() -> None:
+    indexes = {"events": [["id"], ["event_type_id"]]}
+    shapes = [
+        shape("events", [["event_type_id", "eq"]]),
+        shape("events", [["location_id", "eq"]], count=5),
+        shape("events", [["location_id", "eq"]], sort="start_date", count=50),
+        shape("events", [["name", "eq"]], count=1),
+    ]
+
+    proposals = propose_indexes(shapes, indexes, min_count=2)
+
+    assert is_covered(["event_type_id"], indexes["events"])
+    assert [proposal["columns"] for proposal in proposals] == [["location_id", "start_date"]]
+    assert proposals[0]["count"] == 55
+
+
+def test_migration_chains_on_the_head() -> None:
+    source = render_migration(
+        [{"table": "events", "columns": ["location_id", "start_date"], "count": 5, "total_ms": 9.0}],
+        "abc123",
+        "5e0c2a7d41b9",
+    )
+    assert "down_revision = '5e0c2a7d41b9'" in source
+    assert (
+        "op.create_index(op.f('ix_events_location_id_start_date'), 'events', "
+        "['location_id', 'start_date'], unique=False)"
+    ) in source
+    compile(source, "migration.py", "exec")
+
+
+def test_usage_is_written_by_a_background_flusher(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "QUERY_USAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "QUERY_USAGE_FLUSH_SECONDS", 0.01)
+    usage = QueryUsage()
+    usage.record("events", (("name", "eq"),), None, False, 0.001)
+
+    assert usage._flusher is not None and usage._flusher.daemon
+    for _ in range(200):
+        if list(tmp_path.glob("usage-*.json")):
+            break
+        time.sleep(0.01)
+    [merged] = load_usage(str(tmp_path))
+    assert merged["count"] == 1
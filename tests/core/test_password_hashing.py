@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core import security
+
+
+@pytest.fixture()
+def metrics(monkeypatch: pytest.MonkeyPatch) -> security.PasswordHashMetrics:
+    metrics = security.PasswordHashMetrics()
+    monkeypatch.setattr(security, "password_hash_metrics", metrics)
+    return metrics
+
+
+def test_hashing_runs_in_the_pool(metrics: security.PasswordHashMetrics) -> None:
+    async def hash_and_verify() -> tuple[bool, bool]:
+        hashed = await security.get_password_hash_async("secret")
+        return (
+            await security.verify_password_async("secret", hashed),
+            await security.verify_password_async("wrong", hashed),
+        )
+
+    assert asyncio.run(hash_and_verify()) == (True, False)
+    stats = metrics.stats()
+    assert stats["completed"] == 3
+    assert stats["queued"] == stats["running"] == 0
+    assert stats["avg_hash_ms"] > 0
+
+
+def test_pool_threads_leave_the_event_loop_free(
+    metrics: security.PasswordHashMetrics,
+) -> None:
+    async def thread_names() -> list[str]:
+        def name() -> str:
+            return threading.current_thread().name
+
+        return await asyncio.gather(
+            *(security._run_in_hash_pool(name) for _ in range(4))
+        )
+
+    names = asyncio.run(thread_names())
+    assert all(name.startswith("password-hash") for name in names)
+    assert metrics.stats()["completed"] == 4
+
+
+def test_cancelled_requests_leave_the_queue() -> None:
+    metrics = security.PasswordHashMetrics()
+    metrics.submitted()
+    metrics.submitted()
+    metrics.started()
+    metrics.cancelled()
+
+    stats = metrics.stats()
+    assert (stats["queued"], stats["running"], stats["completed"]) == (0, 1, 0)
+    metrics.finished(0.01, 0.2)
+    stats = metrics.stats()
+    assert (stats["running"], stats["completed"]) == (0, 1)
+    assert stats["avg_wait_ms"] == 10.0
+    assert stats["max_hash_ms"] == 200.0
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.pool import PoolMetrics, TimedQueuePool, pool_stats
+
+
+def make_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    engine.pool.metrics = PoolMetrics()
+    return engine
+
+
+def test_checkouts_and_timeouts_are_counted(tmp_path: Path) -> None:
+    engine = make_engine(tmp_path)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    histogram = stats["wait_histogram_ms"]
+    assert histogram["le_+Inf"] == 2
+    assert histogram["le_1"] >= 1
+    assert list(histogram.values()) == sorted(histogram.values())
+
+
+def test_metrics_survive_dispose(tmp_path: Path) -> None:
+    engine = make_engine(tmp_path)
+    metrics = engine.pool.metrics
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert engine.pool.metrics is metrics
+    assert metrics.checkouts == 1
@@ -0,0 +1,150 @@
+import json
+import logging
+import time
+from collections.abc import Generator
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.core import sql_logging
+from app.core.config import settings
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture()
+def records(monkeypatch: pytest.MonkeyPatch) -> Generator[list[dict], None, None]:
+    monkeypatch.setattr(settings, "SQL_LOG_MODE", "off")
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 20)
+    handler = ListHandler()
+    sql_logging.sql_logger.addHandler(handler)
+    yield handler.records
+    sql_logging.sql_logger.removeHandler(handler)
+
+
+@pytest.fixture()
+def engine() -> Generator[Engine, None, None]:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def add_sleep(dbapi_connection, connection_record):  # noqa: ARG001
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000))
+
+    sql_logging.install_sql_logging(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_only_slow_statements_are_logged(engine: Engine, records: list[dict]) -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT sleep_ms(30)"))
+
+    assert len(records) == 1
+    assert records[0]["event"] == "slow_query"
+    assert records[0]["statement"] == "SELECT sleep_ms(30)"
+    assert records[0]["duration_ms"] >= 20
+    assert "parameters" not in records[0]
+
+
+def test_full_mode_logs_every_statement(
+    engine: Engine, records: list[dict], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "SQL_LOG_MODE", "full")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+
+    assert [record["event"] for record in records] == ["query", "query"]
+
+
+def test_failed_statement_raises_the_database_error(
+    engine: Engine, records: list[dict]
+) -> None:
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError, match="no such table"):
+            conn.execute(text("SELECT * FROM nonexistent"))
+        # The failed statement's start time is not left behind
+        assert conn.info["query_started_at"] == []
+        conn.execute(text("SELECT 1"))
+
+    assert records == []
+
+
+def test_slow_query_names_originating_route(engine: Engine, records: list[dict]) -> None:
+    app = FastAPI()
+    app.add_middleware(sql_logging.SQLRouteMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int) -> dict:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT sleep_ms(30)"))
+        return {"id": item_id}
+
+    assert TestClient(app).get("/items/7").status_code == 200
+    assert records[0]["route"] == "GET /items/{item_id}"
+
+
+def make_app(engine: Engine) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(sql_logging.SQLRouteMiddleware)
+
+    @app.get("/items")
+    def list_items() -> list[int]:
+        with engine.connect() as conn:
+            ids = [row[0] for row in conn.execute(text("SELECT 1 UNION SELECT 2"))]
+            # One lookup per item, the N+1 the detector should flag
+            for item_id in ids:
+                conn.execute(text("SELECT :id"), {"id": item_id})
+        return ids
+
+    @app.get("/budgeted", dependencies=[Depends(sql_logging.query_budget(2))])
+    def budgeted() -> None:
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+
+    return app
+
+
+def test_repeated_statements_are_reported(
+    engine: Engine, records: list[dict], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "SQL_REPEAT_THRESHOLD", 2)
+
+    response = TestClient(make_app(engine)).get("/items")
+
+    assert response.headers["x-db-queries"].startswith("count=3; ")
+    assert response.headers["x-db-queries"].endswith("repeated=1")
+    summary = records[-1]
+    assert summary["event"] == "request_queries"
+    assert summary["route"] == "GET /items"
+    assert summary["repeated"] == {"SELECT ?": 2}
+
+
+def test_strict_mode_enforces_route_budget(
+    engine: Engine, records: list[dict], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "SQL_STRICT_QUERY_BUDGET", True)
+
+    with pytest.raises(sql_logging.QueryBudgetExceeded):
+        TestClient(make_app(engine)).get("/budgeted")
+    assert records[-1]["count"] == 2
+    assert records[-1]["budget"] == 2
@@ -0,0 +1,88 @@
+from collections.abc import Generator
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.common import repo
+from app.features.events.model import Event, EventType
+
+
+@pytest.fixture()
+def session() -> Generator[Session, None, None]:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    engine.dispose()
+
+
+def record_statements(session: Session) -> list[str]:
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):  # noqa: ARG001
+        statements.append(statement.split()[0])
+
+    event.listen(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def make_event_type(code: str = "CON") -> EventType:
+    return EventType(code=code, name_de=f"{code} de", name_en=f"{code} en")
+
+
+def test_insert_needs_no_refresh(session: Session) -> None:
+    statements = record_statements(session)
+
+    event_type = repo.insert_row(session, make_event_type())
+
+    assert statements == ["INSERT"]
+    assert event_type.id
+    assert event_type.name_en == "CON en"
+
+
+def test_update_is_a_single_statement(session: Session) -> None:
+    event_type = repo.insert_row(session, make_event_type())
+    statements = record_statements(session)
+
+    updated = repo.update_by_id(session, EventType, event_type.id, {"name_en": "Conf"})
+
+    assert statements == ["UPDATE"]
+    assert updated is not None
+    assert updated.name_en == "Conf"
+    assert updated.name_de == "CON de"
+
+
+def test_update_of_missing_row_returns_none(session: Session) -> None:
+    assert repo.update_by_id(session, EventType, "missing", {"name_en": "x"}) is None
+
+
+def test_delete_clears_references_without_loading(session: Session) -> None:
+    event_type = repo.insert_row(session, make_event_type())
+    event = repo.insert_row(
+        session,
+        Event(
+            name="Congress",
+            start_date=datetime(2025, 5, 1, 9),
+            end_date=datetime(2025, 5, 2, 18),
+            event_type_id=event_type.id,
+        ),
+    )
+    event_type_id = event_type.id
+    statements = record_statements(session)
+
+    deleted = repo.delete_by_id(
+        session, EventType, event_type_id, nullify=[Event.event_type_id]
+    )
+
+    assert deleted
+    assert statements == ["UPDATE", "DELETE"]
+    session.expire_all()
+    assert session.get(Event, event.id).event_type_id is None
+    assert not repo.delete_by_id(session, EventType, event_type_id)
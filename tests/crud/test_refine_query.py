@@ -0,0 +1,355 @@
+import base64
+import datetime
+import json
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from starlette.requests import Request
+
+from app.common.exceptions import BadRequestError
+from app.core.config import settings
+from app.features.events.model import Event, EventType
+from app.utils.pagination import PaginationParams
+from app.utils.refine_count import install_count_invalidation
+from app.utils.refine_query import refine_query
+from app.utils.search import fulltext_query, search_expressions, search_terms
+
+
+@pytest.fixture()
+def session() -> Generator[Session, None, None]:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[EventType.__table__])
+    with Session(engine) as session:
+        for code in ("CON", "WOR", "SEM"):
+            session.add(EventType(code=code, name_de=code, name_en=code.lower()))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def pagination(query: str) -> PaginationParams:
+    request = Request({"type": "http", "query_string": query.encode()})
+    return PaginationParams(request, _start=0, _end=10, _sort="code")
+
+
+def cursor_pagination(cursor: str, sort: str, order: str = "ASC") -> PaginationParams:
+    request = Request({"type": "http", "query_string": b""})
+    return PaginationParams(
+        request, _start=0, _end=10, _sort=sort, _order=order, _cursor=cursor, _limit=2
+    )
+
+
+def walk_pages(session: Session, sort: str, order: str = "ASC") -> list[list[str]]:
+    pages, cursor = [], ""
+    while cursor is not None:
+        params = cursor_pagination(cursor, sort, order)
+        results, _ = refine_query(session, select(EventType), EventType, params)
+        pages.append([event_type.code for event_type in results])
+        cursor = params.next_cursor
+    return pages
+
+
+def record_statements(session: Session) -> list[tuple[str, bool]]:
+    executed: list[tuple[str, bool]] = []
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        executed.append((statement, context.cache_hit is CACHE_HIT))
+
+    event.listen(session.get_bind(), "after_cursor_execute", after_cursor_execute)
+    return executed
+
+
+def test_count_does_not_wrap_a_subquery(session: Session) -> None:
+    executed = record_statements(session)
+
+    results, total = refine_query(
+        session, select(EventType), EventType, pagination("code_ne=SEM")
+    )
+
+    assert [event_type.code for event_type in results] == ["CON", "WOR"]
+    assert total == 2
+    count_sql = executed[0][0]
+    assert count_sql.startswith("SELECT count(*)")
+    assert count_sql.count("SELECT") == 1
+
+
+def test_same_shape_reuses_compiled_sql(session: Session) -> None:
+    refine_query(session, select(EventType), EventType, pagination("code=CON&id_ne=unknown"))
+    executed = record_statements(session)
+
+    # Different values and parameter order, same filter/sort shape
+    results, total = refine_query(
+        session, select(EventType), EventType, pagination("id_ne=missing&code=WOR")
+    )
+
+    assert [event_type.code for event_type in results] == ["WOR"]
+    assert total == 1
+    assert [hit for _, hit in executed] == [True, True]
+
+
+def test_cursor_pages_through_ties_without_offset(session: Session) -> None:
+    # Two more rows sharing a description, so the id has to break the tie
+    for code in ("ABC", "XYZ"):
+        session.add(EventType(code=code, name_de=code, name_en=code, description_en="same"))
+    session.commit()
+    executed = record_statements(session)
+
+    pages = walk_pages(session, "description_en")
+
+    codes = [code for page in pages for code in page]
+    assert sorted(codes) == ["ABC", "CON", "SEM", "WOR", "XYZ"]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    # Later pages seek past the previous key instead of skipping rows
+    assert "event_types.description_en > ?" in executed[-1][0]
+
+
+def test_cursor_pages_descending(session: Session) -> None:
+    assert walk_pages(session, "code", "DESC") == [["WOR", "SEM"], ["CON"]]
+
+
+def test_cursor_from_another_sort_is_rejected(session: Session) -> None:
+    params = cursor_pagination("", "code")
+    refine_query(session, select(EventType), EventType, params)
+
+    with pytest.raises(BadRequestError):
+        refine_query(
+            session,
+            select(EventType),
+            EventType,
+            cursor_pagination(params.next_cursor, "name_en"),
+        )
+    with pytest.raises(BadRequestError):
+        refine_query(
+            session, select(EventType), EventType, cursor_pagination("not-a-cursor", "code")
+        )
+
+
+@pytest.mark.parametrize("keys", [["CON"], ["CON", "id", "extra"]])
+def test_cursor_with_wrong_key_count_is_rejected(session: Session, keys: list) -> None:
+    payload = json.dumps({"sort": "code", "order": "ASC", "keys": keys})
+    cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    with pytest.raises(BadRequestError):
+        refine_query(
+            session, select(EventType), EventType, cursor_pagination(cursor, "code")
+        )
+
+
+def counted(session: Session, request_count: str | None, count: str | None = None):
+    request = Request({"type": "http", "query_string": b""})
+    params = PaginationParams(request, _start=0, _end=10, _sort="code", _count=request_count)
+    results, total = refine_query(session, select(EventType), EventType, params, count)
+    return [event_type.code for event_type in results], total, params.count_strategy
+
+
+def test_window_count_in_one_round_trip(session: Session) -> None:
+    executed = record_statements(session)
+
+    assert counted(session, None, count="window") == (["CON", "SEM", "WOR"], 3, "window")
+    assert len(executed) == 1
+    assert "OVER ()" in executed[0][0]
+
+
+def test_count_strategy_from_request_and_count_only(session: Session) -> None:
+    assert counted(session, "none") == (["CON", "SEM", "WOR"], None, "none")
+    assert counted(session, "only", count="window") == ([], 3, "exact")
+    with pytest.raises(BadRequestError):
+        counted(session, "guess")
+
+
+def test_cached_count_expires_on_write(session: Session) -> None:
+    install_count_invalidation(session.get_bind())
+    assert counted(session, "cached")[1:] == (3, "cached")
+    executed = record_statements(session)
+    assert counted(session, "cached")[1] == 3
+    assert not any("count(*)" in statement for statement, _ in executed)
+
+    session.add(EventType(code="ABC", name_de="ABC", name_en="abc"))
+    session.commit()
+    assert counted(session, "cached")[1] == 4
+
+
+def test_estimate_falls_back_to_exact_on_sqlite(session: Session) -> None:
+    assert counted(session, "estimate")[1:] == (3, "exact")
+
+
+def test_filters_on_fields_with_underscores(session: Session) -> None:
+    results, total = refine_query(
+        session, select(EventType), EventType, pagination("name_en=wor")
+    )
+    assert [event_type.code for event_type in results] == ["WOR"]
+
+    results, _ = refine_query(
+        session, select(EventType), EventType, pagination("name_en_in=con,sem")
+    )
+    assert [event_type.code for event_type in results] == ["CON", "SEM"]
+
+
+@pytest.mark.parametrize(
+    "query", ["unknown=1", "code_like=CO", "name_en_between=a", "created_at_gte=2024-01-01"]
+)
+def test_unknown_filters_are_rejected(session: Session, query: str) -> None:
+    with pytest.raises(BadRequestError):
+        refine_query(session, select(EventType), EventType, pagination(query))
+
+
+def test_string_filters_are_not_parsed_as_dates(session: Session) -> None:
+    session.add(EventType(code="DAT", name_de="2024-01-01", name_en="dated"))
+    session.commit()
+
+    results, _ = refine_query(
+        session, select(EventType), EventType, pagination("name_de=2024-01-01")
+    )
+    assert [event_type.code for event_type in results] == ["DAT"]
+
+
+def test_sparse_fields_select_only_requested_columns(session: Session) -> None:
+    executed = record_statements(session)
+    params = pagination("")
+    params.fields = ["code"]
+
+    results, _ = refine_query(session, select(EventType), EventType, params)
+
+    assert [set(row) for row in results] == [{"id", "code"}] * 3
+    assert "name_en" not in executed[-1][0]
+
+    params.fields = ["hashed_password"]
+    with pytest.raises(BadRequestError):
+        refine_query(session, select(EventType), EventType, params)
+
+
+def test_search_terms_cover_umlaut_spellings() -> None:
+    assert search_terms("Muenchen Messe!") == [["muenchen", "münchen"], ["messe"]]
+    assert search_terms("Gießen") == [["gießen", "giessen"]]
+    assert fulltext_query(search_terms("Köln Messe")) == "+(köln* koeln*) +(messe*)"
+
+
+def test_search_uses_match_against_on_mariadb() -> None:
+    condition, relevance = search_expressions(
+        [EventType.name_en], search_terms("congress"), "mariadb"
+    )
+    sql = str(condition.compile(dialect=mysql.dialect()))
+    assert sql == "MATCH (event_types.name_en) AGAINST (%s IN BOOLEAN MODE)"
+
+
+def test_search_falls_back_to_like_with_relevance(session: Session) -> None:
+    session.add(EventType(code="MUE", name_de="Tagung München", name_en="Munich meeting"))
+    session.commit()
+    params = pagination("")
+    params.sort = None
+    params.search = "muenchen"
+
+    results, total = refine_query(
+        session, select(EventType), EventType, params, search=("name_de", "name_en")
+    )
+    assert [event_type.code for event_type in results] == ["MUE"]
+    assert total == 1
+
+    params.search = "unknown words"
+    assert refine_query(session, select(EventType), EventType, params, search=("name_de",)) == ([], 0)
+    with pytest.raises(BadRequestError):
+        refine_query(session, select(EventType), EventType, params)
+
+
+@pytest.fixture()
+def event_session() -> Generator[Session, None, None]:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine, tables=[Event.__table__])
+    with Session(engine) as session:
+        for name, start in (
+            ("late", datetime.datetime(2026, 4, 30, 23, 30)),
+            ("day", datetime.datetime(2026, 5, 1, 0, 0)),
+            ("evening", datetime.datetime(2026, 5, 1, 23, 59, 59)),
+            ("next", datetime.datetime(2026, 5, 2, 0, 0)),
+        ):
+            session.add(Event(name=name, start_date=start, end_date=start))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def event_names(session: Session, query: str) -> list[str]:
+    request = Request({"type": "http", "query_string": query.encode()})
+    params = PaginationParams(request, _start=0, _end=10, _sort="start_date")
+    results, _ = refine_query(session, select(Event), Event, params)
+    return [event.name for event in results]
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("start_date=2026-05-01", ["day", "evening"]),
+        ("start_date_ne=2026-05-01", ["late", "next"]),
+        ("start_date_gte=2026-05-01", ["day", "evening", "next"]),
+        ("start_date_gt=2026-05-01", ["next"]),
+        ("start_date_lte=2026-05-01", ["late", "day", "evening"]),
+        ("start_date_lt=2026-05-01", ["late"]),
+        ("start_date_in=2026-04-30,2026-05-02", ["late", "next"]),
+        ("start_date_gte=2026-05-01T03:00:00%2B02:00", ["evening", "next"]),
+    ],
+)
+def test_date_only_filters_cover_whole_days(
+    event_session: Session, query: str, expected: list[str]
+) -> None:
+    assert event_names(event_session, query) == expected
+
+
+def test_date_only_filters_use_the_filter_timezone(
+    event_session: Session, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "FILTER_TIMEZONE", "Europe/Berlin")
+    # 1 May in Berlin is 30 April 22:00 to 1 May 22:00 UTC
+    assert event_names(event_session, "start_date=2026-05-01") == ["late", "day"]
+
+
+def test_date_only_filters_are_served_by_the_index(event_session: Session) -> None:
+    executed = record_statements(event_session)
+    event_names(event_session, "start_date=2026-05-01")
+
+    statement, _ = next(item for item in executed if "LIMIT" in item[0])
+    plan = event_session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}",
+        ("2026-05-01 00:00:00.000000", "2026-05-02 00:00:00.000000", 10, 0),
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "USING INDEX ix_events_start_date" in details
+    assert "CAST" not in statement
+
+
+def test_repeated_parameters_match_any_value(session: Session) -> None:
+    ids = session.scalars(select(EventType.id).order_by(EventType.code)).all()
+    request = Request(
+        {"type": "http", "query_string": f"id={ids[0]}&id={ids[1]}&id={ids[0]}".encode()}
+    )
+    params = PaginationParams(request, _start=0, _end=1, _sort="code")
+    assert params.filters == {"id": [ids[0], ids[1], ids[0]]}
+    # A getMany without _end gets all its ids on one page
+    assert params.limit == 3
+
+    results, total = refine_query(session, select(EventType), EventType, params)
+    assert sorted(event_type.id for event_type in results) == sorted(ids[:2])
+    assert total == 2
+
+    results, _ = refine_query(
+        session, select(EventType), EventType, pagination("code_ne=CON&code_ne=SEM")
+    )
+    assert [event_type.code for event_type in results] == ["WOR"]
+
+
+def test_in_lists_are_deduplicated_and_capped(session: Session, monkeypatch) -> None:
+    executed = record_statements(session)
+    refine_query(session, select(EventType), EventType, pagination("code_in=CON,SEM,CON"))
+    refine_query(session, select(EventType), EventType, pagination("code_in=CON,SEM,WOR"))
+
+    # Two parameters for the first list, one cached statement for both lengths
+    assert executed[0][0].count("?") == executed[2][0].count("?") - 1
+    assert executed[3][1]
+
+    monkeypatch.setattr(settings, "FILTER_IN_MAX_VALUES", 2)
+    with pytest.raises(BadRequestError):
+        refine_query(session, select(EventType), EventType, pagination("code_in=CON,SEM,WOR"))
@@ -0,0 +1,168 @@
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.common.permissions import Events, PermissionSet
+from app.core.security import permission_claims, read_permission_claims
+from app.features.permissions.cache import permission_cache
+from app.features.permissions.model import Permission
+from app.features.roles import repo as roles_repo
+from app.features.roles.model import Role, RolePermission
+from app.features.users import repo, service
+from app.features.users.model import User, UserPermission, UserRole
+
+
+@pytest.fixture()
+def session() -> Generator[Session, None, None]:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def count_statements(session: Session) -> list[str]:
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):  # noqa: ARG001
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def create_user_with_roles(session: Session, role_count: int) -> User:
+    user = User(email=f"user{role_count}@example.com", hashed_password="x")
+    direct = Permission(name=f"direct:{role_count}")
+    shared = Permission(name=f"shared:{role_count}")
+    session.add_all([user, direct, shared])
+    session.add(UserPermission(user_id=user.id, permission_id=direct.id))
+    session.add(UserPermission(user_id=user.id, permission_id=shared.id))
+    for index in range(role_count):
+        role = Role(name=f"role-{role_count}-{index}")
+        own = Permission(name=f"role:{role_count}:{index}")
+        session.add_all([role, own])
+        session.add(UserRole(user_id=user.id, role_id=role.id))
+        session.add(RolePermission(role_id=role.id, permission_id=own.id))
+        session.add(RolePermission(role_id=role.id, permission_id=shared.id))
+    session.commit()
+    return user
+
+
+@pytest.mark.parametrize("role_count", [0, 1, 5, 25])
+def test_effective_permission_names_single_statement(
+    session: Session, role_count: int
+) -> None:
+    user = create_user_with_roles(session, role_count)
+    user_id = user.id
+    statements = count_statements(session)
+
+    names = repo.get_permission_names_by_user_id(session, user_id)
+
+    assert len(statements) == 1
+    assert names == {
+        f"direct:{role_count}",
+        f"shared:{role_count}",
+        *(f"role:{role_count}:{index}" for index in range(role_count)),
+    }
+
+
+def test_effective_permissions_are_deduplicated(session: Session) -> None:
+    user = create_user_with_roles(session, 3)
+    user_id = user.id
+    statements = count_statements(session)
+
+    permissions = repo.get_effective_permissions_by_user_id(session, user_id)
+
+    assert len(statements) == 1
+    names = [permission.name for permission in permissions]
+    assert len(names) == len(set(names)) == 5
+
+
+def test_user_permission_changes_refresh_the_cached_set(session: Session) -> None:
+    permission_cache.clear()
+    user = create_user_with_roles(session, 1)
+    late = Permission(name="late:direct")
+    session.add(late)
+    session.commit()
+    assert "late:direct" not in service.get_effective_permissions(session, user.id)
+
+    repo.add_permission_to_user(session, user.id, late.id)
+    assert "late:direct" in service.get_effective_permissions(session, user.id)
+
+    repo.remove_permission_from_user(session, user.id, late.id)
+    assert "late:direct" not in service.get_effective_permissions(session, user.id)
+
+
+def test_role_permission_changes_refresh_the_cached_set(session: Session) -> None:
+    permission_cache.clear()
+    user = create_user_with_roles(session, 1)
+    role_id = session.exec(
+        select(UserRole.role_id).where(UserRole.user_id == user.id)
+    ).one()
+    late = Permission(name="late:role")
+    session.add(late)
+    session.commit()
+    assert "late:role" not in service.get_effective_permissions(session, user.id)
+
+    roles_repo.add_permission_to_role(session, role_id, late.id)
+    assert "late:role" in service.get_effective_permissions(session, user.id)
+
+    roles_repo.remove_permission_from_role(session, role_id, late.id)
+    assert "late:role" not in service.get_effective_permissions(session, user.id)
+
+    roles_repo.delete_role(session, role_id)
+    assert service.get_effective_permissions(session, user.id).names == {
+        "direct:1",
+        "shared:1",
+    }
+
+
+def permission_version(session: Session, user_id: str) -> int:
+    return session.get(User, user_id, populate_existing=True).permission_version
+
+
+def test_user_permission_changes_bump_the_version(session: Session) -> None:
+    user = create_user_with_roles(session, 1)
+    role = Role(name="extra")
+    session.add(role)
+    session.commit()
+
+    repo.add_role_to_user(session, user.id, role.id)
+    assert permission_version(session, user.id) == 1
+    repo.remove_role_from_user(session, user.id, role.id)
+    assert permission_version(session, user.id) == 2
+    # Nothing changed, so tokens stay valid
+    repo.remove_role_from_user(session, user.id, role.id)
+    assert permission_version(session, user.id) == 2
+
+
+def test_role_permission_changes_bump_its_members(session: Session) -> None:
+    member = create_user_with_roles(session, 1)
+    other = create_user_with_roles(session, 0)
+    role_id = session.exec(
+        select(UserRole.role_id).where(UserRole.user_id == member.id)
+    ).one()
+    permission = Permission(name="late")
+    session.add(permission)
+    session.commit()
+
+    roles_repo.add_permission_to_role(session, role_id, permission.id)
+
+    assert permission_version(session, member.id) == 1
+    assert permission_version(session, other.id) == 0
+
+
+def test_claims_of_an_older_permission_version_are_ignored() -> None:
+    permissions = PermissionSet([Events.List])
+    claims = permission_claims(permissions, user_version=3)
+
+    assert read_permission_claims(claims, 3).names == permissions.names
+    assert read_permission_claims(claims, 4) is None
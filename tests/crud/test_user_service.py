@@ -0,0 +1,21 @@
+import asyncio
+
+from sqlmodel import Session
+
+from app.api.v1.users.schema import UserUpdate
+from app.core.security import verify_password
+from app.features.users import service
+from app.features.users.model import User
+
+
+def test_password_update_is_hashed_in_the_pool(db: Session) -> None:
+    user = User(email="rehash@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    # Awaited by the PATCH route, so bcrypt never runs on the event loop
+    updated = asyncio.run(
+        service.update_user(db, user.id, UserUpdate(password="n3w-secret-pass"))
+    )
+
+    assert verify_password("n3w-secret-pass", updated.hashed_password)
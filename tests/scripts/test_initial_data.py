@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete
+from sqlmodel import Session, SQLModel, select
+
+from app.common.permissions import Events
+from app.core.config import settings
+from app.features.permissions.model import Permission
+from app.features.roles.model import Role, RolePermission
+from app.prestart.initial_data import create_initial_data
+
+
+def admin_permission_names(session: Session) -> set[str]:
+    statement = (
+        select(Permission.name)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .join(Role, Role.id == RolePermission.role_id)
+        .where(Role.name == settings.ADMIN_ROLE_NAME)
+    )
+    return set(session.exec(statement).all())
+
+
+def test_reseeding_keeps_removed_admin_permissions_removed(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    SQLModel.metadata.create_all(engine)
+    create_initial_data(engine)
+
+    with Session(engine) as session:
+        assert Events.Delete in admin_permission_names(session)
+        removed = session.exec(
+            select(Permission.id).where(Permission.name == Events.Delete)
+        ).one()
+        session.exec(
+            delete(RolePermission).where(RolePermission.permission_id == removed)
+        )
+        # As if Events.Publish had just been added to the registry
+        session.exec(
+            delete(RolePermission).where(
+                RolePermission.permission_id.in_(
+                    select(Permission.id).where(Permission.name == Events.Publish)
+                )
+            )
+        )
+        session.exec(delete(Permission).where(Permission.name == Events.Publish))
+        session.commit()
+
+    create_initial_data(engine)
+
+    with Session(engine) as session:
+        names = admin_permission_names(session)
+    engine.dispose()
+    assert Events.Delete not in names
+    assert Events.Publish in names
@@ -0,0 +1,32 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.prestart import sqlite_db
+
+
+def count(path: Path, table: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def test_database_is_copied_from_seeded_template(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    template = tmp_path / "template.db"
+    target = tmp_path / "congressinfo.db"
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(target))
+    monkeypatch.setattr(settings, "SQLITE_TEMPLATE_PATH", str(template))
+    engine = create_engine(f"sqlite:///{target}")
+
+    sqlite_db.init_sqlite_db(engine)
+    engine.dispose()
+
+    assert template.exists()
+    assert count(template, "countries") > 100
+    assert count(target, "countries") == count(template, "countries")
+    assert count(target, "users") == 1
+    assert count(target, "permissions") == count(template, "role_permissions")